@@ -1,21 +1,10 @@
 from langchain.prompts import PromptTemplate
-from langchain.output_parsers import PydanticOutputParser
-from langchain_google_genai import GoogleGenerativeAI
-from config.Settings import api_key, settings
-import google.generativeai as genai
+from agents.structured_output import RepairingOutputParser
+from agents.registry import registry
 from app.models.feedback_model import EnhanceFeedbackRequest,EnhanceFeedbackResponse
 
 
-genai.configure(api_key=api_key)
-
-llm = GoogleGenerativeAI(
-    model=settings.model,
-    google_api_key=api_key,
-    temperature=settings.temperature,
-    max_output_tokens=settings.max_output_tokens
-)
-
-parser = PydanticOutputParser(pydantic_object=EnhanceFeedbackResponse)
+parser = RepairingOutputParser(pydantic_object=EnhanceFeedbackResponse)
 
 
 template = """
@@ -51,16 +40,19 @@ prompt = PromptTemplate(
     partial_variables={"format_instructions": parser.get_format_instructions()}
 )
 
+registry.register(
+    "ai_feedback",
+    lambda llm: prompt | llm | parser,
+    response_schema=parser.pydantic_object,
+)
 
 
-chain = prompt | llm | parser
-
-
-def enhance_feedback(request: EnhanceFeedbackRequest) -> EnhanceFeedbackResponse:
+async def enhance_feedback(request: EnhanceFeedbackRequest) -> EnhanceFeedbackResponse:
     if not request.text or not request.text.strip():
         return EnhanceFeedbackResponse(enhanced="")
 
-    return chain.invoke({
+    chain = registry.chain("ai_feedback")
+    return await chain.ainvoke({
         "text": request.text,
         "context": request.context or "general"
     })
\ No newline at end of file
@@ -1,31 +1,14 @@
+import asyncio
 import json
 import os
 import logging
 from fastapi import HTTPException
-from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
-from langchain_google_genai import GoogleGenerativeAI
-from langchain.memory import ConversationBufferMemory
+from agents.registry import registry
 from app.models.chatbot_model import ChatRequest, ChatResponse
-from config.Settings import settings
 
 FILE_PATH = "candidate_data.txt"
 
-from config.Settings import api_key, settings
-import google.generativeai as genai
-
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel(settings.model)
-
-llm = GoogleGenerativeAI(
-    model=settings.model,
-    google_api_key=api_key,
-    temperature=settings.temperature,
-    max_output_tokens=settings.max_output_tokens
-)
-
-memory = ConversationBufferMemory()
-
 template = """
 You are a friendly HR assistant. Answer questions about candidates using the data provided.
 
@@ -50,24 +33,22 @@ prompt = PromptTemplate(
     template=template,
 )
 
-chain = LLMChain(
-    llm=llm,
-    prompt=prompt,
-    verbose=True,
-    memory=memory,
-)
+registry.register("ask_ai", lambda llm: prompt | llm, cache_ttl=0)
+
+def _read_user_detail() -> str:
+    with open(FILE_PATH, "r", encoding="utf-8") as f:
+        return f.read()
 
-def ask_ai(question: str):
+async def ask_ai(question: str):
     try:
         if not os.path.exists(FILE_PATH):
             logging.warning("Candidate data file not found.")
             user_detail = "data not found"
         else:
-            with open(FILE_PATH, "r", encoding="utf-8") as f:
-                user_detail = f.read()
+            user_detail = await asyncio.to_thread(_read_user_detail)
 
-        chain = prompt | llm
-        response = chain.invoke({
+        chain = registry.chain("ask_ai")
+        response = await chain.ainvoke({
             "user_detail": user_detail, 
             "question": question
         })
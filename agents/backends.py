@@ -0,0 +1,182 @@
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple, Union, get_args, get_origin
+
+from google.api_core import exceptions as google_exceptions
+from pydantic import BaseModel
+
+from agents.dispatcher import dispatcher_status, get_dispatcher
+from agents.types import CandidateAllInOne, JobDescriptionOutline, JobDescriptionTitleAISuggest, JobTagsOutput
+from app.models.batch_analyze_model import CandidateAnalysisResponse
+from app.models.evaluation_model import EvaluationResponse
+from app.models.feedback_model import EnhanceFeedbackResponse
+from app.models.resume_analyze_model import AIPromptQuestionResponse, AIQuestionResponse
+from config.Settings import settings
+
+# Output schema of each registered chain, used by the fake backend to answer
+# with JSON the chain's parser accepts.
+CHAIN_SCHEMAS = {
+    "jd_generator": JobDescriptionOutline,
+    "job_tagging": JobTagsOutput,
+    "jd_title_suggestion": JobDescriptionTitleAISuggest,
+    "resume_analyze": CandidateAnalysisResponse,
+    "ai_question_generate": AIQuestionResponse,
+    "ai_prompt_question": AIPromptQuestionResponse,
+    "ai_feedback": EnhanceFeedbackResponse,
+    "evaluation": EvaluationResponse,
+    "resume_extractor": CandidateAllInOne,
+}
+# Batched chains answer with one item per document delimiter in the prompt
+# (see resume_extractor.BATCH_DELIMITER).
+BATCH_CHAIN_SCHEMAS = {
+    "resume_extractor_batch": (CandidateAllInOne, re.compile(r"^<<<RESUME \d+>>>$", re.MULTILINE)),
+}
+# jd_enhance.<field> / jd_regenerate.<field> answer with {field: [...]}.
+FIELD_CHAIN_PREFIXES = ("jd_enhance.", "jd_regenerate.")
+
+FAKE_TEXT_ANSWER = "This is a canned answer from the offline fake LLM backend."
+
+
+def sample_value(annotation: Any, name: str) -> Any:
+    """A plausible value of type ``annotation`` for a field called ``name``."""
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin is Union:
+        return sample_value(next(a for a in args if a is not type(None)), name)
+    if origin in (list, List):
+        item = args[0] if args else str
+        return [sample_value(item, f"{name} {i}") for i in (1, 2)]
+    if origin is dict or annotation is dict:
+        return {}
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return sample_model(annotation)
+        if issubclass(annotation, Enum):
+            return next(iter(annotation)).value
+        if issubclass(annotation, bool):
+            return True
+        if issubclass(annotation, (int, float)):
+            # Scores are 0-100 throughout; 80 clears every match threshold.
+            return annotation(80)
+        if issubclass(annotation, datetime):
+            return datetime(2024, 1, 1).isoformat()
+    if "email" in name.lower():
+        return "jane.doe@example.com"
+    return f"Sample {name}"
+
+
+def sample_model(model: type) -> Dict[str, Any]:
+    return {
+        name: sample_value(field.annotation, name)
+        for name, field in model.model_fields.items()
+    }
+
+
+def fake_response(chain: Optional[str], documents: int = 1) -> str:
+    if chain in BATCH_CHAIN_SCHEMAS:
+        return json.dumps([sample_model(BATCH_CHAIN_SCHEMAS[chain][0])] * documents)
+    if chain in CHAIN_SCHEMAS:
+        return json.dumps(sample_model(CHAIN_SCHEMAS[chain]))
+    for prefix in FIELD_CHAIN_PREFIXES:
+        if chain and chain.startswith(prefix):
+            field = chain[len(prefix):]
+            return json.dumps({field: sample_value(List[str], field)})
+    return FAKE_TEXT_ANSWER
+
+
+class FakeBackend:
+    """
+    Deterministic offline stand-in for the Gemini dispatcher.
+
+    Answers every chain with schema-valid JSON after a simulated latency of
+    ``latency`` +/- ``jitter`` seconds, and fails a seeded ``error_rate``
+    fraction of calls with ServiceUnavailable, the same error a real outage
+    surfaces. Used by the test suite and benchmarks/load_test.py.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._responses: Dict[Tuple[Optional[str], int], str] = {}
+        self.calls = 0
+        self.errors = 0
+
+    def _draw(self) -> Tuple[float, bool]:
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            fail = self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        return delay, fail
+
+    def _respond(self, chain: Optional[str], prompt: str, fail: bool) -> str:
+        if fail:
+            raise google_exceptions.ServiceUnavailable("Fake backend: injected upstream error")
+        documents = 1
+        if chain in BATCH_CHAIN_SCHEMAS:
+            documents = len(BATCH_CHAIN_SCHEMAS[chain][1].findall(prompt))
+        key = (chain, documents)
+        if key not in self._responses:
+            self._responses[key] = fake_response(chain, documents)
+        return self._responses[key]
+
+    def generate(self, prompt: str, generation_config: Dict[str, Any], chain: Optional[str] = None) -> str:
+        delay, fail = self._draw()
+        time.sleep(delay)
+        return self._respond(chain, prompt, fail)
+
+    async def agenerate(self, prompt: str, generation_config: Dict[str, Any], chain: Optional[str] = None) -> str:
+        delay, fail = self._draw()
+        await asyncio.sleep(delay)
+        return self._respond(chain, prompt, fail)
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [{
+            "backend": "fake",
+            "latency": self.latency,
+            "error_rate": self.error_rate,
+            "calls": self.calls,
+            "errors": self.errors,
+        }]
+
+
+_fake_backend: Optional[FakeBackend] = None
+_fake_lock = threading.Lock()
+
+
+def get_fake_backend() -> FakeBackend:
+    global _fake_backend
+    if _fake_backend is None:
+        with _fake_lock:
+            if _fake_backend is None:
+                _fake_backend = FakeBackend(
+                    latency=settings.fake_llm_latency,
+                    jitter=settings.fake_llm_latency_jitter,
+                    error_rate=settings.fake_llm_error_rate,
+                    seed=settings.fake_llm_seed,
+                )
+    return _fake_backend
+
+
+def get_backend():
+    """The configured LLM backend (``settings.llm_backend``)."""
+    if settings.llm_backend == "fake":
+        return get_fake_backend()
+    if settings.llm_backend == "gemini":
+        return get_dispatcher()
+    raise ValueError(f"Unknown LLM backend '{settings.llm_backend}'")
+
+
+def backend_status() -> List[Dict[str, Any]]:
+    if settings.llm_backend == "fake":
+        return get_fake_backend().status()
+    return dispatcher_status()
@@ -0,0 +1,517 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from enum import Enum
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from google.generativeai.client import _ClientManager
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.llms import LLM
+from pydantic import ConfigDict, PrivateAttr
+
+from agents.llm_cache import cache_key, llm_cache
+from agents.single_flight import llm_single_flight
+from app.services.metrics import record_llm_call
+from config.Settings import key_manager, settings
+from config.key_manager import mask_key
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 60.0
+# Completions ``DispatchingLLM.forget`` can still evict; a parser runs right
+# after its completion, so only the latest few are needed.
+WRITTEN_KEYS = 256
+
+# Errors that mean "this key is out of capacity right now": trip the breaker
+# and fail over to another key.
+QUOTA_ERRORS = (google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests)
+SERVER_ERRORS = (
+    google_exceptions.InternalServerError,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.BadGateway,
+)
+# Errors that mean the key itself is unusable.
+AUTH_ERRORS = (google_exceptions.PermissionDenied, google_exceptions.Unauthenticated)
+
+
+class NoKeyAvailableError(RuntimeError):
+    pass
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class KeySlot:
+    """
+    One API key: its bound client, sliding-window usage and circuit breaker.
+
+    All mutating methods are called with the dispatcher lock held.
+    """
+
+    def __init__(self, key: str, model: str):
+        self.key = key
+        self.masked = mask_key(key)
+        # Each key gets its own client manager, so the key is bound to the
+        # client instead of to google.generativeai's process-wide config.
+        self.client_manager = _ClientManager()
+        self.client_manager.configure(api_key=key)
+        self.model_name = model
+        self.model = genai.GenerativeModel(model_name=model)
+        self.model._client = self.client_manager.get_default_client("generative")
+        self._async_model: Optional[genai.GenerativeModel] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.requests: Deque[float] = deque()
+        self.tokens: Deque[Tuple[float, int]] = deque()
+        self.token_total = 0
+        self.in_flight = 0
+
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.cooldown = 0.0
+        self.last_error: Optional[str] = None
+
+    def async_model(self) -> genai.GenerativeModel:
+        """Model bound to an async client for the running event loop."""
+        # grpc.aio channels belong to the loop they were created on, so the
+        # async client is built lazily and rebuilt if the loop changes.
+        loop = asyncio.get_running_loop()
+        if self._async_model is None or self._async_loop is not loop:
+            model = genai.GenerativeModel(model_name=self.model_name)
+            model._async_client = self.client_manager.make_client("generative_async")
+            self._async_model, self._async_loop = model, loop
+        return self._async_model
+
+    def _trim(self, now: float) -> None:
+        while self.requests and now - self.requests[0] >= WINDOW_SECONDS:
+            self.requests.popleft()
+        while self.tokens and now - self.tokens[0][0] >= WINDOW_SECONDS:
+            self.token_total -= self.tokens.popleft()[1]
+
+    def available_at(self, now: float, tokens: int, rpm: int, tpm: int) -> float:
+        """Earliest time this slot can take a request of ``tokens`` tokens."""
+        self._trim(now)
+        if self.state == BreakerState.OPEN:
+            return self.opened_at + self.cooldown
+        if self.state == BreakerState.HALF_OPEN and self.in_flight:
+            return now + 1.0
+        ready = now
+        if len(self.requests) >= rpm:
+            ready = max(ready, self.requests[0] + WINDOW_SECONDS)
+        if self.tokens and self.token_total + tokens > tpm:
+            ready = max(ready, self.tokens[0][0] + WINDOW_SECONDS)
+        return ready
+
+    def load(self, rpm: int, tpm: int) -> float:
+        return max(len(self.requests) / rpm, self.token_total / tpm) + self.in_flight / rpm
+
+    def reserve(self, now: float, tokens: int) -> None:
+        if self.state == BreakerState.OPEN:
+            self.state = BreakerState.HALF_OPEN
+        self.requests.append(now)
+        self.tokens.append((now, tokens))
+        self.token_total += tokens
+        self.in_flight += 1
+
+    def settle(self, estimated: int, actual: Optional[int]) -> None:
+        self.in_flight -= 1
+        if actual is not None and actual != estimated:
+            self.tokens.append((time.monotonic(), actual - estimated))
+            self.token_total += actual - estimated
+
+    def succeed(self) -> None:
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.last_error = None
+
+    def fail(self, error: Exception, threshold: int, cooldown: float, trip: bool) -> None:
+        self.failures += 1
+        self.last_error = str(error)[:200]
+        if trip or self.state == BreakerState.HALF_OPEN or self.failures >= threshold:
+            self.state = BreakerState.OPEN
+            self.opened_at = time.monotonic()
+            self.cooldown = cooldown
+            logger.warning(f"Circuit opened for API key {self.masked} for {cooldown:.0f}s: {self.last_error}")
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        self._trim(now)
+        return {
+            "key": self.masked,
+            "state": self.state.value,
+            "requests_last_minute": len(self.requests),
+            "tokens_last_minute": self.token_total,
+            "in_flight": self.in_flight,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class KeyDispatcher:
+    """
+    Spreads Gemini calls across every configured API key.
+
+    Each call goes to the least-loaded key whose breaker is closed and whose
+    requests-per-minute and tokens-per-minute windows have room. Quota and
+    5xx errors open that key's breaker and the call fails over to the next
+    key, so one exhausted key no longer takes the whole service down.
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        model: str,
+        rpm: int,
+        tpm: int,
+        failure_threshold: int,
+        cooldown: float,
+        wait_timeout: float,
+    ):
+        self.model = model
+        self.rpm = rpm
+        self.tpm = tpm
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.wait_timeout = wait_timeout
+        self.slots = [KeySlot(key, model) for key in keys]
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+
+    def _usable(self, slot: KeySlot) -> bool:
+        return key_manager.is_usable(slot.key)
+
+    def _try_acquire(self, tokens: int, exclude: Tuple[KeySlot, ...]) -> Tuple[Optional[KeySlot], float]:
+        """Reserve the best ready slot, or return when the next one frees up. Lock held."""
+        now = time.monotonic()
+        candidates = [s for s in self.slots if s not in exclude and self._usable(s)]
+        if not candidates:
+            raise NoKeyAvailableError("All API keys failed or hit limits!")
+        ready = [s for s in candidates if s.available_at(now, tokens, self.rpm, self.tpm) <= now]
+        if ready:
+            slot = min(ready, key=lambda s: s.load(self.rpm, self.tpm))
+            slot.reserve(now, tokens)
+            return slot, now
+        return None, min(s.available_at(now, tokens, self.rpm, self.tpm) for s in candidates)
+
+    def acquire(self, tokens: int, exclude: Tuple[KeySlot, ...] = ()) -> KeySlot:
+        """Reserve capacity on the best key, waiting up to ``wait_timeout``."""
+        if not self.slots:
+            raise NoKeyAvailableError("No Gemini API keys configured")
+        deadline = time.monotonic() + self.wait_timeout
+        with self._cond:
+            while True:
+                slot, next_ready = self._try_acquire(tokens, exclude)
+                if slot is not None:
+                    return slot
+                if next_ready > deadline:
+                    raise NoKeyAvailableError("All API keys are rate limited or circuit-open")
+                self._cond.wait(timeout=max(0.05, next_ready - time.monotonic()))
+
+    async def aacquire(self, tokens: int, exclude: Tuple[KeySlot, ...] = ()) -> KeySlot:
+        """``acquire`` for the event loop: sleeps instead of blocking the thread."""
+        if not self.slots:
+            raise NoKeyAvailableError("No Gemini API keys configured")
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            with self._lock:
+                slot, next_ready = self._try_acquire(tokens, exclude)
+            if slot is not None:
+                return slot
+            if next_ready > deadline:
+                raise NoKeyAvailableError("All API keys are rate limited or circuit-open")
+            await asyncio.sleep(max(0.05, next_ready - time.monotonic()))
+
+    def release(
+        self,
+        slot: KeySlot,
+        estimated: int,
+        actual: Optional[int],
+        error: Optional[Exception] = None,
+        settle_only: bool = False,
+    ) -> None:
+        """
+        Return a reservation. ``settle_only`` settles the token and request
+        accounting without touching the breaker, for calls that ended with
+        no verdict on the key (cancelled).
+        """
+        with self._cond:
+            slot.settle(estimated, actual)
+            if settle_only:
+                pass
+            elif error is None:
+                slot.succeed()
+            elif isinstance(error, AUTH_ERRORS):
+                slot.fail(error, self.failure_threshold, self.cooldown * 10, trip=True)
+            elif isinstance(error, QUOTA_ERRORS):
+                slot.fail(error, self.failure_threshold, self.cooldown, trip=True)
+            elif isinstance(error, SERVER_ERRORS):
+                slot.fail(error, self.failure_threshold, self.cooldown, trip=False)
+            self._cond.notify_all()
+
+    @staticmethod
+    def should_failover(error: Exception) -> bool:
+        return isinstance(error, QUOTA_ERRORS + SERVER_ERRORS + AUTH_ERRORS)
+
+    @staticmethod
+    def estimate_tokens(prompt: str, max_output_tokens: int) -> int:
+        # Rough pre-call estimate (~4 chars per token); corrected from the
+        # response's usage metadata once the call returns.
+        return len(prompt) // 4 + max_output_tokens // 4
+
+    def _finish(self, slot: KeySlot, estimated: int, response: Any) -> str:
+        usage = getattr(response, "usage_metadata", None)
+        actual = getattr(usage, "total_token_count", None) if usage else None
+        self.release(slot, estimated, actual)
+        if not response.candidates:
+            raise ValueError(f"Gemini returned no candidates: {response.prompt_feedback}")
+        return "".join(part.text for part in response.candidates[0].content.parts)
+
+    def _failed(self, slot: KeySlot, estimated: int, error: Exception, chain: Optional[str]) -> None:
+        """Record a failed call; re-raise unless another key should be tried."""
+        self.release(slot, estimated, 0, error)
+        if not self.should_failover(error):
+            raise error
+        logger.warning(f"API key {slot.masked} failed for chain {chain}, trying next key: {error}")
+
+    def generate(self, prompt: str, generation_config: Dict[str, Any], chain: Optional[str] = None) -> str:
+        estimated = self.estimate_tokens(prompt, generation_config.get("max_output_tokens") or 0)
+        last_error: Optional[Exception] = None
+        tried: Tuple[KeySlot, ...] = ()
+        for _ in range(max(1, len(self.slots))):
+            try:
+                slot = self.acquire(estimated, exclude=tried)
+            except NoKeyAvailableError:
+                if last_error is not None:
+                    raise last_error
+                raise
+            tried += (slot,)
+            try:
+                response = slot.model.generate_content(prompt, generation_config=generation_config)
+            except Exception as e:
+                self._failed(slot, estimated, e, chain)
+                last_error = e
+                continue
+            return self._finish(slot, estimated, response)
+        raise last_error
+
+    async def agenerate(self, prompt: str, generation_config: Dict[str, Any], chain: Optional[str] = None) -> str:
+        estimated = self.estimate_tokens(prompt, generation_config.get("max_output_tokens") or 0)
+        last_error: Optional[Exception] = None
+        tried: Tuple[KeySlot, ...] = ()
+        for _ in range(max(1, len(self.slots))):
+            try:
+                slot = await self.aacquire(estimated, exclude=tried)
+            except NoKeyAvailableError:
+                if last_error is not None:
+                    raise last_error
+                raise
+            tried += (slot,)
+            try:
+                response = await slot.async_model().generate_content_async(
+                    prompt, generation_config=generation_config
+                )
+            except asyncio.CancelledError:
+                # A cancelled half-open trial says nothing about the key.
+                self.release(slot, estimated, 0, settle_only=True)
+                raise
+            except Exception as e:
+                self._failed(slot, estimated, e, chain)
+                last_error = e
+                continue
+            return self._finish(slot, estimated, response)
+        raise last_error
+
+    def status(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            now = time.monotonic()
+            return [slot.snapshot(now) for slot in self.slots]
+
+
+class DispatchingLLM(LLM):
+    """
+    LangChain LLM that routes every call through the shared KeyDispatcher
+    (or whichever backend ``settings.llm_backend`` selects).
+
+    Completions are cached by model, generation config and prompt for
+    ``cache_ttl`` seconds, and identical calls already in flight share one
+    upstream call. A TTL of 0 (chains whose every call must be a fresh
+    generation, e.g. regenerate) bypasses both. A chain
+    whose output parser rejects a completion calls ``forget`` so the
+    malformed text isn't served again.
+    """
+
+    dispatcher: Any
+    model: str
+    temperature: float
+    max_output_tokens: int
+    chain: Optional[str] = None
+    cache_ttl: float = 0
+    response_schema: Optional[Dict[str, Any]] = None
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    # Cache keys of the most recent completions written, by text, for ``forget``.
+    _written: "OrderedDict[str, str]" = PrivateAttr(default_factory=OrderedDict)
+    # Keys whose eviction is still being written to disk.
+    _forgetting: Set[str] = PrivateAttr(default_factory=set)
+
+    @property
+    def _llm_type(self) -> str:
+        return "gemini-dispatch"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "temperature": self.temperature,
+            "max_output_tokens": self.max_output_tokens,
+            "structured": self.response_schema is not None,
+        }
+
+    def _generation_config(self, stop: Optional[List[str]]) -> Dict[str, Any]:
+        config = {
+            "temperature": self.temperature,
+            "max_output_tokens": self.max_output_tokens,
+            "stop_sequences": stop,
+        }
+        if self.response_schema is not None:
+            config["response_mime_type"] = "application/json"
+            config["response_schema"] = self.response_schema
+        return config
+
+    def _call_key(self, prompt: str) -> str:
+        # Keys both the response cache and single-flight: calls that differ
+        # in any generation setting must neither share a cache entry nor be
+        # merged while in flight.
+        return cache_key(self.model, self._generation_config(None), prompt)
+
+    def _written_key(self, key: str, text: str) -> None:
+        self._written[text] = key
+        while len(self._written) > WRITTEN_KEYS:
+            self._written.popitem(last=False)
+
+    def _remember(self, key: str, text: str) -> None:
+        llm_cache.set(key, text, ttl=self.cache_ttl)
+        self._written_key(key, text)
+
+    async def _aremember(self, key: str, text: str) -> None:
+        await llm_cache.aset(key, text, ttl=self.cache_ttl)
+        self._written_key(key, text)
+
+    def forget(self, text: str) -> None:
+        """
+        Drop a completion the chain couldn't parse from the cache. Parsers
+        are synchronous, so on an event loop the disk delete runs in a
+        thread; until it lands, calls treat the key as a miss.
+        """
+        key = self._written.pop(text, None)
+        if key is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            llm_cache.delete(key)
+            return
+        self._forgetting.add(key)
+        loop.run_in_executor(None, self._evict, key)
+
+    def _evict(self, key: str) -> None:
+        try:
+            llm_cache.delete(key)
+        finally:
+            self._forgetting.discard(key)
+
+    def _complete(self, prompt: str, stop: Optional[List[str]]) -> str:
+        start, text = time.perf_counter(), None
+        try:
+            text = self.dispatcher.generate(prompt, self._generation_config(stop), chain=self.chain)
+            return text
+        finally:
+            record_llm_call(self.chain, prompt, text, time.perf_counter() - start)
+
+    async def _acomplete(self, prompt: str, stop: Optional[List[str]]) -> str:
+        start, text = time.perf_counter(), None
+        try:
+            text = await self.dispatcher.agenerate(prompt, self._generation_config(stop), chain=self.chain)
+            return text
+        finally:
+            record_llm_call(self.chain, prompt, text, time.perf_counter() - start)
+
+    def _call(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> str:
+        if stop or self.cache_ttl <= 0:
+            return self._complete(prompt, stop)
+        key = self._call_key(prompt)
+        if key not in self._forgetting:
+            cached = llm_cache.get(key)
+            if cached is not None:
+                return cached
+
+        def generate() -> str:
+            text = self._complete(prompt, None)
+            self._remember(key, text)
+            return text
+
+        return llm_single_flight.do(key, generate)
+
+    async def _acall(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> str:
+        if stop or self.cache_ttl <= 0:
+            return await self._acomplete(prompt, stop)
+        key = self._call_key(prompt)
+        if key not in self._forgetting:
+            cached = await llm_cache.aget(key)
+            if cached is not None:
+                return cached
+
+        async def generate() -> str:
+            text = await self._acomplete(prompt, None)
+            await self._aremember(key, text)
+            return text
+
+        return await llm_single_flight.ado(key, generate)
+
+
+_dispatcher: Optional[KeyDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> KeyDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                key_manager.start_background_validation()
+                _dispatcher = KeyDispatcher(
+                    keys=key_manager.keys,
+                    model=settings.model,
+                    rpm=settings.llm_rpm_per_key,
+                    tpm=settings.llm_tpm_per_key,
+                    failure_threshold=settings.llm_breaker_failure_threshold,
+                    cooldown=settings.llm_breaker_cooldown,
+                    wait_timeout=settings.llm_dispatch_wait_timeout,
+                )
+    return _dispatcher
+
+
+def dispatcher_status() -> List[Dict[str, Any]]:
+    """Per-key dispatch state, or an empty list before the first LLM call."""
+    return _dispatcher.status() if _dispatcher is not None else []
@@ -1,21 +1,10 @@
 from langchain.prompts import PromptTemplate
-from langchain.output_parsers import PydanticOutputParser
-from langchain_google_genai import GoogleGenerativeAI
-from config.Settings import api_key, settings
-import google.generativeai as genai
+from agents.structured_output import RepairingOutputParser
+from agents.registry import registry
 from app.models.evaluation_model import InterviewSummaryRequest, EvaluationResponse
 
 
-genai.configure(api_key=api_key)
-
-llm = GoogleGenerativeAI(
-    model=settings.model,
-    google_api_key=api_key,
-    temperature=settings.temperature,
-    max_output_tokens=settings.max_output_tokens
-)
-
-parser = PydanticOutputParser(pydantic_object=EvaluationResponse)
+parser = RepairingOutputParser(pydantic_object=EvaluationResponse)
 
 
 template = """
@@ -54,14 +43,19 @@ prompt = PromptTemplate(
     partial_variables={"format_instructions": parser.get_format_instructions()}
 )
 
-chain = prompt | llm | parser
+registry.register(
+    "evaluation",
+    lambda llm: prompt | llm | parser,
+    response_schema=parser.pydantic_object,
+)
 
 
-def evaluate_interview(request: InterviewSummaryRequest) -> EvaluationResponse:
+async def evaluate_interview(request: InterviewSummaryRequest) -> EvaluationResponse:
     def safe_text(value: str, default: str = "No information provided") -> str:
         return value.strip() if value and value.strip() else default
     
-    return chain.invoke({
+    chain = registry.chain("evaluation")
+    return await chain.ainvoke({
         "technical_skills": safe_text(request.technicalSkills),
         "communication_collaboration": safe_text(request.communicationCollaboration),
         "cultural_fit_values": safe_text(request.culturalFitValues),
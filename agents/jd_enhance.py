@@ -3,27 +3,14 @@ from langchain.prompts import PromptTemplate
 import os
 from dotenv import load_dotenv
 from agents.types import JobDescriptionTitleAISuggest
-from langchain.output_parsers import PydanticOutputParser
-from langchain_google_genai import GoogleGenerativeAI
+from agents.structured_output import RepairingOutputParser
+from agents.registry import registry
 from agents.types import Enhancecertifications, Enhanceeducation, EnhancekeyResponsibilities, EnhanceniceToHave, EnhancesoftSkills, EnhancetechnicalSkills
-from config.Settings import settings
 
 load_dotenv()
-from config.Settings import api_key, settings
-import google.generativeai as genai
-
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel(settings.model)
-
-llm = GoogleGenerativeAI(
-    model=settings.model,
-    google_api_key=api_key,
-    temperature=settings.temperature,
-    max_output_tokens=settings.max_output_tokens
-)
 
 # Key Responsibilities Chain
-key_resp_parser = PydanticOutputParser(pydantic_object=EnhancekeyResponsibilities)
+key_resp_parser = RepairingOutputParser(pydantic_object=EnhancekeyResponsibilities)
 key_resp_prompt = PromptTemplate(
     input_variables=["title", "experienceRange", "department", "subDepartment", "keyResponsibilities"],
     template="""
@@ -41,10 +28,14 @@ key_resp_prompt = PromptTemplate(
     """,
     partial_variables={"format_instructions": key_resp_parser.get_format_instructions()},
 )
-key_resp_chain = LLMChain(llm=llm, prompt=key_resp_prompt, output_parser=key_resp_parser)
+registry.register(
+    "jd_enhance.keyResponsibilities",
+    lambda llm: LLMChain(llm=llm, prompt=key_resp_prompt, output_parser=key_resp_parser),
+    response_schema=key_resp_parser.pydantic_object,
+)
 
 # Soft Skills Chain
-soft_parser = PydanticOutputParser(pydantic_object=EnhancesoftSkills)
+soft_parser = RepairingOutputParser(pydantic_object=EnhancesoftSkills)
 soft_prompt = PromptTemplate(
     input_variables=["title", "experienceRange", "department", "subDepartment", "softSkills"],
     template="""
@@ -65,10 +56,14 @@ soft_prompt = PromptTemplate(
     """,
     partial_variables={"format_instructions": soft_parser.get_format_instructions()},
 )
-soft_chain = LLMChain(llm=llm, prompt=soft_prompt, output_parser=soft_parser)
+registry.register(
+    "jd_enhance.softSkills",
+    lambda llm: LLMChain(llm=llm, prompt=soft_prompt, output_parser=soft_parser),
+    response_schema=soft_parser.pydantic_object,
+)
 
 # Technical Skills Chain
-tech_parser = PydanticOutputParser(pydantic_object=EnhancetechnicalSkills)
+tech_parser = RepairingOutputParser(pydantic_object=EnhancetechnicalSkills)
 tech_prompt = PromptTemplate(
     input_variables=["title", "experienceRange", "department", "subDepartment", "technicalSkills"],
     template="""
@@ -90,10 +85,14 @@ tech_prompt = PromptTemplate(
     """,
     partial_variables={"format_instructions": tech_parser.get_format_instructions()},
 )
-tech_chain = LLMChain(llm=llm, prompt=tech_prompt, output_parser=tech_parser)
+registry.register(
+    "jd_enhance.technicalSkills",
+    lambda llm: LLMChain(llm=llm, prompt=tech_prompt, output_parser=tech_parser),
+    response_schema=tech_parser.pydantic_object,
+)
 
 # Education Chain
-edu_parser = PydanticOutputParser(pydantic_object=Enhanceeducation)
+edu_parser = RepairingOutputParser(pydantic_object=Enhanceeducation)
 edu_prompt = PromptTemplate(
     input_variables=["title", "experienceRange", "department", "subDepartment", "education"],
     template="""
@@ -114,10 +113,14 @@ edu_prompt = PromptTemplate(
     """,
     partial_variables={"format_instructions": edu_parser.get_format_instructions()},
 )
-edu_chain = LLMChain(llm=llm, prompt=edu_prompt, output_parser=edu_parser)
+registry.register(
+    "jd_enhance.education",
+    lambda llm: LLMChain(llm=llm, prompt=edu_prompt, output_parser=edu_parser),
+    response_schema=edu_parser.pydantic_object,
+)
 
 # Certifications Chain
-cert_parser = PydanticOutputParser(pydantic_object=Enhancecertifications)
+cert_parser = RepairingOutputParser(pydantic_object=Enhancecertifications)
 cert_prompt = PromptTemplate(
     input_variables=["title", "experienceRange", "department", "subDepartment", "certifications"],
     template="""
@@ -138,10 +141,14 @@ cert_prompt = PromptTemplate(
     """,
     partial_variables={"format_instructions": cert_parser.get_format_instructions()},
 )
-cert_chain = LLMChain(llm=llm, prompt=cert_prompt, output_parser=cert_parser)
+registry.register(
+    "jd_enhance.certifications",
+    lambda llm: LLMChain(llm=llm, prompt=cert_prompt, output_parser=cert_parser),
+    response_schema=cert_parser.pydantic_object,
+)
 
 # Nice-to-Have Skills Chain
-nice_parser = PydanticOutputParser(pydantic_object=EnhanceniceToHave)
+nice_parser = RepairingOutputParser(pydantic_object=EnhanceniceToHave)
 nice_prompt = PromptTemplate(
     input_variables=["title", "experienceRange", "department", "subDepartment", "niceToHave"],
     template="""
@@ -162,4 +169,13 @@ nice_prompt = PromptTemplate(
     """,
     partial_variables={"format_instructions": nice_parser.get_format_instructions()},
 )
-nice_chain = LLMChain(llm=llm, prompt=nice_prompt, output_parser=nice_parser)
\ No newline at end of file
+registry.register(
+    "jd_enhance.niceToHave",
+    lambda llm: LLMChain(llm=llm, prompt=nice_prompt, output_parser=nice_parser),
+    response_schema=nice_parser.pydantic_object,
+)
+
+
+def get_enhance_chain(field_name: str):
+    """Return the shared chain for a job description field."""
+    return registry.chain(f"jd_enhance.{field_name}")
@@ -2,27 +2,12 @@ from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
 import os
 from dotenv import load_dotenv
-from langchain.output_parsers import PydanticOutputParser
-from langchain_google_genai import GoogleGenerativeAI
+from agents.structured_output import RepairingOutputParser
+from agents.registry import registry
 from agents.types import Enhancecertifications, Enhanceeducation, EnhancekeyResponsibilities, EnhanceniceToHave, EnhancesoftSkills, EnhancetechnicalSkills
-from config.Settings import settings
 load_dotenv()
-from config.Settings import api_key, settings
-import google.generativeai as genai
 
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel(settings.model)
-
-llm = GoogleGenerativeAI(
-    model=settings.model,
-    google_api_key=api_key,
-    temperature=settings.temperature,
-    max_output_tokens=settings.max_output_tokens
-)
-
-
-
-key_resp_parser = PydanticOutputParser(pydantic_object=EnhancekeyResponsibilities)
+key_resp_parser = RepairingOutputParser(pydantic_object=EnhancekeyResponsibilities)
 key_resp_prompt = PromptTemplate(
     input_variables=["title", "experienceRange", "department", "subDepartment"],
     template="""
@@ -39,11 +24,17 @@ If title ,experincerange,department,subdepartment,format_instructions as not val
 """,
     partial_variables={"format_instructions": key_resp_parser.get_format_instructions()},
 )
-key_resp_chain_re = LLMChain(llm=llm, prompt=key_resp_prompt, output_parser=key_resp_parser)
-
+registry.register(
+    "jd_regenerate.keyResponsibilities",
+    lambda llm: LLMChain(llm=llm, prompt=key_resp_prompt, output_parser=key_resp_parser),
+    response_schema=key_resp_parser.pydantic_object,
+    # Regeneration must return a fresh answer every time, so none of
+    # these chains use the LLM cache.
+    cache_ttl=0,
+)
 
 
-soft_parser = PydanticOutputParser(pydantic_object=EnhancesoftSkills)
+soft_parser = RepairingOutputParser(pydantic_object=EnhancesoftSkills)
 soft_prompt = PromptTemplate(
     input_variables=["title", "experienceRange", "department", "subDepartment"],
     template="""
@@ -60,11 +51,15 @@ If title ,experincerange,department,subdepartment,format_instructions as not val
 """,
     partial_variables={"format_instructions": soft_parser.get_format_instructions()},
 )
-soft_chain_re = LLMChain(llm=llm, prompt=soft_prompt, output_parser=soft_parser)
-
+registry.register(
+    "jd_regenerate.softSkills",
+    lambda llm: LLMChain(llm=llm, prompt=soft_prompt, output_parser=soft_parser),
+    response_schema=soft_parser.pydantic_object,
+    cache_ttl=0,
+)
 
 
-tech_parser = PydanticOutputParser(pydantic_object=EnhancetechnicalSkills)
+tech_parser = RepairingOutputParser(pydantic_object=EnhancetechnicalSkills)
 tech_prompt = PromptTemplate(
     input_variables=["title", "experienceRange", "department", "subDepartment"],
     template="""
@@ -81,11 +76,15 @@ If title ,experincerange,department,subdepartment,format_instructions as not val
 """,
     partial_variables={"format_instructions": tech_parser.get_format_instructions()},
 )
-tech_chain_re = LLMChain(llm=llm, prompt=tech_prompt, output_parser=tech_parser)
-
+registry.register(
+    "jd_regenerate.technicalSkills",
+    lambda llm: LLMChain(llm=llm, prompt=tech_prompt, output_parser=tech_parser),
+    response_schema=tech_parser.pydantic_object,
+    cache_ttl=0,
+)
 
 
-edu_parser = PydanticOutputParser(pydantic_object=Enhanceeducation)
+edu_parser = RepairingOutputParser(pydantic_object=Enhanceeducation)
 edu_prompt = PromptTemplate(
     input_variables=["title", "experienceRange", "department", "subDepartment"],
     template="""
@@ -102,11 +101,15 @@ If title ,experincerange,department,subdepartment,format_instructions as not val
 """,
     partial_variables={"format_instructions": edu_parser.get_format_instructions()},
 )
-edu_chain_re = LLMChain(llm=llm, prompt=edu_prompt, output_parser=edu_parser)
-
+registry.register(
+    "jd_regenerate.education",
+    lambda llm: LLMChain(llm=llm, prompt=edu_prompt, output_parser=edu_parser),
+    response_schema=edu_parser.pydantic_object,
+    cache_ttl=0,
+)
 
 
-cert_parser = PydanticOutputParser(pydantic_object=Enhancecertifications)
+cert_parser = RepairingOutputParser(pydantic_object=Enhancecertifications)
 cert_prompt = PromptTemplate(
     input_variables=["title", "experienceRange", "department", "subDepartment"],
     template="""
@@ -123,11 +126,15 @@ If title ,experincerange,department,subdepartment,format_instructions as not val
 """,
     partial_variables={"format_instructions": cert_parser.get_format_instructions()},
 )
-cert_chain_re = LLMChain(llm=llm, prompt=cert_prompt, output_parser=cert_parser)
-
+registry.register(
+    "jd_regenerate.certifications",
+    lambda llm: LLMChain(llm=llm, prompt=cert_prompt, output_parser=cert_parser),
+    response_schema=cert_parser.pydantic_object,
+    cache_ttl=0,
+)
 
 
-nice_parser = PydanticOutputParser(pydantic_object=EnhanceniceToHave)
+nice_parser = RepairingOutputParser(pydantic_object=EnhanceniceToHave)
 nice_prompt = PromptTemplate(
     input_variables=["title", "experienceRange", "department", "subDepartment"],
     template="""
@@ -144,4 +151,14 @@ If title ,experincerange,department,subdepartment,format_instructions as not val
 """,
     partial_variables={"format_instructions": nice_parser.get_format_instructions()},
 )
-nice_chain_re = LLMChain(llm=llm, prompt=nice_prompt, output_parser=nice_parser)
\ No newline at end of file
+registry.register(
+    "jd_regenerate.niceToHave",
+    lambda llm: LLMChain(llm=llm, prompt=nice_prompt, output_parser=nice_parser),
+    response_schema=nice_parser.pydantic_object,
+    cache_ttl=0,
+)
+
+
+def get_regenerate_chain(field_name: str):
+    """Return the shared chain for a job description field."""
+    return registry.chain(f"jd_regenerate.{field_name}")
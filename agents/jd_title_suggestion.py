@@ -1,64 +1,56 @@
 from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
-from langchain.output_parsers import PydanticOutputParser
-from langchain_google_genai import GoogleGenerativeAI
+from agents.structured_output import RepairingOutputParser
+from agents.registry import registry
 from agents.types import JobDescriptionTitleAISuggest
 from app.models.jd_model import JobTitleAISuggestInput
-from config.Settings import settings
-from config.Settings import api_key, settings
-import google.generativeai as genai
 
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel(settings.model)
+job_title_prompt = PromptTemplate(
+    input_variables=[
+        "title",
+        "experienceRange",
+        "department",
+        "subDepartment",
+        "keyResponsibilities",
+        "softSkills",
+        "technicalSkills",
+        "education",
+        "certifications",
+        "niceToHave",
+    ],
+    template="""
+You are an AI that suggests job titles based on the following job information:
 
-def title_suggests(job:JobTitleAISuggestInput):
-    job_title_prompt = PromptTemplate(
-        input_variables=[
-            "title",
-            "experienceRange",
-            "department",
-            "subDepartment",
-            "keyResponsibilities",
-            "softSkills",
-            "technicalSkills",
-            "education",
-            "certifications",
-            "niceToHave",
-        ],
-        template="""
-    You are an AI that suggests job titles based on the following job information:
+- Current Job Title: {title}
+- Experience Range: {experienceRange}
+- Department: {department}
+- Sub-Department: {subDepartment}
+- Key Responsibilities: {keyResponsibilities}
+- Soft Skills: {softSkills}
+- Technical Skills: {technicalSkills}
+- Education Requirements: {education}
+- Certifications: {certifications}
+- Nice to Have: {niceToHave}
 
-    - Current Job Title: {title}
-    - Experience Range: {experienceRange}
-    - Department: {department}
-    - Sub-Department: {subDepartment}
-    - Key Responsibilities: {keyResponsibilities}
-    - Soft Skills: {softSkills}
-    - Technical Skills: {technicalSkills}
-    - Education Requirements: {education}
-    - Certifications: {certifications}
-    - Nice to Have: {niceToHave}
+Return a JSON list of 5-10 suitable alternative job titles, in the following format:
 
-    Return a JSON list of 5-10 suitable alternative job titles, in the following format:
-
-    {{"title": ["title1", "title2", "title3", ...]}}
-    """
-    )
-
-    parser = PydanticOutputParser(pydantic_object=JobDescriptionTitleAISuggest)
+{{"title": ["title1", "title2", "title3", ...]}}
+"""
+)
 
+parser = RepairingOutputParser(pydantic_object=JobDescriptionTitleAISuggest)
 
-    llm = GoogleGenerativeAI(
-    model=settings.model,
-    google_api_key=api_key,
-    temperature=settings.temperature,
-    max_output_tokens=settings.max_output_tokens
+registry.register(
+    "jd_title_suggestion",
+    lambda llm: LLMChain(llm=llm, prompt=job_title_prompt, verbose=True, output_parser=parser),
+    response_schema=parser.pydantic_object,
 )
 
-    chain = LLMChain(llm=llm,prompt=job_title_prompt,verbose=True,output_parser=parser)
 
+async def title_suggests(job:JobTitleAISuggestInput):
+    chain = registry.chain("jd_title_suggestion")
 
-    raw_output = chain.invoke({
+    raw_output = await chain.ainvoke({
         "title": job.title,
         "experienceRange": job.experienceRange,
         "department": job.department,
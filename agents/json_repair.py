@@ -0,0 +1,124 @@
+import json
+import re
+from typing import Any, List
+
+_FENCE = re.compile(r"^\s*```(?:json|JSON)?\s*|\s*```\s*$")
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+class JsonRepairError(ValueError):
+    pass
+
+
+def _strip_to_json(text: str) -> str:
+    """Drop code fences and any prose before the first ``{``/``[``."""
+    text = _FENCE.sub("", text.strip())
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        raise JsonRepairError("No JSON object or array found in model output")
+    return text[min(starts):]
+
+
+def _normalize(text: str) -> str:
+    """
+    One pass over the text fixing what LLMs typically get wrong: single-quoted
+    strings, raw newlines inside strings, Python literals, // and /* */
+    comments, trailing commas, and output cut off mid-object (unclosed strings
+    and brackets are closed). Anything after the top-level value is dropped.
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    quote = None  # the quote char of the string being copied, if any
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if quote:
+            if ch == "\\" and i + 1 < n:
+                nxt = text[i + 1]
+                # \' is valid in single-quoted strings but not in JSON.
+                out.append("'" if nxt == "'" else ch + nxt)
+                i += 2
+                continue
+            if ch == quote:
+                out.append('"')
+                quote = None
+            elif ch == '"':
+                out.append('\\"')
+            elif ch == "\n":
+                out.append("\\n")
+            elif ch == "\r":
+                out.append("\\r")
+            elif ch == "\t":
+                out.append("\\t")
+            else:
+                out.append(ch)
+            i += 1
+            continue
+
+        if ch in "\"'":
+            quote = ch
+            out.append('"')
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            out.append(ch)
+        elif ch in "}]":
+            _drop_trailing_comma(out)
+            if stack:
+                out.append(stack.pop())
+            if not stack:
+                break
+        elif ch == "/" and text.startswith("//", i):
+            end = text.find("\n", i)
+            i = n if end == -1 else end
+            continue
+        elif ch == "/" and text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        elif ch.isalpha():
+            word = re.match(r"[A-Za-z_]+", text[i:]).group(0)
+            out.append(_LITERALS.get(word, word))
+            i += len(word)
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    # Truncated output: close whatever is still open.
+    if quote:
+        out.append('"')
+    _drop_trailing_comma(out)
+    if out and out[-1].rstrip().endswith(":"):
+        out.append("null")
+    while stack:
+        _drop_trailing_comma(out)
+        out.append(stack.pop())
+    return "".join(out)
+
+
+def _drop_trailing_comma(out: List[str]) -> None:
+    j = len(out) - 1
+    while j >= 0 and out[j].isspace():
+        j -= 1
+    if j >= 0 and out[j] == ",":
+        del out[j]
+
+
+def repair_json(text: str) -> Any:
+    """
+    Parse JSON from raw LLM output, repairing it locally when needed.
+
+    Valid JSON (optionally fenced or wrapped in prose) parses as-is; otherwise
+    one normalizing pass is tried before giving up with JsonRepairError.
+    """
+    if not isinstance(text, str):
+        raise JsonRepairError(f"Expected model output as text, got {type(text).__name__}")
+    candidate = _strip_to_json(text)
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(_normalize(candidate))
+    except json.JSONDecodeError as e:
+        raise JsonRepairError(f"Could not repair model output as JSON: {e}") from e
@@ -0,0 +1,33 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from app.services.cache import TieredCache
+from config.Settings import settings
+
+# Shared by every chain; entries carry the TTL of the chain that wrote them.
+llm_cache = TieredCache(
+    "llm_responses",
+    settings.llm_cache_path,
+    max_entries=settings.llm_cache_max_entries,
+    max_disk_entries=settings.llm_cache_max_disk_entries,
+)
+
+
+def cache_key(model: str, generation_config: Dict[str, Any], prompt: str) -> str:
+    """
+    Content address of one completion: model, every generation-config field
+    (temperature, output limit, stop sequences, response schema) and the
+    rendered prompt.
+    """
+    payload = json.dumps([model, generation_config, prompt], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def chain_ttl(chain: Optional[str], default: Optional[float]) -> float:
+    """Effective TTL in seconds for a chain; 0 disables caching."""
+    if not settings.llm_cache_enabled:
+        return 0
+    if chain and chain in settings.llm_cache_ttls:
+        return settings.llm_cache_ttls[chain]
+    return settings.llm_cache_ttl if default is None else default
@@ -0,0 +1,151 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.output_parsers import BaseOutputParser
+from langchain_core.outputs import Generation
+
+from agents.backends import get_backend
+from agents.dispatcher import DispatchingLLM
+from agents.llm_cache import chain_ttl
+from agents.structured_output import gemini_schema
+from config.Settings import settings
+
+ChainBuilder = Callable[[Any], Any]
+
+
+class _ForgetOnParseError(BaseOutputParser):
+    """
+    Wraps a chain's output parser: a completion it rejects is dropped from
+    the LLM response cache, so a retry asks the model again instead of
+    getting the same malformed text back.
+    """
+
+    parser: BaseOutputParser
+    llm: Any
+
+    def parse_result(self, result: List[Generation], *, partial: bool = False) -> Any:
+        try:
+            return self.parser.parse_result(result, partial=partial)
+        except Exception:
+            self.llm.forget(result[0].text)
+            raise
+
+    def parse(self, text: str) -> Any:
+        try:
+            return self.parser.parse(text)
+        except Exception:
+            self.llm.forget(text)
+            raise
+
+    def get_format_instructions(self) -> str:
+        return self.parser.get_format_instructions()
+
+    @property
+    def _type(self) -> str:
+        return self.parser._type
+
+
+class LLMRegistry:
+    """
+    Process-wide registry of LLM clients and compiled chains.
+
+    Agents register a builder for each chain at import time. The chain (and
+    the client it wraps) is built on first use and then reused by every
+    request, so prompts, parsers and client connections are set up once per
+    worker instead of once per call.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._llms: Dict[Tuple[Any, ...], Any] = {}
+        self._builders: Dict[str, Tuple[ChainBuilder, Dict[str, Any]]] = {}
+        self._chains: Dict[str, Any] = {}
+
+    def llm(
+        self,
+        temperature: Optional[float] = None,
+        max_output_tokens: Optional[int] = None,
+        chain: Optional[str] = None,
+        cache_ttl: Optional[float] = None,
+        response_schema: Optional[type] = None,
+    ):
+        """
+        Return the shared LLM for the given generation settings and chain.
+
+        ``response_schema`` is the pydantic model the chain parses into; with
+        ``settings.llm_structured_output`` on, it is sent to Gemini so the
+        model is constrained to emit matching JSON.
+
+        Every LLM routes through the same backend: the KeyDispatcher, which
+        owns one bound client per API key, or the offline fake. The chain
+        name selects the cache TTL and labels metrics.
+        """
+        params = (
+            settings.temperature if temperature is None else temperature,
+            settings.max_output_tokens if max_output_tokens is None else max_output_tokens,
+            chain,
+            chain_ttl(chain, cache_ttl),
+            response_schema if settings.llm_structured_output else None,
+        )
+        client = self._llms.get(params)
+        if client is None:
+            with self._lock:
+                client = self._llms.get(params)
+                if client is None:
+                    client = DispatchingLLM(
+                        dispatcher=get_backend(),
+                        model=settings.model,
+                        temperature=params[0],
+                        max_output_tokens=params[1],
+                        chain=params[2],
+                        cache_ttl=params[3],
+                        response_schema=gemini_schema(params[4]) if params[4] else None,
+                    )
+                    self._llms[params] = client
+        return client
+
+    def register(self, name: str, builder: ChainBuilder, **llm_params: Any) -> None:
+        """
+        Register ``builder(llm) -> chain`` under ``name``; built on first use.
+
+        ``llm_params`` go to ``llm()``, e.g. ``cache_ttl=0`` for chains whose
+        answers must not be reused (nor shared between concurrent identical
+        calls), or ``response_schema=Model``.
+        """
+        with self._lock:
+            self._builders[name] = (builder, llm_params)
+            self._chains.pop(name, None)
+
+    def chain(self, name: str):
+        chain = self._chains.get(name)
+        if chain is None:
+            with self._lock:
+                chain = self._chains.get(name)
+                if chain is None:
+                    if name not in self._builders:
+                        raise KeyError(f"No chain registered under '{name}'")
+                    builder, llm_params = self._builders[name]
+                    llm = self.llm(chain=name, **llm_params)
+                    chain = builder(llm)
+                    parser = getattr(chain, "output_parser", None)
+                    if llm.cache_ttl > 0 and isinstance(parser, BaseOutputParser):
+                        chain.output_parser = _ForgetOnParseError(parser=parser, llm=llm)
+                    self._chains[name] = chain
+        return chain
+
+    def names(self):
+        return sorted(self._builders)
+
+    def warmup(self) -> None:
+        """Build every registered chain up front."""
+        for name in self.names():
+            self.chain(name)
+
+    def reset(self) -> None:
+        """Drop built clients and chains; builders stay registered."""
+        with self._lock:
+            self._llms.clear()
+            self._chains.clear()
+
+
+registry = LLMRegistry()
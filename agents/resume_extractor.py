@@ -1,35 +1,32 @@
+import asyncio
+import hashlib
 import json
+import logging
+from typing import Any, List
+
+import pydantic
+import xxhash
 from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
-from langchain_google_genai import GoogleGenerativeAI
-from langchain.output_parsers import PydanticOutputParser
-from agents.types import CandidateAllInOne
-from app.services.text_extract import pdf_to_text
+from agents.json_repair import JsonRepairError, repair_json
+from agents.micro_batch import MicroBatcher
+from agents.structured_output import RepairingOutputParser
+from agents.registry import registry
+from agents.types import CandidateAllInOne, CandidateBatch
+from app.services.cache import TieredCache
+from app.services.experience import apply_experience
+from app.services.field_extract import apply_local_fields, extract_local_fields, record_agreement
+from app.services.metrics import resume_batch_documents
+from app.services.text_compact import compact_resume_text
+from app.services.text_extract import apdf_to_text
 from config.Settings import settings
-from datetime import datetime
-
-today = datetime.today()
-
-month = today.month
-year = today.year
-
-from config.Settings import api_key, settings
-import google.generativeai as genai
 
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel(settings.model)
-llm = GoogleGenerativeAI(
-    model=settings.model,
-    google_api_key=api_key,
-    temperature=settings.temperature,
-    max_output_tokens=settings.max_output_tokens
-)
+logger = logging.getLogger(__name__)
 
-parser = PydanticOutputParser(pydantic_object=CandidateAllInOne)
+parser = RepairingOutputParser(pydantic_object=CandidateAllInOne)
 
-prompt = PromptTemplate(
-    input_variables=["text","month","year"],
-    template = """
+# Shared by the single-resume and the batched prompt.
+EXTRACTION_INSTRUCTIONS = """
 You are an expert information extractor. Extract candidate details from the given text and return a JSON object that strictly matches the CandidateAllInOne schema below.
 
 ### Extraction Rules:
@@ -42,33 +39,11 @@ You are an expert information extractor. Extract candidate details from the give
 7. **All technologies mentioned anywhere in the text should be listed in `technical_skills`.** Do not include a `technologies` field under work experience.
 8. Skills must not include tool names unless explicitly listed.
 9. Do not add extra text, explanations, or comments—return JSON only.
-10. for experience_year return float value have only value after dot (ex. 2.3,4.5)
-11. If the document does not look like a resume, or if it contains ANY single mention or content that is not suitable for a professional CV (even if the rest looks professional), return a JSON object with all fields set to null. 
+10. If the document does not look like a resume, or if it contains ANY single mention or content that is not suitable for a professional CV (even if the rest looks professional), return a JSON object with all fields set to null. 
+{prefilled}
 
 ### AI Analysis Extraction:
-- For ai_analysis, calculate total work experience precisely:
-  1. For each work_experience entry, determine duration:
-     - If start_date and end_date are provided, compute months difference.
-     - If end_date is missing:
-       - If is_current=true → use current month {month} and year {year}.
-       - Else → assume end_date is **the start_date of the next work_experience minus one month**.
-     - If end_date is "Till date", "Present", or similar, use current month and year.
-     - If only year is given, assume January as start month and December as end month.
-  2. Sum all months across all work_experience entries.
-  3. Convert total months to years as a float with **one decimal**:
-     - total_years = total_months // 12 + (total_months % 12) / 12
-     - Round **one decimal**, e.g., 14.3, 2.8
-  4. Assign `experience_year` this float value.
-- Determine experience_level based on total years (experience_year) using the same mapping as the system enum:
-  - If 0 <= experience_year < 1 → "Entry_Level"
-  - If 1 <= experience_year < 3 → "Junior_Level"
-  - If 3 <= experience_year < 5 → "Mid_Level"
-  - If 5 <= experience_year < 8 → "Mid_Senior_Level"
-  - If 8 <= experience_year < 12 → "Senior"
-  - If 12 <= experience_year < 15 → "Lead"
-  - If experience_year >= 15 → "Principal/Director"
-- Ensure the experience_year value is rounded to one decimal before comparison.
-- Always select the correct level strictly based on these numeric thresholds (do not approximate or guess).
+- Leave experience_year and experience_level out; they are computed from work_experience.
 - Include primary_domain, key_strengths, career_progression_score (1–10), skill_diversity_score (1–10), and good_point if apparent.
 
 ### Tags (Smart Tag Generation Rules):
@@ -106,7 +81,7 @@ Follow these rules carefully:
      - For Dev: "Software Development", "Web Development", "Backend Development", "Frontend Development"
 
   4. **Experience & Level Tags:**  
-     - Based on calculated experience_year
+     - Based on the total length of the work history
      - Examples: "Fresher", "2+ Years Experience", "Senior Engineer", "5+ Years Experience", "8+ Years Experience", "Mid-Level Professional", "Lead Engineer"
 
   5. **Methodology / Process Tags (if applicable):**  
@@ -181,8 +156,6 @@ Follow these rules carefully:
     "soft_skills": [string] | null
   }} | null,
   "ai_analysis": {{
-    "experience_level": string | null,
-    "experience_year": float | null
     "primary_domain": string | null,
     "key_strengths": [string] | null,
     "career_progression_score": int | null,
@@ -191,7 +164,11 @@ Follow these rules carefully:
   }} | null,
   "tags": [string] | null
 }}
+"""
 
+prompt = PromptTemplate(
+    input_variables=["text","prefilled"],
+    template = EXTRACTION_INSTRUCTIONS + """
 ### Input Text:
 {text}
 
@@ -200,24 +177,163 @@ Return only the JSON object.
 """
 )
 
+# Starts each resume in the batched prompt.
+BATCH_DELIMITER = "<<<RESUME {index}>>>"
+
+batch_prompt = PromptTemplate(
+    input_variables=["resumes","count","prefilled"],
+    template = EXTRACTION_INSTRUCTIONS + """
+### Input Texts:
+There are {count} resumes below, each starting with a <<<RESUME n>>> line. Apply the rules to each resume on its own and never carry information from one resume into another.
+
+{resumes}
+
+### Output:
+Return only a JSON array of exactly {count} objects, one per resume, in the order given.
+"""
+)
+
+
+registry.register(
+    "resume_extractor",
+    lambda llm: LLMChain(
+        llm=llm,
+        prompt=prompt,
+        output_parser=parser,
+        verbose=True
+    ),
+    cache_ttl=7 * 24 * 3600,
+    response_schema=CandidateAllInOne,
+)
+
+# Entries are validated one by one in _extract_batch, so there is no parser.
+# A given mix of resumes rarely recurs; extraction_cache keeps the results.
+registry.register(
+    "resume_extractor_batch",
+    lambda llm: LLMChain(
+        llm=llm,
+        prompt=batch_prompt,
+        verbose=True
+    ),
+    cache_ttl=0,
+    max_output_tokens=settings.max_output_tokens * max(1, settings.resume_batch_size),
+    response_schema=CandidateBatch,
+)
+
+# Changes whenever the prompt text does, so edited prompts never serve stale results.
+PROMPT_VERSION = hashlib.sha256(
+    (prompt.template + batch_prompt.template).encode("utf-8")
+).hexdigest()[:12]
 
-candidate_extraction_chain = LLMChain(
-    llm=llm,
-    prompt=prompt,
-    output_parser=parser,
-    verbose=True
+# Whole-document results: a re-uploaded resume skips text extraction and the LLM.
+extraction_cache = TieredCache(
+    "resume_extractions",
+    settings.llm_cache_path,
+    max_entries=settings.extraction_cache_max_entries,
 )
 
-def resume_extract_info(pdf_path):
-    input_text = pdf_to_text(pdf_path)
+
+# Added to the rules when LOCAL_FIELD_MODE=fill; the regex pass supplies these.
+PREFILLED_FIELDS_RULE = (
+    "11. Set personal_info.email and personal_info.phone to null; they are extracted separately."
+)
+
+
+def _prefilled_rule() -> str:
+    return PREFILLED_FIELDS_RULE if settings.local_field_mode == "fill" else ""
+
+
+async def _extract_one(text: str) -> CandidateAllInOne:
+    # Malformed output is repaired by the parser in-process; if even that
+    # fails, the error propagates instead of re-sending the whole resume.
+    return await registry.chain("resume_extractor").arun(text=text, prefilled=_prefilled_rule())
+
+
+async def _extract_batch(texts: List[str]) -> List[Any]:
+    """
+    Extract several resumes with one prompt, so the instructions are sent
+    once per batch. Each entry of the answer is validated on its own; a
+    resume whose entry is missing or invalid is re-sent alone. Upstream
+    errors fail the whole batch, as they would a single call.
+    """
+    if len(texts) == 1:
+        return await asyncio.gather(_extract_one(texts[0]), return_exceptions=True)
+
+    resumes = "\n\n".join(
+        f"{BATCH_DELIMITER.format(index=i)}\n{text}" for i, text in enumerate(texts, start=1)
+    )
+    answer = await registry.chain("resume_extractor_batch").arun(
+        resumes=resumes, count=len(texts), prefilled=_prefilled_rule()
+    )
     try:
-        candidate = candidate_extraction_chain.run(text=input_text,month=month,year=year)
-        result = json.loads(candidate.json())  # Parse the JSON string into a dictionary
-    except Exception:
-        raw_output = llm(f"Extract JSON only from this text:\n{input_text}")
+        entries = repair_json(answer)
+    except JsonRepairError as e:
+        logger.warning(f"Unparseable batched extraction of {len(texts)} resumes: {e}")
+        entries = None
+    if not isinstance(entries, list) or len(entries) != len(texts):
+        # Without one entry per resume the order can't be trusted.
+        logger.warning(f"Batched extraction returned {len(entries) if isinstance(entries, list) else 'no'}"
+                       f" entries for {len(texts)} resumes; extracting them one by one")
+        entries = [None] * len(texts)
+
+    results: List[Any] = []
+    for entry in entries:
         try:
-            result = json.loads(raw_output)  # Ensure this is a dictionary
-        except json.JSONDecodeError as json_err:
-            raise Exception(f"Failed to parse extracted JSON: {str(json_err)}")
+            results.append(None if entry is None else CandidateAllInOne.model_validate(entry))
+        except pydantic.ValidationError:
+            results.append(None)
+    retry = [i for i, result in enumerate(results) if result is None]
+    resume_batch_documents.inc(len(texts) - len(retry), outcome="batched")
+    if retry:
+        resume_batch_documents.inc(len(retry), outcome="fallback")
+        fallbacks = await asyncio.gather(*(_extract_one(texts[i]) for i in retry), return_exceptions=True)
+        for i, result in zip(retry, fallbacks):
+            results[i] = result
+    return results
+
+
+resume_batcher = MicroBatcher(
+    "resume_extraction", _extract_batch, settings.resume_batch_size, settings.resume_batch_wait
+)
+
+
+def extraction_cache_key(content) -> str:
+    """Content address of one extraction: (file hash, prompt version, model, local field mode)."""
+    return (f"{xxhash.xxh3_128_hexdigest(content)}:{PROMPT_VERSION}:{settings.model}"
+            f":{settings.local_field_mode}")
+
+
+async def resume_extract_info(source, file_type=None):
+    """
+    ``source`` is a file path, or the document bytes/stream with ``file_type``.
+    Results for bytes sources are cached by content hash.
+    """
+    key = None
+    if settings.extraction_cache_enabled and isinstance(source, (bytes, bytearray, memoryview)):
+        key = extraction_cache_key(source)
+        cached = await extraction_cache.aget(key)
+        if cached is not None:
+            logger.info(f"Resume extraction cache hit {key}")
+            # Recomputed so ongoing jobs keep counting after the entry was cached.
+            return apply_experience(json.loads(cached))
+
+    raw_text = await apdf_to_text(source, file_type)
+    input_text = compact_resume_text(raw_text, settings.resume_token_budget).text
+    if settings.resume_batch_size > 1:
+        candidate = await resume_batcher.submit(input_text)
+    else:
+        candidate = await _extract_one(input_text)
+    fill = settings.local_field_mode == "fill"
+    result = json.loads(candidate.json())  # Parse the JSON string into a dictionary
+    if settings.local_field_mode in ("fill", "shadow"):
+        # On the full text: compaction may have trimmed the tail.
+        local_fields = extract_local_fields(raw_text)
+        if fill:
+            apply_local_fields(result, local_fields)
+        else:
+            record_agreement(result, local_fields)
+    apply_experience(result)
     print(result)
+    if key:
+        await extraction_cache.aset(key, json.dumps(result), ttl=settings.extraction_cache_ttl)
     return result
\ No newline at end of file
@@ -0,0 +1,119 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+import pydantic
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.outputs import Generation
+
+from agents.json_repair import JsonRepairError, repair_json
+from app.services.metrics import llm_output_repairs
+
+logger = logging.getLogger(__name__)
+
+_TYPES = {"string": "STRING", "integer": "INTEGER", "number": "NUMBER", "boolean": "BOOLEAN"}
+
+
+def gemini_schema(model: type) -> Dict[str, Any]:
+    """
+    Convert a pydantic model to a Gemini ``response_schema``.
+
+    Gemini takes an OpenAPI subset: no ``$ref``, ``default`` or ``anyOf``, so
+    references are inlined and ``Optional[X]`` becomes ``X`` with
+    ``nullable``. Constraints it can't express (``ge``, ``format: email``)
+    are dropped; the pydantic model still validates them after parsing.
+    """
+    root = model.model_json_schema()
+    defs = root.get("$defs", {})
+
+    def convert(node: Dict[str, Any]) -> Dict[str, Any]:
+        if "$ref" in node:
+            out = convert(defs[node["$ref"].rsplit("/", 1)[-1]])
+        elif "anyOf" in node:
+            options = [o for o in node["anyOf"] if o.get("type") != "null"]
+            if len(options) != 1:
+                raise ValueError(f"Unions are not supported in Gemini schemas: {node['anyOf']}")
+            out = convert(options[0])
+            if len(options) < len(node["anyOf"]):
+                out["nullable"] = True
+        elif "allOf" in node and len(node["allOf"]) == 1:
+            out = convert(node["allOf"][0])
+        elif "enum" in node:
+            out = {"type": "STRING", "enum": [str(v) for v in node["enum"]]}
+        elif node.get("type") == "object":
+            properties = node.get("properties") or {}
+            if not properties:
+                raise ValueError("Free-form objects are not supported in Gemini schemas")
+            out = {"type": "OBJECT", "properties": {k: convert(v) for k, v in properties.items()}}
+            if node.get("required"):
+                out["required"] = list(node["required"])
+        elif node.get("type") == "array":
+            out = {"type": "ARRAY", "items": convert(node.get("items") or {"type": "string"})}
+        elif node.get("type") in _TYPES:
+            out = {"type": _TYPES[node["type"]]}
+            if node.get("format") == "date-time":
+                out["format"] = "date-time"
+        else:
+            raise ValueError(f"Unsupported schema node: {node}")
+        if node.get("description") and "description" not in out:
+            out["description"] = node["description"]
+        return out
+
+    return convert(root)
+
+
+def _null_out(obj: Any, errors: List[Dict[str, Any]]) -> bool:
+    """Set each field that failed validation to None. True if anything changed."""
+    changed = False
+    for error in errors:
+        *parents, leaf = error["loc"] or (None,)
+        target = obj
+        try:
+            for key in parents:
+                target = target[key]
+            if isinstance(target, dict) and leaf in target and target[leaf] is not None:
+                target[leaf] = None
+                changed = True
+        except (KeyError, IndexError, TypeError):
+            continue
+    return changed
+
+
+class RepairingOutputParser(PydanticOutputParser):
+    """
+    PydanticOutputParser that fixes malformed output in-process.
+
+    When the strict parse fails, the raw text goes through ``repair_json``
+    (fences, prose, trailing commas, single quotes, truncation), and fields
+    that still fail validation are set to null if the model allows it. Only
+    when both steps fail does the usual OutputParserException surface, so a
+    malformed answer no longer costs a second LLM round trip.
+    """
+
+    def parse_result(self, result: List[Generation], *, partial: bool = False) -> Optional[Any]:
+        try:
+            return super().parse_result(result, partial=partial)
+        except OutputParserException as strict_error:
+            if partial:
+                return None
+            text = result[0].text
+            schema = self.pydantic_object.__name__
+            try:
+                obj = repair_json(text)
+            except JsonRepairError as e:
+                llm_output_repairs.inc(schema=schema, outcome="failed")
+                raise OutputParserException(str(e), llm_output=text) from strict_error
+            try:
+                parsed = self.pydantic_object.model_validate(obj)
+            except pydantic.ValidationError as e:
+                if not _null_out(obj, e.errors()):
+                    llm_output_repairs.inc(schema=schema, outcome="failed")
+                    raise self._parser_exception(e, obj) from strict_error
+                try:
+                    parsed = self.pydantic_object.model_validate(obj)
+                except pydantic.ValidationError as e:
+                    llm_output_repairs.inc(schema=schema, outcome="failed")
+                    raise self._parser_exception(e, obj) from strict_error
+            logger.info(f"Repaired malformed {schema} output locally")
+            llm_output_repairs.inc(schema=schema, outcome="repaired")
+            return parsed
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, RootModel
 from typing import Optional, List
 
 class JobDescriptionOutline(BaseModel):
@@ -78,6 +78,10 @@ class CandidateAllInOne(BaseModel):
     tags: Optional[List[str]] = []
 
 
+class CandidateBatch(RootModel[List[CandidateAllInOne]]):
+    """One CandidateAllInOne per resume of a batched extraction prompt, in order."""
+
+
 class AskAI(BaseModel):
     response: str
 
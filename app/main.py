@@ -1,8 +1,18 @@
 from fastapi import FastAPI, Request, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.routes import feedback_operation, jd_operation, jd_refine, resume_data, chatbot
 from fastapi.middleware.cors import CORSMiddleware
 from config.logging import setup_logging
-from config.Settings import settings
+from config.Settings import settings, key_manager
+from agents.backends import backend_status
+from agents.llm_cache import llm_cache
+from agents.resume_extractor import extraction_cache, resume_batcher
+from agents.single_flight import llm_single_flight
+from app.services.cache import all_caches
+from app.services.embeddings import embedding_engine
+from app.services.metrics import MetricsMiddleware, count_tokens, metrics, stats_collector
+from app.services.text_extract import extraction_pool
+from app.routes.resume_data import ingest_workers, job_store
 from starlette.middleware.base import BaseHTTPMiddleware
 
 setup_logging()
@@ -34,6 +44,33 @@ app.include_router(feedback_operation.router, prefix=api_v1, tags=["Feedback Pro
 app.include_router(chatbot.router, prefix=api_v1, tags=["Chatbot"])
 
 
+app.add_middleware(MetricsMiddleware)
+
+metrics.register_collector(stats_collector(
+    "cache",
+    lambda: [cache.stats() for cache in all_caches()],
+    counters=("hits", "disk_hits", "misses"),
+    gauges=("entries", "hit_rate"),
+))
+metrics.register_collector(stats_collector(
+    "llm_single_flight",
+    lambda: [llm_single_flight.stats()],
+    counters=("calls", "merged"),
+    gauges=("in_flight",),
+))
+metrics.register_collector(stats_collector(
+    "resume_batching",
+    lambda: [resume_batcher.stats()],
+    counters=("items", "batches"),
+    gauges=("mean_batch_size",),
+))
+metrics.register_collector(stats_collector(
+    "text_extraction",
+    lambda: [extraction_pool.stats()],
+    counters=("jobs", "timeouts", "restarts"),
+    gauges=("workers",),
+))
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -43,9 +80,78 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+def validate_api_keys():
+    # Key validation runs in the background so the worker can serve /health
+    # immediately instead of waiting on a round trip per key.
+    key_manager.start_background_validation()
+
+
+@app.on_event("startup")
+def load_embedding_model():
+    # Loads and warms up on a background thread; /ready reports when done,
+    # so no request pays the model load.
+    if settings.embedding_preload:
+        embedding_engine.start_background_load()
+
+
+@app.on_event("startup")
+def load_token_encoding():
+    # tiktoken fetches its encoding on first use; do that here rather than
+    # inside the first LLM call.
+    count_tokens("")
+
+
+@app.on_event("startup")
+async def start_ingest_workers():
+    # Files a previous run was extracting when it stopped are picked up again.
+    job_store.requeue_interrupted()
+    ingest_workers.start()
+
+
+@app.on_event("shutdown")
+async def stop_ingest_workers():
+    await ingest_workers.stop()
+
+
+@app.on_event("shutdown")
+def stop_extraction_pool():
+    extraction_pool.shutdown()
+
+
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "service": "TalentPulse-AI"}
+    return {
+        "status": "healthy",
+        "service": "TalentPulse-AI",
+        "api_keys": key_manager.status(),
+        "llm_backend": settings.llm_backend,
+        "llm_dispatch": backend_status(),
+        "llm_cache": llm_cache.stats(),
+        "llm_single_flight": llm_single_flight.stats(),
+        "resume_extraction_cache": extraction_cache.stats(),
+        "resume_batching": resume_batcher.stats(),
+        "text_extraction": extraction_pool.stats(),
+        "ingest_jobs": job_store.stats(),
+        "embeddings": embedding_engine.status(),
+    }
+
+@app.get("/ready")
+def readiness_check():
+    """503 until API keys are checked and, with EMBEDDING_PRELOAD, the embedding model is warm."""
+    checks = {
+        "api_keys": key_manager.ready,
+        "embeddings": embedding_engine.ready or not settings.embedding_preload,
+    }
+    ready = all(checks.values())
+    return JSONResponse(
+        {"status": "ready" if ready else "not_ready", "checks": checks, "embeddings": embedding_engine.status()},
+        status_code=200 if ready else 503,
+    )
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
     import uvicorn
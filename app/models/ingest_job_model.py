@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+
+class IngestJobStatus(BaseModel):
+    job_id: str
+    status: str  # queued | running | completed
+    total: int
+    pending: int
+    running: int
+    succeeded: int
+    failed: int
+    created_at: float
+    finished_at: Optional[float] = None
+
+
+class IngestJobResults(BaseModel):
+    job_id: str
+    status: str
+    offset: int
+    next_offset: int
+    # Same entries as /parse-cv's extracted_data, plus the upload index,
+    # in the order the files finished.
+    results: List[Dict[str, Any]]
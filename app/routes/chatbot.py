@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from fastapi import APIRouter, HTTPException
 from app.models.chatbot_model import CandidateMatchingRequest,ChatRequest,ChatResponse
@@ -7,12 +8,15 @@ import json, os
 router = APIRouter()
 FILE_PATH = "candidate_data.txt"
 
+def _write_candidate_data(json_data: str) -> None:
+    with open(FILE_PATH, "w", encoding="utf-8") as f:
+        f.write(json_data)
+
 @router.post("/save-candidate-matching")
-def save_candidate_matching(request: CandidateMatchingRequest):
+async def save_candidate_matching(request: CandidateMatchingRequest):
     try:
         json_data = json.dumps(request.dict(), indent=4, default=str)
-        with open(FILE_PATH, "w", encoding="utf-8") as f:
-            f.write(json_data)
+        await asyncio.to_thread(_write_candidate_data, json_data)
         return {"message": "Candidate data saved successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
@@ -21,7 +25,7 @@ def save_candidate_matching(request: CandidateMatchingRequest):
 @router.post("/chat", response_model=ChatResponse)
 async def chat_with_ai(request: ChatRequest):
     try:
-        response = ask_ai(request.question)
+        response = await ask_ai(request.question)
         return ChatResponse(answer=response)
 
     except HTTPException as e:
@@ -11,9 +11,9 @@ from app.models.resume_analyze_model import BatchAnalyzeRequest, BatchAnalyzeRes
 router = APIRouter()
 
 @router.post("/generate-job-description", response_model=JobDescriptionResponse)
-def generate_job_description(job: JobInput):
+async def generate_job_description(job: JobInput):
     try:
-        response = jd(
+        response = await jd(
             title=job.title,
             experienceRange=job.experienceRange,
             department=job.department,
@@ -25,9 +25,9 @@ def generate_job_description(job: JobInput):
         raise HTTPException(status_code=500, detail="Failed to generate job description")
 
 @router.post("/generate-AI-titleSuggestion", response_model=TitleSuggestionResponse)
-def job_title_suggestion(job: JobTitleAISuggestInput):
+async def job_title_suggestion(job: JobTitleAISuggestInput):
     try:
-        response = title_suggests(job)
+        response = await title_suggests(job)
         return response
     except Exception as e:
         logging.error(f"Error generating title suggestions: {str(e)}")
@@ -35,9 +35,9 @@ def job_title_suggestion(job: JobTitleAISuggestInput):
     
 
 @router.post("/generate-job-tags", response_model=JobTagsOutput)
-def generate_job_tags(job: JobDescriptionInput):
+async def generate_job_tags(job: JobDescriptionInput):
     try:
-        response = return_jd(
+        response = await return_jd(
             title=job.title,
             experienceRange=job.experienceRange,
             job_description=job.job_description,
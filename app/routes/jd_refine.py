@@ -1,8 +1,8 @@
 import json
 from fastapi import APIRouter, HTTPException
 from app.models.jd_model import JobRefineInput
-from agents.jd_regenrate import key_resp_chain_re, soft_chain_re, tech_chain_re, edu_chain_re, cert_chain_re, nice_chain_re
-from agents.jd_enhance import nice_chain,cert_chain,edu_chain,tech_chain,soft_chain,key_resp_chain
+from agents.jd_regenrate import get_regenerate_chain
+from agents.jd_enhance import get_enhance_chain
 import logging
 from typing import Dict, Any
 
@@ -11,6 +11,17 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Job description fields that have a regenerate and an enhance chain, in the
+# order they're looked for in the request.
+REFINABLE_FIELDS = (
+    "keyResponsibilities",
+    "softSkills",
+    "technicalSkills",
+    "education",
+    "certifications",
+    "niceToHave",
+)
+
 def process_field_output(output: Any, field_name: str) -> list:
     """
     Process the output from chain invocation and extract the field data.
@@ -62,7 +73,7 @@ def prepare_context(job_dict: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 @router.post("/regenerate-job-field")
-def regenerate_job_field(job: JobRefineInput):
+async def regenerate_job_field(job: JobRefineInput):
     """
     Regenerate specific job description fields based on input.
 
@@ -83,23 +94,15 @@ def regenerate_job_field(job: JobRefineInput):
 
         logger.debug(f"Context prepared: {context}")
 
-        field_map = {
-            "keyResponsibilities": (key_resp_chain_re, "keyResponsibilities"),
-            "softSkills": (soft_chain_re, "softSkills"),
-            "technicalSkills": (tech_chain_re, "technicalSkills"),
-            "education": (edu_chain_re, "education"),
-            "certifications": (cert_chain_re, "certifications"),
-            "niceToHave": (nice_chain_re, "niceToHave")
-        }
-
-        for field, (chain, field_name) in field_map.items():
-            if job_dict.get(field) is not None:
+        for field_name in REFINABLE_FIELDS:
+            if job_dict.get(field_name) is not None:
                 logger.info(f"Processing field: {field_name}")
-                payload = {**context, field_name: job_dict[field]}
+                payload = {**context, field_name: job_dict[field_name]}
 
                 try:
+                    chain = get_regenerate_chain(field_name)
                     logger.debug(f"Invoking chain for {field_name} with payload: {payload}")
-                    output = chain.invoke(payload)
+                    output = await chain.ainvoke(payload)
                     result = process_field_output(output, field_name)
 
                     logger.info(f"Successfully regenerated {field_name} with {len(result)} items")
@@ -123,7 +126,7 @@ def regenerate_job_field(job: JobRefineInput):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.post("/enhance-job-field")
-def enhance_job_field(job: JobRefineInput):
+async def enhance_job_field(job: JobRefineInput):
     """
     Enhance specific job description fields based on input.
 
@@ -144,23 +147,15 @@ def enhance_job_field(job: JobRefineInput):
 
         logger.debug(f"Context prepared: {context}")
 
-        field_map = {
-            "keyResponsibilities": (key_resp_chain, "keyResponsibilities"),
-            "softSkills": (soft_chain, "softSkills"),
-            "technicalSkills": (tech_chain, "technicalSkills"),
-            "education": (edu_chain, "education"),
-            "certifications": (cert_chain, "certifications"),
-            "niceToHave": (nice_chain, "niceToHave")
-        }
-
-        for field, (chain, field_name) in field_map.items():
-            if job_dict.get(field) is not None:
+        for field_name in REFINABLE_FIELDS:
+            if job_dict.get(field_name) is not None:
                 logger.info(f"Processing field: {field_name}")
-                payload = {**context, field_name: job_dict[field]}
+                payload = {**context, field_name: job_dict[field_name]}
 
                 try:
+                    chain = get_enhance_chain(field_name)
                     logger.debug(f"Invoking chain for {field_name} with payload: {payload}")
-                    output = chain.invoke(payload)
+                    output = await chain.ainvoke(payload)
                     result = process_field_output(output, field_name)
 
                     logger.info(f"Successfully enhanced {field_name} with {len(result)} items")
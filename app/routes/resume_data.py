@@ -1,28 +1,35 @@
+import asyncio
 import base64
+import functools
 import json
 import mimetypes
 import os
-from typing import List, Dict, Any
-from fastapi import APIRouter, HTTPException
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Literal, Optional, Tuple
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, validator
 from agents.ai_prompt_question import generate_prompt_based_questions
 from agents.resume_extractor import resume_extract_info
 import logging
 import uuid
-from pathlib import Path
 from app.models.resume_analyze_model import AIPromptQuestionRequest, AIPromptQuestionResponse, AIQuestionRequest, AIQuestionResponse
 from app.services.ai_match_score import calculate_weighted_coverage_score, check_domain_relevance, check_domain_relevance_strict
 from config.Settings import settings
 from app.models.batch_analyze_model import JobCandidateData, CandidateAnalysisResponse
+from app.models.ingest_job_model import IngestJobResults, IngestJobStatus
+from app.services.ingest_jobs import IngestWorkers, JobFile, JobStore
 from agents.resume_analyze import generate_batch_analysis
 from agents.ai_question_generate import generate_interview_questions
 from sklearn.metrics.pairwise import cosine_similarity
-from langchain_community.embeddings.fastembed import FastEmbedEmbeddings
+from app.services.embeddings import EmbeddingsUnavailable, embedding_engine
 import numpy as np
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+def sanitize_file_name(file_name: str) -> str:
+    return "".join(c for c in file_name if c.isalnum() or c in ('.', '_', '-'))
+
 class FilePayload(BaseModel):
     file_name: str
     file_data: str
@@ -31,22 +38,13 @@ class FilePayload(BaseModel):
     def validate_file_name(cls, v):
         if not v or not v.strip():
             raise ValueError('File name cannot be empty')
-        return "".join(c for c in v if c.isalnum() or c in ('.', '_', '-'))
+        return sanitize_file_name(v)
 
     @validator('file_data')
     def validate_file_data(cls, v):
+        # Decoding happens once, per file, in decode_and_validate_file.
         if not v or not v.strip():
             raise ValueError('File data cannot be empty')
-        try:
-            # Remove data URI prefix if present
-            file_data = v.split(",", 1)[-1] if v.startswith("data:") else v
-            # Check for valid base64 characters
-            import re
-            if not re.match(r'^[A-Za-z0-9+/=]+$', file_data):
-                raise ValueError('Invalid base64 characters')
-            base64.b64decode(file_data, validate=True)
-        except Exception as e:
-            raise ValueError(f'Invalid base64 file data: {str(e)}')
         return v
 
 class MultipleFiles(BaseModel):
@@ -67,17 +65,13 @@ class ResumeExtractionResponse(BaseModel):
     failed_extractions: int
     extracted_data: List[Dict[str, Any]]
 
-SAVE_DIR = settings.save_directory
 ALLOWED_MIME_TYPES = settings.allowed_mime_types
 MAX_FILE_SIZE = settings.max_file_size
+UPLOAD_CHUNK_SIZE = 64 * 1024
+INVALID_FILE_TYPE = "Invalid file type. Only PDF or DOC/DOCX files are allowed."
 
-def setup_save_directory() -> None:
-    try:
-        SAVE_DIR.mkdir(exist_ok=True)
-        logger.debug(f"Save directory ensured: {SAVE_DIR}")
-    except Exception as e:
-        logger.error(f"Failed to create save directory: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to setup file storage")
+# A file name and the coroutine that produces its result entry.
+FileJob = Tuple[str, Callable[[], Awaitable[Dict[str, Any]]]]
 
 def validate_file_type(file_name: str) -> bool:
     mime_type, _ = mimetypes.guess_type(file_name)
@@ -111,15 +105,31 @@ def ensure_filename_extension(file_name: str, detected_mime: str) -> str:
         return f"{base}.docx"
     return file_name
 
+def check_file_type(file_bytes: bytes, file_name: str) -> str:
+    """
+    The extension to extract ``file_bytes`` as. Magic bytes win over the
+    file name; raises ValueError for anything but PDF or DOC/DOCX.
+    """
+    detected_mime = detect_file_type_from_bytes(file_bytes)
+    effective_file_name = ensure_filename_extension(file_name, detected_mime)
+
+    if detected_mime:
+        if detected_mime not in ALLOWED_MIME_TYPES:
+            logger.warning(f"Invalid file type for {file_name} (detected {detected_mime})")
+            raise ValueError(INVALID_FILE_TYPE)
+    else:
+        if not validate_file_type(effective_file_name):
+            logger.warning(f"Invalid file type for {file_name} (no magic match)")
+            raise ValueError(INVALID_FILE_TYPE)
+
+    return os.path.splitext(effective_file_name)[1]
+
 def decode_and_validate_file(file_data: str, file_name: str) -> bytes:
     try:
         # Remove data URI prefix if present
         file_data = file_data.split(",", 1)[-1] if file_data.startswith("data:") else file_data
-        # Check for valid base64 characters
-        import re
-        if not re.match(r'^[A-Za-z0-9+/=]+$', file_data):
-            raise ValueError(f"File {file_name} contains invalid base64 characters")
-
+        # validate=True rejects any character outside the base64 alphabet,
+        # so the payload is scanned once, while decoding.
         file_bytes = base64.b64decode(file_data, validate=True)
 
         if len(file_bytes) > MAX_FILE_SIZE:
@@ -138,25 +148,10 @@ def decode_and_validate_file(file_data: str, file_name: str) -> bytes:
         logger.error(f"Unexpected error decoding file {file_name}: {str(e)}")
         raise ValueError(f"Failed to decode file {file_name}: {str(e)}")
 
-def save_file_temporarily(file_bytes: bytes, file_name: str, request_id: str) -> Path:
-    try:
-        unique_filename = f"{request_id}_{file_name}"
-        save_path = SAVE_DIR / unique_filename
-
-        with open(save_path, "wb") as f:
-            f.write(file_bytes)
-
-        logger.debug(f"File saved temporarily: {save_path}")
-        return save_path
-
-    except OSError as e:
-        logger.error(f"Failed to save file {file_name}: {str(e)}")
-        raise OSError(f"Failed to save file {file_name}: {str(e)}")
-
-def extract_resume_data(file_path: Path, file_name: str) -> Dict[str, Any]:
+async def extract_resume_data(file_bytes: bytes, file_name: str, file_type: str) -> Dict[str, Any]:
     try:
         logger.info(f"Starting resume extraction for file: {file_name}")
-        resume_data = resume_extract_info(str(file_path))
+        resume_data = await resume_extract_info(file_bytes, file_type)
 
         logger.info(f"Successfully extracted resume data from {file_name}")
         return {
@@ -173,107 +168,141 @@ def extract_resume_data(file_path: Path, file_name: str) -> Dict[str, Any]:
             "error": f"Failed to extract resume data: {str(e)}"
         }
 
-def cleanup_file(file_path: Path, file_name: str) -> None:
-    try:
-        if file_path and file_path.exists():
-            file_path.unlink()
-            logger.debug(f"Cleaned up temporary file: {file_path}")
-    except Exception as e:
-        logger.warning(f"Failed to cleanup file {file_name}: {str(e)}")
+def file_error(file_name: str, error: str) -> Dict[str, Any]:
+    return {
+        "file_name": file_name,
+        "status": "error",
+        "error": error
+    }
 
-@router.post("/parse-cv", response_model=ResumeExtractionResponse)
-def parse_resumes(payload: MultipleFiles):
-    request_id = uuid.uuid4().hex
-    logger.info(f"Starting resume parsing request {request_id} with {len(payload.files)} files")
+async def process_file(file: FilePayload) -> Dict[str, Any]:
+    """Decode, validate and extract one upload. Never raises."""
+    file_name = file.file_name
 
     try:
-        setup_save_directory()
+        try:
+            file_bytes = decode_and_validate_file(file.file_data, file_name)
+        except ValueError as ve:
+            logger.warning(f"File validation failed for {file_name}: {str(ve)}")
+            return file_error(file_name, str(ve))
 
-        extracted_data = []
-        successful_extractions = 0
-        failed_extractions = 0
+        try:
+            file_type = check_file_type(file_bytes, file_name)
+        except ValueError as ve:
+            return file_error(file_name, str(ve))
 
-        for idx, file in enumerate(payload.files):
-            file_name = file.file_name
-            logger.info(f"Processing file {idx + 1}/{len(payload.files)}: {file_name}")
+        return await extract_resume_data(file_bytes, file_name, file_type)
 
-            temp_file_path = None
+    except Exception as e:
+        logger.error(f"Unexpected error processing file {file_name}: {str(e)}", exc_info=True)
+        return file_error(file_name, f"Unexpected processing error: {str(e)}")
+
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+async def read_upload(upload: UploadFile, file_name: str) -> Tuple[bytes, str]:
+    """
+    Read a multipart file part in chunks. The type is checked on the first
+    chunk and the size limit as soon as it is crossed, so a bad upload is
+    rejected without reading (or holding) the rest of it.
+    """
+    if upload.size is not None and upload.size > MAX_FILE_SIZE:
+        raise ValueError(f"File {file_name} exceeds maximum size limit ({MAX_FILE_SIZE} bytes)")
+
+    head = await upload.read(UPLOAD_CHUNK_SIZE)
+    if not head:
+        raise ValueError(f"File {file_name} is empty")
+    file_type = check_file_type(head, file_name)
+
+    buffer = bytearray(head)
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+        buffer += chunk
+        if len(buffer) > MAX_FILE_SIZE:
+            raise ValueError(f"File {file_name} exceeds maximum size limit ({MAX_FILE_SIZE} bytes)")
+    return bytes(buffer), file_type
 
-            try:
-                try:
-                    file_bytes = decode_and_validate_file(file.file_data, file_name)
-                except ValueError as ve:
-                    logger.warning(f"File validation failed for {file_name}: {str(ve)}")
-                    extracted_data.append({
-                        "file_name": file_name,
-                        "status": "error",
-                        "error": str(ve)
-                    })
-                    failed_extractions += 1
-                    continue
-
-                detected_mime = detect_file_type_from_bytes(file_bytes)
-                effective_file_name = ensure_filename_extension(file_name, detected_mime)
-
-                if detected_mime:
-                    if detected_mime not in ALLOWED_MIME_TYPES:
-                        logger.warning(f"Invalid file type for {file_name} (detected {detected_mime})")
-                        extracted_data.append({
-                            "file_name": file_name,
-                            "status": "error",
-                            "error": "Invalid file type. Only PDF or DOC/DOCX files are allowed."
-                        })
-                        failed_extractions += 1
-                        continue
-                else:
-                    if not validate_file_type(effective_file_name):
-                        logger.warning(f"Invalid file type for {file_name} (no magic match)")
-                        extracted_data.append({
-                            "file_name": file_name,
-                            "status": "error",
-                            "error": "Invalid file type. Only PDF or DOC/DOCX files are allowed."
-                        })
-                        failed_extractions += 1
-                        continue
-
-                try:
-                    temp_file_path = save_file_temporarily(file_bytes, effective_file_name, request_id)
-                except OSError as oe:
-                    logger.error(f"File save failed for {file_name}: {str(oe)}")
-                    extracted_data.append({
-                        "file_name": file_name,
-                        "status": "error",
-                        "error": f"Failed to save file: {str(oe)}"
-                    })
-                    failed_extractions += 1
-                    continue
-
-                result = extract_resume_data(temp_file_path, file_name)
-                extracted_data.append(result)
-
-                if result.get("status") == "success":
-                    successful_extractions += 1
-                else:
-                    failed_extractions += 1
-
-            except Exception as e:
-                logger.error(f"Unexpected error processing file {file_name}: {str(e)}", exc_info=True)
-                extracted_data.append({
-                    "file_name": file_name,
-                    "status": "error",
-                    "error": f"Unexpected processing error: {str(e)}"
-                })
-                failed_extractions += 1
-
-            finally:
-                if temp_file_path:
-                    cleanup_file(temp_file_path, file_name)
+async def upload_job(upload: UploadFile) -> FileJob:
+    file_name = sanitize_file_name(upload.filename or "") or "upload"
+    try:
+        file_bytes, file_type = await read_upload(upload, file_name)
+    except ValueError as ve:
+        logger.warning(f"File validation failed for {file_name}: {str(ve)}")
+        error = file_error(file_name, str(ve))
+
+        async def rejected() -> Dict[str, Any]:
+            return error
+        return file_name, rejected
+    return file_name, functools.partial(extract_resume_data, file_bytes, file_name, file_type)
+
+async def process_files(jobs: List[FileJob]) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Yield ``(index, result)`` for each file as soon as it finishes. Files are
+    independent, so they run concurrently; the semaphore caps how many
+    extractions (text extraction + LLM call) one request can hold.
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.parse_cv_concurrency))
+
+    async def bounded(idx: int, file_name: str, run) -> Tuple[int, Dict[str, Any]]:
+        async with semaphore:
+            logger.info(f"Processing file {idx + 1}/{len(jobs)}: {file_name}")
+            return idx, await run()
+
+    tasks = [asyncio.create_task(bounded(idx, *job)) for idx, job in enumerate(jobs)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # The client went away mid-stream: don't keep extracting for nobody.
+        for task in tasks:
+            task.cancel()
+
+def stream_line(event: str, data: Dict[str, Any], fmt: str) -> str:
+    if fmt == "sse":
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"event": event, **data}) + "\n"
+
+async def stream_results(jobs: List[FileJob], request_id: str, fmt: str) -> AsyncIterator[str]:
+    successful_extractions = failed_extractions = 0
+    async for idx, result in process_files(jobs):
+        if result.get("status") == "success":
+            successful_extractions += 1
+        else:
+            failed_extractions += 1
+        yield stream_line("file", {"index": idx, **result}, fmt)
+
+    logger.info(f"Request {request_id} completed: {successful_extractions} successful, {failed_extractions} failed")
+    yield stream_line("summary", {
+        "status": "completed",
+        "processed_files": len(jobs),
+        "successful_extractions": successful_extractions,
+        "failed_extractions": failed_extractions,
+    }, fmt)
+
+STREAM_QUERY = Query(
+    None,
+    description="Stream one JSON line (ndjson) or server-sent event (sse) per file "
+                "as it finishes, in completion order with its upload index, "
+                "followed by a summary."
+)
+
+async def respond(jobs: List[FileJob], request_id: str, stream: Optional[str]):
+    if stream:
+        return StreamingResponse(
+            stream_results(jobs, request_id, stream),
+            media_type=STREAM_MEDIA_TYPES[stream],
+        )
+
+    try:
+        extracted_data: List[Dict[str, Any]] = [{} for _ in jobs]
+        async for idx, result in process_files(jobs):
+            extracted_data[idx] = result
+        successful_extractions = sum(1 for r in extracted_data if r.get("status") == "success")
+        failed_extractions = len(extracted_data) - successful_extractions
 
         logger.info(f"Request {request_id} completed: {successful_extractions} successful, {failed_extractions} failed")
 
         return ResumeExtractionResponse(
             status="completed",
-            processed_files=len(payload.files),
+            processed_files=len(jobs),
             successful_extractions=successful_extractions,
             failed_extractions=failed_extractions,
             extracted_data=extracted_data
@@ -285,62 +314,181 @@ def parse_resumes(payload: MultipleFiles):
         logger.error(f"Critical error in parse_resumes for request {request_id}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@router.post("/parse-cv", response_model=ResumeExtractionResponse)
+async def parse_resumes(payload: MultipleFiles, stream: Optional[Literal["ndjson", "sse"]] = STREAM_QUERY):
+    request_id = uuid.uuid4().hex
+    logger.info(f"Starting resume parsing request {request_id} with {len(payload.files)} files")
+
+    jobs = [(file.file_name, functools.partial(process_file, file)) for file in payload.files]
+    return await respond(jobs, request_id, stream)
+
+@router.post("/parse-cv/upload", response_model=ResumeExtractionResponse)
+async def parse_resume_uploads(
+    files: List[UploadFile] = File(..., description="Resume files (PDF or DOC/DOCX) as multipart/form-data"),
+    stream: Optional[Literal["ndjson", "sse"]] = STREAM_QUERY,
+):
+    """
+    Same as /parse-cv, but takes the files as multipart/form-data instead of
+    base64 inside JSON: no 33% encoding overhead and no base64 decoding.
+    """
+    request_id = uuid.uuid4().hex
+    logger.info(f"Starting resume upload request {request_id} with {len(files)} files")
+
+    if len(files) > settings.max_files_per_request:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Maximum {settings.max_files_per_request} files allowed per request"
+        )
+
+    # Parts are read here rather than in the workers: FastAPI closes uploaded
+    # files when the endpoint returns, before a streaming body is produced.
+    jobs = [await upload_job(upload) for upload in files]
+    return await respond(jobs, request_id, stream)
+
+
+job_store = JobStore(settings.ingest_db_path, settings.save_directory / "ingest")
+ingest_workers = IngestWorkers(
+    job_store,
+    extract_resume_data,
+    workers=settings.ingest_workers,
+    poll_interval=settings.ingest_poll_interval,
+)
+
+@router.post("/parse-cv/jobs", response_model=IngestJobStatus, status_code=202)
+async def submit_ingest_job(
+    files: List[UploadFile] = File(..., description="Resume files (PDF or DOC/DOCX) as multipart/form-data"),
+):
+    """
+    Queue a bulk ingestion job and return its id right away. Files are
+    extracted in the background by the ingestion workers; poll
+    /parse-cv/jobs/{job_id} for progress and page through
+    /parse-cv/jobs/{job_id}/results as files finish.
+    """
+    if len(files) > settings.ingest_max_files_per_job:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Maximum {settings.ingest_max_files_per_job} files allowed per job"
+        )
+
+    job_id = uuid.uuid4().hex
+    entries: List[JobFile] = []
+    try:
+        for idx, upload in enumerate(files):
+            file_name = sanitize_file_name(upload.filename or "") or "upload"
+            try:
+                file_bytes, file_type = await read_upload(upload, file_name)
+            except ValueError as ve:
+                logger.warning(f"File validation failed for {file_name}: {str(ve)}")
+                entries.append(JobFile(file_name, result=file_error(file_name, str(ve))))
+                continue
+            await asyncio.to_thread(job_store.save_file, job_id, idx, file_bytes)
+            entries.append(JobFile(file_name, file_type))
+        await asyncio.to_thread(job_store.create_job, job_id, entries)
+    except Exception as e:
+        await asyncio.to_thread(job_store.discard_files, job_id)
+        logger.error(f"Failed to queue ingestion job {job_id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to queue ingestion job: {str(e)}")
+
+    logger.info(f"Queued ingestion job {job_id} with {len(entries)} files")
+    ingest_workers.start()
+    ingest_workers.notify()
+    return await asyncio.to_thread(job_store.job, job_id)
+
+@router.get("/parse-cv/jobs/{job_id}", response_model=IngestJobStatus)
+async def get_ingest_job(job_id: str):
+    job = await asyncio.to_thread(job_store.job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Ingestion job {job_id} not found")
+    return job
+
+@router.get("/parse-cv/jobs/{job_id}/results", response_model=IngestJobResults)
+async def get_ingest_job_results(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+):
+    """Finished files in the order they finished; pass next_offset to get the next page."""
+    job = await asyncio.to_thread(job_store.job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Ingestion job {job_id} not found")
+    results = await asyncio.to_thread(job_store.results, job_id, offset, limit)
+    return IngestJobResults(
+        job_id=job_id,
+        status=job["status"],
+        offset=offset,
+        next_offset=offset + len(results),
+        results=results,
+    )
+
+
+def filter_eligible_candidates(job, candidates, embeddings, minimum_score: float) -> list:
+    eligible = []
+    for candidate in candidates:
+
+        if not candidate.candidate_tag or len(candidate.candidate_tag) == 0:
+            logger.info(f"Job {job.job_id} - Candidate {candidate.candidateId}: "
+                       f"No candidate tags, auto-include")
+            eligible.append(candidate)
+            continue
+
+        if not job.job_tag or len(job.job_tag) == 0:
+            logger.info(f"Job {job.job_id} - Candidate {candidate.candidateId}: "
+                       f"No job tags, auto-include")
+            eligible.append(candidate)
+            continue
+
+        try:
+
+            relevance_score = check_domain_relevance_strict(
+                candidate.candidate_tag,
+                job.job_tag,
+                embeddings
+            )
+
+            match_score = calculate_weighted_coverage_score(
+                candidate.candidate_tag,
+                job.job_tag,
+                embeddings
+            )
+
+            if match_score >= minimum_score:
+                eligible.append(candidate)
+                logger.info(f"Job {job.job_id} - Candidate {candidate.candidateId}: "
+                           f"Relevance {relevance_score:.1f}%, Score {match_score:.1f}% - ELIGIBLE")
+            else:
+                logger.info(f"Job {job.job_id} - Candidate {candidate.candidateId}: "
+                           f"Relevance {relevance_score:.1f}%, Score {match_score:.1f}% - REJECTED")
+
+        except Exception as e:
+            logger.warning(f"Error calculating match for job {job.job_id} "
+                          f"candidate {candidate.candidateId}: {str(e)}")
+            eligible.append(candidate)
+    return eligible
+
 
 @router.post("/ai/batch-analyze-resumes", response_model=List[CandidateAnalysisResponse])
-def batch_analyze_resumes_api(request: JobCandidateData):
+async def batch_analyze_resumes_api(request: JobCandidateData):
     try:
         num_candidates = len(request.candidates) if request.candidates else 0
         num_jobs = len(request.jobs) if request.jobs else 0
         logger.info(f"Received batch analyze request with {num_candidates} candidates and {num_jobs} jobs")
         
-        embeddings = FastEmbedEmbeddings()
+        # The model is loaded once per worker at startup; get() only blocks
+        # if that load hasn't finished. Tag scoring is CPU-bound, so it runs
+        # in a worker thread and the event loop stays free for LLM calls.
+        embeddings = await asyncio.to_thread(embedding_engine.get)
         all_results = []
 
         MINIMUM_ELIGIBLE_SCORE = settings.minimum_eligible_score      
         
         for job in request.jobs or []:
-            job_eligible_candidates = []
-            
-            for candidate in request.candidates or []:
-        
-                if not candidate.candidate_tag or len(candidate.candidate_tag) == 0:
-                    logger.info(f"Job {job.job_id} - Candidate {candidate.candidateId}: "
-                               f"No candidate tags, auto-include")
-                    job_eligible_candidates.append(candidate)
-                    continue
-                    
-                if not job.job_tag or len(job.job_tag) == 0:
-                    logger.info(f"Job {job.job_id} - Candidate {candidate.candidateId}: "
-                               f"No job tags, auto-include")
-                    job_eligible_candidates.append(candidate)
-                    continue
-                
-                try:
-                    
-                    relevance_score = check_domain_relevance_strict(
-                        candidate.candidate_tag,
-                        job.job_tag,
-                        embeddings
-                    )
-                    
-                    match_score = calculate_weighted_coverage_score(
-                        candidate.candidate_tag,
-                        job.job_tag,
-                        embeddings
-                    )
-                    
-                    if match_score >= MINIMUM_ELIGIBLE_SCORE:
-                        job_eligible_candidates.append(candidate)
-                        logger.info(f"Job {job.job_id} - Candidate {candidate.candidateId}: "
-                                   f"Relevance {relevance_score:.1f}%, Score {match_score:.1f}% - ELIGIBLE")
-                    else:
-                        logger.info(f"Job {job.job_id} - Candidate {candidate.candidateId}: "
-                                   f"Relevance {relevance_score:.1f}%, Score {match_score:.1f}% - REJECTED")
-                        
-                except Exception as e:
-                    logger.warning(f"Error calculating match for job {job.job_id} "
-                                  f"candidate {candidate.candidateId}: {str(e)}")
-                    job_eligible_candidates.append(candidate)
+            job_eligible_candidates = await asyncio.to_thread(
+                filter_eligible_candidates,
+                job,
+                request.candidates or [],
+                embeddings,
+                MINIMUM_ELIGIBLE_SCORE
+            )
             
             if job_eligible_candidates:
                 logger.info(f"Job {job.job_id} has {len(job_eligible_candidates)} eligible candidates "
@@ -352,7 +500,7 @@ def batch_analyze_resumes_api(request: JobCandidateData):
                     threshold=request.threshold,
                     cosine_score=MINIMUM_ELIGIBLE_SCORE
                 )
-                job_results = generate_batch_analysis(job_specific_request)
+                job_results = await generate_batch_analysis(job_specific_request)
                 all_results.extend(job_results)
             else:
                 logger.warning(f"Job {job.job_id} has NO eligible candidates after filtering")
@@ -361,27 +509,30 @@ def batch_analyze_resumes_api(request: JobCandidateData):
         logger.info(f"Total analysis results: {len(serialized)}")
         return serialized
     
+    except EmbeddingsUnavailable as e:
+        logger.error(f"Batch AI analysis unavailable: {str(e)}")
+        raise HTTPException(status_code=503, detail="Embedding model is not available yet")
     except Exception as e:
         logger.error(f"Error generating batch AI analysis: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to generate batch AI analysis")
 
 
 @router.post("/generate-ai-question", response_model=AIQuestionResponse)
-def ai_question_generator(request: AIQuestionRequest):
+async def ai_question_generator(request: AIQuestionRequest):
     try:
-        return generate_interview_questions(request)
+        return await generate_interview_questions(request)
     except Exception as e:
         logger.error(f"Error generating AI job question: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to generate AI job question")
     
 
 @router.post("/generate-prompt-questions", response_model=AIPromptQuestionResponse)
-def ai_prompt_question_generator(request: AIPromptQuestionRequest):
+async def ai_prompt_question_generator(request: AIPromptQuestionRequest):
     try:
         if not request.prompt:
             raise Exception("Input array is empty")
 
-        return generate_prompt_based_questions(request)
+        return await generate_prompt_based_questions(request)
 
     except Exception as e:
         logger.error(f"Error generating prompt-based questions: {str(e)}", exc_info=True)
@@ -1,6 +1,7 @@
 from typing import List
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from app.services.metrics import embed_documents
 
 def check_domain_relevance(
     candidate_tags: List[str],
@@ -18,8 +19,8 @@ def check_domain_relevance(
     - Data Scientist job + Data Analyst candidate → 75% (relevant)
     """
     
-    candidate_vectors = embeddings.embed_documents(candidate_tags)
-    job_vectors = embeddings.embed_documents(job_tags)
+    candidate_vectors = embed_documents(embeddings, candidate_tags, source="candidate_tags")
+    job_vectors = embed_documents(embeddings, job_tags, source="job_tags")
     
     sim_matrix = cosine_similarity(candidate_vectors, job_vectors)
     
@@ -53,8 +54,8 @@ def check_domain_relevance_strict(
     Use this if you're getting too many false positives.
     """
     
-    candidate_vectors = embeddings.embed_documents(candidate_tags)
-    job_vectors = embeddings.embed_documents(job_tags)
+    candidate_vectors = embed_documents(embeddings, candidate_tags, source="candidate_tags")
+    job_vectors = embed_documents(embeddings, job_tags, source="job_tags")
     
     sim_matrix = cosine_similarity(candidate_vectors, job_vectors)
     best_per_job = sim_matrix.max(axis=0)
@@ -86,8 +87,8 @@ def calculate_weighted_coverage_score(
     Uses exponential weighting to create good separation.
     """
     
-    candidate_vectors = embeddings.embed_documents(candidate_tags)
-    job_vectors = embeddings.embed_documents(job_tags)
+    candidate_vectors = embed_documents(embeddings, candidate_tags, source="candidate_tags")
+    job_vectors = embed_documents(embeddings, job_tags, source="job_tags")
     
     sim_matrix = cosine_similarity(candidate_vectors, job_vectors)
     best_match_per_job_tag = sim_matrix.max(axis=0)
@@ -115,8 +116,8 @@ def calculate_relevance_and_score_combined(
     Returns: (is_relevant, match_score)
     """
     
-    candidate_vectors = embeddings.embed_documents(candidate_tags)
-    job_vectors = embeddings.embed_documents(job_tags)
+    candidate_vectors = embed_documents(embeddings, candidate_tags, source="candidate_tags")
+    job_vectors = embed_documents(embeddings, job_tags, source="job_tags")
     
     sim_matrix = cosine_similarity(candidate_vectors, job_vectors)
     best_match_per_job_tag = sim_matrix.max(axis=0)
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import sqlite_utils
+
+logger = logging.getLogger(__name__)
+
+_instances: "weakref.WeakSet[TieredCache]" = weakref.WeakSet()
+
+
+class TieredCache:
+    """
+    Two-tier key/value cache: an in-memory LRU in front of a SQLite table.
+
+    Values are strings (callers serialize). Every entry carries its own TTL;
+    ``ttl=None`` means it never expires. Memory hits cost a dict lookup, disk
+    hits are promoted back into memory, and expired rows are purged from disk
+    every ``purge_every`` writes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        db_path: Optional[str],
+        max_entries: int = 1024,
+        max_disk_entries: int = 100_000,
+        purge_every: int = 500,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.purge_every = purge_every
+        self._memory: "OrderedDict[str, Tuple[Optional[float], str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._table = None
+        if db_path:
+            self._open(db_path)
+        _instances.add(self)
+
+    def _open(self, db_path: str) -> None:
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            db = sqlite_utils.Database(conn)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._table = db.table(self.name)
+            self._table.create(
+                {"key": str, "value": str, "expires_at": float, "created_at": float},
+                pk="key",
+                if_not_exists=True,
+            )
+            self._table.create_index(["created_at"], if_not_exists=True)
+        except Exception as e:
+            # A broken disk tier must never take requests down with it.
+            logger.warning(f"Cache '{self.name}' running memory-only, SQLite unavailable: {e}")
+            self._table = None
+
+    @staticmethod
+    def _expired(expires_at: Optional[float], now: float) -> bool:
+        return expires_at is not None and expires_at <= now
+
+    def _memory_get(self, key: str, now: float) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            if not self._expired(entry[0], now):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._memory[key]
+        return None
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            value = self._memory_get(key, now)
+            if value is not None:
+                return value
+
+            if self._table is not None:
+                try:
+                    row = self._table.get(key)
+                except sqlite_utils.db.NotFoundError:
+                    row = None
+                except Exception as e:
+                    logger.warning(f"Cache '{self.name}' disk read failed: {e}")
+                    row = None
+                if row is not None and not self._expired(row["expires_at"], now):
+                    self._remember(key, row["expires_at"], row["value"])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row["value"]
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._table is None:
+                return
+            try:
+                self._table.upsert(
+                    {"key": key, "value": value, "expires_at": expires_at, "created_at": now},
+                    pk="key",
+                )
+                self._writes += 1
+                if self._writes % self.purge_every == 0:
+                    self._purge(now)
+            except Exception as e:
+                logger.warning(f"Cache '{self.name}' disk write failed: {e}")
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._table is None:
+                return
+            try:
+                self._table.delete_where("key = ?", [key])
+            except Exception as e:
+                logger.warning(f"Cache '{self.name}' disk delete failed: {e}")
+
+    # Async variants for the event loop: a memory hit (and a memory-only
+    # cache) is served inline, anything that touches SQLite runs in a thread.
+
+    async def aget(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._memory_get(key, time.time())
+            if value is not None:
+                return value
+            if self._table is None:
+                self.misses += 1
+                return None
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        if self._table is None:
+            self.set(key, value, ttl)
+        else:
+            await asyncio.to_thread(self.set, key, value, ttl)
+
+    def _remember(self, key: str, expires_at: Optional[float], value: str) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _purge(self, now: float) -> None:
+        db = self._table.db
+        db.execute(f"DELETE FROM [{self.name}] WHERE expires_at IS NOT NULL AND expires_at <= ?", [now])
+        overflow = self._table.count - self.max_disk_entries
+        if overflow > 0:
+            db.execute(
+                f"DELETE FROM [{self.name}] WHERE key IN "
+                f"(SELECT key FROM [{self.name}] ORDER BY created_at LIMIT ?)",
+                [overflow],
+            )
+        db.conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._table is not None:
+                self._table.delete_where()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self._memory),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def all_caches():
+    """Every live TieredCache, e.g. for metrics collection."""
+    return sorted(_instances, key=lambda cache: cache.name)
@@ -0,0 +1,188 @@
+"""
+The process-wide FastEmbed model.
+
+Building ``FastEmbedEmbeddings`` loads an ONNX model (downloading it first
+if the files aren't in EMBEDDING_CACHE_DIR) and the first batch pays for
+session setup, so the model is loaded and warmed up once per worker at
+startup and shared by every request.
+
+Tags come from a small shared vocabulary, so their vectors are cached by
+normalized text (CachedEmbeddings) and only unseen tags reach the model.
+"""
+import base64
+import logging
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.services.cache import TieredCache
+from config.Settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Short tag-like texts, the same shape as what ai_match_score embeds.
+WARMUP_TEXTS = ["Python", "Backend Development", "5+ Years Experience", "Quality Assurance"]
+
+
+class EmbeddingsUnavailable(RuntimeError):
+    pass
+
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_tag(text: str) -> str:
+    """NFKC, single spaces, casefolded: "  Python  developer" and "python Developer" are one tag."""
+    return _SPACES.sub(" ", unicodedata.normalize("NFKC", text)).strip().casefold()
+
+
+def _encode_vector(vector: List[float]) -> str:
+    return base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii")
+
+
+def _decode_vector(value: str) -> List[float]:
+    return np.frombuffer(base64.b64decode(value), dtype=np.float32).tolist()
+
+
+class CachedEmbeddings:
+    """
+    ``embed_documents`` through a TieredCache keyed by model and normalized
+    text. Texts are normalized before embedding, so a cached vector is
+    exactly what the model would return; the misses of a call, deduplicated,
+    go to the model as one batch.
+    """
+
+    def __init__(self, embeddings, cache: TieredCache, model_name: str):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = model_name
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        normalized = [normalize_tag(text) for text in texts]
+        vectors: Dict[str, List[float]] = {}
+        misses: List[str] = []
+        for text in dict.fromkeys(normalized):
+            cached = self.cache.get(f"{self.model_name}:{text}")
+            if cached is not None:
+                vectors[text] = _decode_vector(cached)
+            else:
+                misses.append(text)
+        if misses:
+            for text, vector in zip(misses, self.embeddings.embed_documents(misses)):
+                # Stored as float32 (the model's own precision); return what a hit would.
+                vector = np.asarray(vector, dtype=np.float32).tolist()
+                self.cache.set(f"{self.model_name}:{text}", _encode_vector(vector))
+                vectors[text] = vector
+        return [vectors[text] for text in normalized]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+
+def _fastembed(model_name: str, cache_dir: Optional[str], threads: Optional[int]):
+    from langchain_community.embeddings.fastembed import FastEmbedEmbeddings
+
+    return FastEmbedEmbeddings(model_name=model_name, cache_dir=cache_dir, threads=threads)
+
+
+class EmbeddingEngine:
+    """
+    Loads the embedding model once, on a background thread at startup or on
+    first use, and hands the same instance to every caller. ``get()`` blocks
+    only while a load is in progress; a failed load is retried on the next
+    ``get()``.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: Optional[str] = None,
+        threads: Optional[int] = None,
+        factory: Callable[..., Any] = _fastembed,
+        cache: Optional[TieredCache] = None,
+    ):
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self.threads = threads
+        self.factory = factory
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._embeddings = None
+        self._thread: Optional[threading.Thread] = None
+        self.state = "not_loaded"
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._embeddings is not None
+
+    def start_background_load(self) -> None:
+        """Start loading on a daemon thread; later calls are no-ops."""
+        with self._lock:
+            if self._thread is not None or self.ready:
+                return
+            self._thread = threading.Thread(target=self._load_quietly, name="embedding-load", daemon=True)
+            self._thread.start()
+
+    def _load_quietly(self) -> None:
+        try:
+            self.get()
+        except EmbeddingsUnavailable:
+            pass  # logged in get(); a request will retry
+
+    def get(self):
+        if self._embeddings is not None:
+            return self._embeddings
+        with self._lock:
+            if self._embeddings is not None:
+                return self._embeddings
+            self.state = "loading"
+            try:
+                start = time.perf_counter()
+                embeddings = self.factory(self.model_name, self.cache_dir, self.threads)
+                loaded = time.perf_counter()
+                embeddings.embed_documents(WARMUP_TEXTS)
+            except Exception as e:
+                self.state = "failed"
+                self.error = str(e)
+                logger.error(f"Embedding model {self.model_name} failed to load: {e}")
+                raise EmbeddingsUnavailable(f"Embedding model {self.model_name} is unavailable: {e}") from e
+            self.load_seconds = round(loaded - start, 3)
+            self.warmup_seconds = round(time.perf_counter() - loaded, 3)
+            self.state, self.error = "ready", None
+            if self.cache is not None:
+                embeddings = CachedEmbeddings(embeddings, self.cache, self.model_name)
+            self._embeddings = embeddings
+            logger.info(f"Embedding model {self.model_name} loaded in {self.load_seconds}s, "
+                        f"warmed up in {self.warmup_seconds}s")
+            return embeddings
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "model": self.model_name,
+            "state": self.state,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warmup_seconds,
+            "error": self.error,
+        }
+
+
+# Vectors of a given model never change, so entries don't expire.
+tag_embedding_cache = TieredCache(
+    "tag_embeddings",
+    settings.llm_cache_path,
+    max_entries=settings.embedding_cache_max_entries,
+)
+
+embedding_engine = EmbeddingEngine(
+    settings.embedding_model,
+    cache_dir=settings.embedding_cache_dir or None,
+    threads=settings.embedding_threads or None,
+    cache=tag_embedding_cache if settings.embedding_cache_enabled else None,
+)
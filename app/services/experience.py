@@ -0,0 +1,100 @@
+"""
+Total work experience and experience level, computed from the extracted
+work_experience list rather than by the LLM.
+
+Each job covers the months from its start to its end, both included;
+overlapping jobs are merged so concurrent roles aren't counted twice.
+"""
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.field_extract import PRESENT, normalize_date
+
+# (upper bound in years, level), checked in order; same values as the prompt used.
+EXPERIENCE_LEVELS = (
+    (1, "Entry_Level"),
+    (3, "Junior_Level"),
+    (5, "Mid_Level"),
+    (8, "Mid_Senior_Level"),
+    (12, "Senior"),
+    (15, "Lead"),
+)
+TOP_LEVEL = "Principal/Director"
+
+
+def month_index(value: Optional[str], end: bool = False) -> Optional[int]:
+    """
+    Months since year 0 for a date string; a year alone means January for a
+    start date and December for an end date. None if there's no date.
+    """
+    normalized = normalize_date(value)
+    if not normalized or not normalized[:4].isdigit():
+        return None
+    year = int(normalized[:4])
+    if len(normalized) >= 7:
+        month = int(normalized[5:7])
+    else:
+        month = 12 if end else 1
+    return year * 12 + month - 1
+
+
+def _intervals(entries: List[Dict[str, Any]], today: date) -> List[Tuple[int, int]]:
+    now = today.year * 12 + today.month - 1
+    starts = [month_index(entry.get("start_date")) for entry in entries]
+    intervals = []
+    for entry, start in zip(entries, starts):
+        if start is None:
+            continue
+        end_date = entry.get("end_date")
+        if entry.get("is_current") or (end_date and PRESENT.match(end_date)):
+            end = now
+        elif month_index(end_date, end=True) is not None:
+            end = month_index(end_date, end=True)
+        else:
+            # No end date: the job ran until the month before the next one
+            # started, or is still going if nothing started after it.
+            later = [s for s in starts if s is not None and s > start]
+            end = min(later) - 1 if later else now
+        intervals.append((start, min(end, now)))
+    return [(start, end) for start, end in intervals if end >= start]
+
+
+def experience_months(entries: Optional[List[Dict[str, Any]]], today: Optional[date] = None) -> int:
+    """Total months worked, counting overlapping jobs once."""
+    total = 0
+    current_start = current_end = None
+    for start, end in sorted(_intervals(entries or [], today or date.today())):
+        if current_end is not None and start <= current_end + 1:
+            current_end = max(current_end, end)
+            continue
+        if current_end is not None:
+            total += current_end - current_start + 1
+        current_start, current_end = start, end
+    if current_end is not None:
+        total += current_end - current_start + 1
+    return total
+
+
+def experience_level(years: float) -> str:
+    for bound, level in EXPERIENCE_LEVELS:
+        if years < bound:
+            return level
+    return TOP_LEVEL
+
+
+def apply_experience(result: Dict[str, Any], today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Set ai_analysis.experience_year (one decimal) and experience_level from
+    work_experience. They don't depend on the LLM's analysis, so when that
+    is missing ai_analysis is created to carry them.
+    """
+    analysis = result.get("ai_analysis")
+    if analysis is None:
+        if result.get("personal_info") is None and not result.get("work_experience"):
+            # All-null means the document was rejected as not a resume.
+            return result
+        analysis = result["ai_analysis"] = {}
+    years = round(experience_months(result.get("work_experience"), today) / 12, 1)
+    analysis["experience_year"] = years
+    analysis["experience_level"] = experience_level(years)
+    return result
@@ -0,0 +1,120 @@
+"""
+Process pool for CPU-bound text extraction.
+
+Workers run the backends in app.services.extractors, which imports nothing
+from the app, so spawned workers only load the extraction libraries.
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Tuple
+
+from app.services.extractors import DOCX, PDF, Readable, run_extractor
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionPool:
+    """
+    Runs extraction jobs in worker processes with a wall-clock timeout.
+
+    Workers are recycled after ``max_tasks_per_child`` jobs. A job that
+    overruns ``timeout`` can't be cancelled inside a worker, so the whole
+    pool is killed and replaced; jobs that were sharing it are retried once
+    on the new pool.
+    """
+
+    def __init__(self, workers: int, max_tasks_per_child: int = 50, timeout: float = 30.0,
+                 pages_per_task: int = 10):
+        self.workers = workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self.timeout = timeout
+        self.pages_per_task = pages_per_task
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.jobs = 0
+        self.timeouts = 0
+        self.restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs threads and an event
+                # loop is unsafe, and max_tasks_per_child requires it anyway.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    max_tasks_per_child=self.max_tasks_per_child,
+                )
+            return self._executor
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not broken:
+                return  # someone else already replaced it
+            self._executor = None
+            self.restarts += 1
+        kill_workers = getattr(broken, "kill_workers", None)
+        if kill_workers is not None:  # Python 3.14+; also shuts the executor down
+            kill_workers()
+            return
+        # Older versions have no public way to stop a busy worker; CPython
+        # 3.9-3.13 keep the worker processes in ``_processes``.
+        if not hasattr(broken, "_processes"):
+            logger.warning("Can't reach the extraction pool's workers; a hung job keeps running until it ends")
+        processes = list((getattr(broken, "_processes", None) or {}).values())
+        broken.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.kill()
+
+    async def arun(self, fn: Callable[..., Any], *args: Any) -> Any:
+        for attempt in (1, 2):
+            executor = self._get_executor()
+            self.jobs += 1
+            try:
+                future = asyncio.wrap_future(executor.submit(fn, *args))
+                return await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                logger.warning(f"Text extraction exceeded {self.timeout}s; restarting extraction pool")
+                self._restart(executor)
+                raise TimeoutError(f"Text extraction timed out after {self.timeout}s") from None
+            except BrokenProcessPool:
+                self._restart(executor)
+                if attempt == 2:
+                    raise
+
+    async def pdf_pages(self, source: Readable, extractor: str = "pypdf2") -> List[str]:
+        """Text of every page of a PDF, splitting large ones into page ranges across workers."""
+        first, count = await self.arun(run_extractor, PDF, extractor, source, 0, self.pages_per_task)
+        if count <= self.pages_per_task:
+            return first
+        ranges: List[Tuple[int, int]] = [
+            (start, start + self.pages_per_task)
+            for start in range(self.pages_per_task, count, self.pages_per_task)
+        ]
+        rest = await asyncio.gather(*(
+            self.arun(run_extractor, PDF, extractor, source, start, end) for start, end in ranges
+        ))
+        return first + [page for pages, _ in rest for page in pages]
+
+    async def docx_text(self, source: Readable, extractor: str = "python-docx") -> str:
+        return await self.arun(run_extractor, DOCX, extractor, source)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "name": "text_extraction",
+            "workers": self.workers,
+            "jobs": self.jobs,
+            "timeouts": self.timeouts,
+            "restarts": self.restarts,
+        }
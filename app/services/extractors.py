@@ -0,0 +1,216 @@
+"""
+Text-extraction backends, selected by name (PDF_EXTRACTOR / DOCX_EXTRACTOR).
+
+A PDF backend is ``fn(source, start=0, end=None) -> (page_texts, page_count)``
+and extracts pages ``[start, end)``, one string per page ("" for a page with
+no text layer); a DOCX backend is ``fn(source) -> text``.
+``source`` is a path, bytes or a binary stream. Backends whose library isn't
+installed stay registered but unavailable. This module imports nothing from
+the app, so extraction pool workers can load it cheaply.
+"""
+import importlib.util
+import io
+import os
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+Readable = Union[str, os.PathLike, bytes, io.IOBase]
+
+PDF = "pdf"
+DOCX = "docx"
+
+_EXTRACTORS: Dict[Tuple[str, str], Tuple[Callable, Optional[str]]] = {}
+
+
+def register_extractor(kind: str, name: str, requires: Optional[str] = None):
+    """Register the decorated function as the ``kind`` backend ``name``.
+
+    ``requires`` is the module the backend imports; without it installed the
+    backend is listed but unavailable.
+    """
+    def decorator(fn: Callable) -> Callable:
+        _EXTRACTORS[(kind, name)] = (fn, requires)
+        return fn
+    return decorator
+
+
+def _installed(module: Optional[str]) -> bool:
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def get_extractor(kind: str, name: str) -> Callable:
+    if (kind, name) not in _EXTRACTORS:
+        known = ", ".join(n for k, n in _EXTRACTORS if k == kind)
+        raise ValueError(f"Unknown {kind} extractor '{name}' (known: {known})")
+    fn, requires = _EXTRACTORS[(kind, name)]
+    if not _installed(requires):
+        raise ValueError(f"{kind} extractor '{name}' needs the '{requires}' package")
+    return fn
+
+
+def registered_extractors(kind: str) -> List[str]:
+    return [n for k, n in _EXTRACTORS if k == kind]
+
+
+def available_extractors(kind: str) -> List[str]:
+    return [n for n in registered_extractors(kind) if _installed(_EXTRACTORS[(kind, n)][1])]
+
+
+def run_extractor(kind: str, name: str, *args):
+    """Entry point for pool workers: look the backend up by name and run it."""
+    return get_extractor(kind, name)(*args)
+
+
+def _open(source: Readable):
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def _page_range(count: int, start: int, end: Optional[int]) -> range:
+    return range(start, count if end is None else min(end, count))
+
+
+# Pages are joined with a form feed, as pdftotext does, so later stages
+# (text_compact) can still tell where each page ends.
+PAGE_BREAK = "\f"
+
+
+def join_pages(pages: Sequence[str]) -> str:
+    return PAGE_BREAK.join(page.rstrip("\n") + "\n" for page in pages)
+
+
+@register_extractor(PDF, "pypdf2")
+def pypdf2_text(source: Readable, start: int = 0, end: Optional[int] = None) -> Tuple[List[str], int]:
+    import PyPDF2
+
+    pages = PyPDF2.PdfReader(_open(source)).pages
+    count = len(pages)
+    return [pages[i].extract_text() or "" for i in _page_range(count, start, end)], count
+
+
+@register_extractor(PDF, "pypdf", requires="pypdf")
+def pypdf_text(source: Readable, start: int = 0, end: Optional[int] = None) -> Tuple[List[str], int]:
+    import pypdf
+
+    pages = pypdf.PdfReader(_open(source)).pages
+    count = len(pages)
+    return [pages[i].extract_text() or "" for i in _page_range(count, start, end)], count
+
+
+@register_extractor(PDF, "pymupdf", requires="pymupdf")
+def pymupdf_text(source: Readable, start: int = 0, end: Optional[int] = None) -> Tuple[List[str], int]:
+    import pymupdf
+
+    if isinstance(source, (str, os.PathLike)):
+        doc = pymupdf.open(source)
+    else:
+        data = source if isinstance(source, bytes) else source.read()
+        doc = pymupdf.open(stream=data, filetype="pdf")
+    with doc:
+        texts = [doc[i].get_text().rstrip("\n") for i in _page_range(doc.page_count, start, end)]
+        return texts, doc.page_count
+
+
+@register_extractor(PDF, "pdfminer", requires="pdfminer")
+def pdfminer_text(source: Readable, start: int = 0, end: Optional[int] = None) -> Tuple[List[str], int]:
+    from pdfminer.high_level import extract_text
+    from pdfminer.pdfpage import PDFPage
+
+    stream = _open(source)
+    if isinstance(stream, (str, os.PathLike)):
+        with open(stream, "rb") as f:
+            stream = io.BytesIO(f.read())
+    count = sum(1 for _ in PDFPage.get_pages(stream))
+    stream.seek(0)
+    pages = list(_page_range(count, start, end))
+    if not pages:
+        return [], count
+    # pdfminer ends every page with a form feed.
+    texts = extract_text(stream, page_numbers=pages).split("\x0c")[:len(pages)]
+    return [t.strip("\n") for t in texts], count
+
+
+@register_extractor(DOCX, "python-docx")
+def python_docx_text(source: Readable) -> str:
+    from docx import Document
+
+    doc = Document(_open(source))
+    return "".join(para.text + "\n" for para in doc.paragraphs)
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Text boxes are stored twice: as DrawingML in mc:Choice and as VML in mc:Fallback.
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+
+def _docx_part_lines(stream) -> List[str]:
+    """
+    One line per paragraph of a WordprocessingML part, in document order,
+    including paragraphs in tables and text boxes. Elements are freed as
+    soon as they are read, so memory stays flat however long the part is.
+    """
+    from lxml import etree
+
+    lines: List[str] = []
+    # Text boxes sit inside a run of their anchoring paragraph, so
+    # paragraphs nest: each open one collects its own text, and the lines
+    # of the paragraphs nested in it, which follow it.
+    open_paragraphs: List[Tuple[List[str], List[str]]] = []
+    # Where the open table rows and cells start in ``lines``; a cell's
+    # paragraphs become one entry and a row's cells one tab-separated line.
+    open_cells: List[int] = []
+    skip = 0
+    for event, el in etree.iterparse(stream, events=("start", "end")):
+        tag = el.tag
+        if tag == _MC_FALLBACK:
+            skip += 1 if event == "start" else -1
+        if skip and tag != _MC_FALLBACK:
+            continue
+        if event == "start":
+            if tag == f"{_W}p":
+                open_paragraphs.append(([], []))
+            elif tag in (f"{_W}tr", f"{_W}tc"):
+                open_cells.append(len(lines))
+            continue
+        if open_paragraphs:
+            text = open_paragraphs[-1][0]
+            if tag == f"{_W}t":
+                text.append(el.text or "")
+            elif tag == f"{_W}tab":
+                text.append("\t")
+            elif tag in (f"{_W}br", f"{_W}cr"):
+                text.append("\n")
+        if tag == f"{_W}p":
+            text, nested = open_paragraphs.pop()
+            (open_paragraphs[-1][1] if open_paragraphs else lines).extend(["".join(text), *nested])
+        elif tag in (f"{_W}tr", f"{_W}tc"):
+            start = open_cells.pop()
+            if len(lines) > start:  # a table in a text box collects into its anchor instead
+                lines[start:] = [("\t" if tag == f"{_W}tr" else " ").join(lines[start:])]
+        if tag in (f"{_W}p", f"{_W}tbl"):
+            el.clear()
+            parent = el.getparent()
+            while parent is not None and el.getprevious() is not None:
+                del parent[0]
+    return lines
+
+
+@register_extractor(DOCX, "lxml", requires="lxml")
+def lxml_docx_text(source: Readable) -> str:
+    """
+    Stream word/document.xml, and the header and footer parts, straight out
+    of the zip without building python-docx's object model. Unlike
+    python-docx's ``doc.paragraphs``, this keeps tables, headers and text
+    boxes. Headers come first and footers last, each distinct one once.
+    """
+    import zipfile
+
+    with zipfile.ZipFile(_open(source)) as archive:
+        names = archive.namelist()
+        headers = sorted(n for n in names if n.startswith("word/header") and n.endswith(".xml"))
+        footers = sorted(n for n in names if n.startswith("word/footer") and n.endswith(".xml"))
+        sections = []
+        for name in headers + ["word/document.xml"] + footers:
+            with archive.open(name) as part:
+                text = "".join(line + "\n" for line in _docx_part_lines(part))
+            if text.strip() and text not in sections:
+                sections.append(text)
+    return "".join(sections)
@@ -0,0 +1,142 @@
+"""
+Deterministic extraction of contact fields and dates from resume text.
+
+Email, phone and date strings follow fixed formats, so compiled regexes find
+them in microseconds; resume_extractor uses this pass to fill or cross-check
+what the LLM returns (LOCAL_FIELD_MODE).
+"""
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from app.services.metrics import local_field_agreement
+
+EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+# An optional + or 00 prefix, then 10+ digits on one line separated by spaces,
+# dots, dashes or parentheses. Date ranges have the same shape; see _is_phone.
+PHONE = re.compile(r"(?<![\w+])(?:\+|00)?\(?\d[\d \t().-]{8,}\d(?!\w)")
+_MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+DATE = re.compile(
+    r"\b(?:"
+    r"(?P<month_name>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s*(?P<year_a>(?:19|20)\d{2})"
+    r"|(?P<month_a>0?[1-9]|1[0-2])[/.-](?P<year_b>(?:19|20)\d{2})"
+    r"|(?P<year_c>(?:19|20)\d{2})[/.-](?P<month_b>0?[1-9]|1[0-2])(?!\d)"
+    r"|(?P<year_d>(?:19|20)\d{2})"
+    r")\b",
+    re.IGNORECASE,
+)
+PRESENT = re.compile(r"^\s*(present|current|now|till\s*date|to\s*date|ongoing)\s*$", re.IGNORECASE)
+
+DATE_FIELDS = (
+    ("work_experience", "start_date"),
+    ("work_experience", "end_date"),
+    ("education", "start_date"),
+    ("education", "end_date"),
+)
+
+
+class LocalFields(NamedTuple):
+    email: Optional[str]
+    phone: Optional[str]
+    dates: List[str]
+
+
+def normalize_phone(raw: str) -> Optional[str]:
+    """Digits only, without the country code (prompt rule 6); None if too short to be a phone."""
+    digits = re.sub(r"\D", "", raw)
+    if raw.lstrip().startswith(("+", "00")) and len(digits) > 10:
+        digits = digits[-10:]
+    elif len(digits) == 11 and digits.startswith("0"):
+        digits = digits[1:]  # national trunk prefix
+    return digits if 10 <= len(digits) <= 12 else None
+
+
+def _is_phone(candidate: str) -> bool:
+    """False for a PHONE match made only of dates, e.g. "05.2019 - 03.2021"."""
+    return bool(re.search(r"\d", DATE.sub("", candidate)))
+
+
+def _date_from_match(match: "re.Match") -> str:
+    year = match["year_a"] or match["year_b"] or match["year_c"] or match["year_d"]
+    if match["month_name"]:
+        month = _MONTHS[match["month_name"][:3].lower()]
+    elif match["month_a"] or match["month_b"]:
+        month = int(match["month_a"] or match["month_b"])
+    else:
+        return year
+    return f"{year}-{month:02d}"
+
+
+def normalize_date(value: Optional[str]) -> Optional[str]:
+    """
+    "YYYY-MM" (or "YYYY" when only the year is known) for a date string such
+    as "Jan 2020", "01/2020" or "2020-1"; None for "Present" and the like.
+    Unrecognized strings come back unchanged.
+    """
+    if not value or PRESENT.match(value):
+        return None
+    match = DATE.search(value)
+    return _date_from_match(match) if match else value
+
+
+def extract_local_fields(text: str) -> LocalFields:
+    email = EMAIL.search(text)
+    phone = None
+    for match in PHONE.finditer(text):
+        if not _is_phone(match.group(0)):
+            continue
+        phone = normalize_phone(match.group(0))
+        if phone:
+            break
+    dates = list(dict.fromkeys(_date_from_match(m) for m in DATE.finditer(text)))
+    return LocalFields(email.group(0).lower() if email else None, phone, dates)
+
+
+def _agreement(field: str, local: Optional[str], llm: Optional[str]) -> None:
+    if local is None and llm is None:
+        return
+    if local is None:
+        outcome = "llm_only"
+    elif llm is None:
+        outcome = "local_only"
+    else:
+        outcome = "agree" if local == llm else "disagree"
+    local_field_agreement.inc(field=field, outcome=outcome)
+
+
+def record_agreement(result: Dict[str, Any], local: LocalFields) -> None:
+    """
+    Count, per field, whether the local pass and the LLM agree. An LLM date
+    agrees when its normalized form is one of the dates found in the text.
+    """
+    info = result.get("personal_info") or {}
+    llm_email = info.get("email")
+    _agreement("email", local.email, llm_email.lower() if llm_email else None)
+    llm_phone = normalize_phone(info.get("phone") or "") if info.get("phone") else None
+    _agreement("phone", local.phone, llm_phone)
+
+    found = set(local.dates)
+    for section, field in DATE_FIELDS:
+        for entry in result.get(section) or []:
+            llm_date = normalize_date(entry.get(field))
+            if llm_date is not None:
+                _agreement(f"{section}.{field}", llm_date if llm_date in found else None, llm_date)
+
+
+def apply_local_fields(result: Dict[str, Any], local: LocalFields) -> Dict[str, Any]:
+    """Fill email/phone from the local pass and normalize every date string."""
+    info = result.get("personal_info")
+    if info is None:
+        # All-null means the document was rejected as not a resume.
+        return result
+    info["email"] = local.email or info.get("email")
+    info["phone"] = local.phone or info.get("phone")
+    for section, field in DATE_FIELDS:
+        for entry in result.get(section) or []:
+            if not entry.get(field):
+                continue
+            if field == "end_date" and PRESENT.match(entry[field]) and "is_current" in entry:
+                entry["is_current"] = True
+            entry[field] = normalize_date(entry[field])
+    return result
@@ -0,0 +1,309 @@
+"""
+Bulk resume ingestion: jobs persisted in SQLite, worked by an in-process pool.
+
+A job is a list of files. Each file's bytes are written under ``files_dir``
+and its row moves pending -> running -> success/error, with the result
+stored the moment it finishes. On startup, files left "running" by a
+process that is gone are put back to pending, so an interrupted job carries
+on after a restart without redoing the files that already finished.
+"""
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCESS = "success"
+ERROR = "error"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    id TEXT PRIMARY KEY,
+    total INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS ingest_files (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    file_name TEXT NOT NULL,
+    file_type TEXT,
+    status TEXT NOT NULL,
+    owner INTEGER,
+    result TEXT,
+    seq INTEGER,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS ingest_files_status ON ingest_files (status);
+CREATE INDEX IF NOT EXISTS ingest_files_seq ON ingest_files (job_id, seq);
+"""
+
+
+class JobFile(NamedTuple):
+    file_name: str
+    file_type: Optional[str] = None
+    # Set for files rejected at submission; they are stored as finished.
+    result: Optional[Dict[str, Any]] = None
+
+
+class ClaimedFile(NamedTuple):
+    job_id: str
+    idx: int
+    file_name: str
+    file_type: str
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """
+    SQLite table of ingestion jobs and their files.
+
+    ``db_path=""`` keeps the tables in memory, so jobs don't survive a
+    restart. Several processes may share one database file: claiming a file
+    is a single UPDATE, and each running row records the pid working it.
+    """
+
+    def __init__(self, db_path: Optional[str], files_dir: Path):
+        self.files_dir = Path(files_dir)
+        self._lock = threading.Lock()
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        else:
+            logger.warning("INGEST_DB_PATH is empty: ingestion jobs are kept in memory only")
+        self._conn = sqlite3.connect(db_path or ":memory:", check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        if db_path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def _file_path(self, job_id: str, idx: int) -> Path:
+        return self.files_dir / job_id / str(idx)
+
+    def save_file(self, job_id: str, idx: int, data: bytes) -> None:
+        """Store the bytes of file ``idx`` before ``create_job`` queues it."""
+        path = self._file_path(job_id, idx)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def read_file(self, job_id: str, idx: int) -> bytes:
+        return self._file_path(job_id, idx).read_bytes()
+
+    def discard_files(self, job_id: str) -> None:
+        shutil.rmtree(self.files_dir / job_id, ignore_errors=True)
+
+    def create_job(self, job_id: str, files: List[JobFile]) -> None:
+        now = time.time()
+        rows = []
+        rejected = 0
+        for idx, f in enumerate(files):
+            if f.result is None:
+                rows.append((job_id, idx, f.file_name, f.file_type, PENDING, None, None))
+            else:
+                # Rejected files count as finished first, in upload order.
+                rejected += 1
+                rows.append((job_id, idx, f.file_name, f.file_type, ERROR, json.dumps(f.result), rejected))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO ingest_jobs (id, total, created_at, finished_at) VALUES (?, ?, ?, ?)",
+                (job_id, len(files), now, now if rejected == len(files) else None),
+            )
+            self._conn.executemany(
+                "INSERT INTO ingest_files (job_id, idx, file_name, file_type, status, result, seq) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def claim(self) -> Optional[ClaimedFile]:
+        """Mark the oldest pending file as running in this process and return it."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "UPDATE ingest_files SET status = ?, owner = ? WHERE rowid = "
+                "(SELECT rowid FROM ingest_files WHERE status = ? ORDER BY rowid LIMIT 1) "
+                "RETURNING job_id, idx, file_name, file_type",
+                (RUNNING, os.getpid(), PENDING),
+            ).fetchone()
+        return ClaimedFile(*row) if row else None
+
+    def finish(self, job_id: str, idx: int, result: Dict[str, Any]) -> None:
+        status = SUCCESS if result.get("status") == "success" else ERROR
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE ingest_files SET status = ?, owner = NULL, result = ?, seq = "
+                "(SELECT COALESCE(MAX(seq), 0) + 1 FROM ingest_files WHERE job_id = ?) "
+                "WHERE job_id = ? AND idx = ?",
+                (status, json.dumps(result), job_id, job_id, idx),
+            )
+            unfinished = self._conn.execute(
+                "SELECT COUNT(*) FROM ingest_files WHERE job_id = ? AND status IN (?, ?)",
+                (job_id, PENDING, RUNNING),
+            ).fetchone()[0]
+            if not unfinished:
+                self._conn.execute("UPDATE ingest_jobs SET finished_at = ? WHERE id = ?", (time.time(), job_id))
+        self._file_path(job_id, idx).unlink(missing_ok=True)
+        if not unfinished:
+            self.discard_files(job_id)
+
+    def requeue_interrupted(self) -> int:
+        """
+        Put files whose worker process is gone back to pending. Rows owned by
+        this pid are stale too: it can only own them from a previous run
+        (containers restart with the same pid).
+        """
+        with self._lock, self._conn:
+            owners = [r[0] for r in self._conn.execute(
+                "SELECT DISTINCT owner FROM ingest_files WHERE status = ?", (RUNNING,)
+            )]
+            stale = [o for o in owners if o is None or o == os.getpid() or not _pid_alive(o)]
+            requeued = 0
+            for owner in stale:
+                requeued += self._conn.execute(
+                    "UPDATE ingest_files SET status = ?, owner = NULL WHERE status = ? AND owner IS ?",
+                    (PENDING, RUNNING, owner),
+                ).rowcount
+        if requeued:
+            logger.info(f"Requeued {requeued} interrupted ingestion files")
+        return requeued
+
+    def job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._conn.execute("SELECT * FROM ingest_jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM ingest_files WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall())
+        finished = counts.get(SUCCESS, 0) + counts.get(ERROR, 0)
+        if job["finished_at"] is not None:
+            status = "completed"
+        elif finished or counts.get(RUNNING):
+            status = "running"
+        else:
+            status = "queued"
+        return {
+            "job_id": job_id,
+            "status": status,
+            "total": job["total"],
+            "pending": counts.get(PENDING, 0),
+            "running": counts.get(RUNNING, 0),
+            "succeeded": counts.get(SUCCESS, 0),
+            "failed": counts.get(ERROR, 0),
+            "created_at": job["created_at"],
+            "finished_at": job["finished_at"],
+        }
+
+    def results(self, job_id: str, offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Finished files in the order they finished, each with its upload
+        index. New results are only ever appended, so paging by offset is
+        stable while the job runs.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, result FROM ingest_files WHERE job_id = ? AND seq IS NOT NULL "
+                "ORDER BY seq LIMIT ? OFFSET ?",
+                (job_id, limit, offset),
+            ).fetchall()
+        return [{"index": row["idx"], **json.loads(row["result"])} for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM ingest_files GROUP BY status"
+            ).fetchall())
+        return {"name": "ingest_jobs", **{status: counts.get(status, 0) for status in (PENDING, RUNNING)}}
+
+
+# Extracts one file: (bytes, file name, file type) -> result entry. Never raises.
+FileProcessor = Callable[[bytes, str, str], Awaitable[Dict[str, Any]]]
+
+
+class IngestWorkers:
+    """
+    ``workers`` asyncio tasks that claim pending files from ``store`` and run
+    ``process`` on them. Idle workers sleep until ``notify()`` or, to pick
+    up work queued by another process, ``poll_interval`` seconds.
+    """
+
+    def __init__(self, store: JobStore, process: FileProcessor, workers: int, poll_interval: float = 2.0):
+        self.store = store
+        self.process = process
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self._tasks: Set[asyncio.Task] = set()
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        """Start the workers on the running loop; a no-op if they already run there."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        self._loop = loop
+        self._wake = asyncio.Event()
+        self._tasks = {loop.create_task(self._work()) for _ in range(self.workers)}
+
+    def notify(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, set()
+        for task in tasks:
+            task.cancel()
+        # A file interrupted here stays "running" until the next startup's
+        # requeue_interrupted() (app/main.py).
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _idle(self) -> None:
+        try:
+            await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _work(self) -> None:
+        # Store calls are SQLite and file I/O, so they run off the event loop.
+        while True:
+            self._wake.clear()
+            try:
+                claimed = await asyncio.to_thread(self.store.claim)
+            except Exception as e:
+                # e.g. sqlite3.OperationalError while another process holds the lock
+                logger.error(f"Claiming an ingestion file failed: {e}", exc_info=True)
+                claimed = None
+            if claimed is None:
+                await self._idle()
+                continue
+            await self._run(claimed)
+
+    async def _run(self, claimed: ClaimedFile) -> None:
+        job_id, idx, file_name, file_type = claimed
+        try:
+            data = await asyncio.to_thread(self.store.read_file, job_id, idx)
+            result = await self.process(data, file_name, file_type)
+        except Exception as e:
+            logger.error(f"Ingestion of {file_name} (job {job_id}) failed: {e}", exc_info=True)
+            result = {"file_name": file_name, "status": "error", "error": f"Unexpected processing error: {e}"}
+        try:
+            await asyncio.to_thread(self.store.finish, job_id, idx, result)
+        except Exception as e:
+            # Not retried here: the row stays "running" until the app restarts,
+            # when the startup hook in app/main.py calls requeue_interrupted().
+            logger.error(f"Recording the result of {file_name} (job {job_id}) failed: {e}", exc_info=True)
@@ -0,0 +1,314 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+Counters and histograms live in module-level objects that request handlers
+update directly; point-in-time values owned by other components (cache and
+single-flight stats) are pulled by collectors at scrape time. Each uvicorn
+worker keeps its own numbers, which is what a per-task Prometheus scrape
+expects.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels.get(n, "")) for n in self.labelnames), 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> (per-bucket counts, sum, count)
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = f'le="{_number(bound)}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+# A collector returns (name, type, help, [(labels, value), ...]) families.
+Sample = Tuple[Dict[str, str], float]
+Family = Tuple[str, str, str, List[Sample]]
+Collector = Callable[[], Iterable[Family]]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[object] = []
+        self._collectors: List[Collector] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+                continue
+            for name, kind, help, samples in families:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(list(labels), list(labels.values()))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def stats_collector(
+    prefix: str,
+    sources: Callable[[], Iterable[Dict[str, object]]],
+    counters: Sequence[str] = (),
+    gauges: Sequence[str] = (),
+) -> Collector:
+    """
+    Collector exposing fields of ``stats()`` dicts, labelled by their ``name``.
+
+    ``counters`` become ``<prefix>_<field>_total``, ``gauges`` become
+    ``<prefix>_<field>``.
+    """
+    def collect() -> Iterable[Family]:
+        stats = list(sources())
+        for field in counters:
+            samples = [({"name": str(s["name"])}, s[field]) for s in stats]
+            yield f"{prefix}_{field}_total", "counter", f"{prefix} {field}.", samples
+        for field in gauges:
+            samples = [({"name": str(s["name"])}, s[field]) for s in stats]
+            yield f"{prefix}_{field}", "gauge", f"{prefix} {field}.", samples
+    return collect
+
+
+metrics = MetricsRegistry()
+
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+)
+llm_request_duration = metrics.histogram(
+    "llm_request_duration_seconds",
+    "Upstream LLM call latency by chain.",
+    ["chain", "outcome"],
+    buckets=LLM_BUCKETS,
+)
+llm_prompt_tokens = metrics.counter(
+    "llm_prompt_tokens_total", "Prompt tokens sent upstream, by chain.", ["chain"]
+)
+llm_completion_tokens = metrics.counter(
+    "llm_completion_tokens_total", "Completion tokens received, by chain.", ["chain"]
+)
+embedding_duration = metrics.histogram(
+    "embedding_batch_duration_seconds", "Latency of one embed_documents batch.", ["source"]
+)
+embedding_texts = metrics.counter(
+    "embedding_texts_total", "Texts embedded, by source.", ["source"]
+)
+llm_output_repairs = metrics.counter(
+    "llm_output_repairs_total", "Malformed LLM outputs repaired locally, by schema.", ["schema", "outcome"]
+)
+text_extraction_duration = metrics.histogram(
+    "text_extraction_duration_seconds", "Resume text extraction latency by file type.", ["file_type"]
+)
+resume_text_tokens = metrics.counter(
+    "resume_text_tokens_total", "Resume text tokens before and after compaction.", ["stage"]
+)
+resume_tokens_saved = metrics.histogram(
+    "resume_text_tokens_saved", "Tokens removed from one resume by compaction.", [],
+    buckets=(0, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000),
+)
+local_field_agreement = metrics.counter(
+    "local_field_agreement_total",
+    "Local regex extraction vs the LLM, by resume field.",
+    ["field", "outcome"],
+)
+resume_batch_documents = metrics.counter(
+    "resume_batch_documents_total",
+    "Resumes in batched extraction prompts, by whether the batch answer was used.",
+    ["outcome"],
+)
+ocr_pages = metrics.counter(
+    "ocr_pages_total", "PDF pages without a text layer, by how OCR resolved them.", ["outcome"]
+)
+
+
+_encoding = None
+_encoding_failed = False
+
+
+def token_encoding():
+    """
+    tiktoken's cl100k_base, or None if it can't be loaded (it is fetched on
+    first use). It is not Gemini's tokenizer, but tracks it closely enough
+    for sizing.
+    """
+    global _encoding, _encoding_failed
+    if _encoding is None and not _encoding_failed:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logger.warning(f"tiktoken unavailable, estimating tokens from length: {e}")
+            _encoding_failed = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Approximate token count for accounting; ~4 characters per token without tiktoken."""
+    encoding = token_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4
+
+
+def record_llm_call(chain: Optional[str], prompt: str, completion: Optional[str], seconds: float) -> None:
+    chain = chain or "unnamed"
+    llm_request_duration.observe(seconds, chain=chain, outcome="success" if completion is not None else "error")
+    llm_prompt_tokens.inc(count_tokens(prompt), chain=chain)
+    if completion is not None:
+        llm_completion_tokens.inc(count_tokens(completion), chain=chain)
+
+
+def embed_documents(embeddings, texts: List[str], source: str):
+    """``embeddings.embed_documents`` with batch latency recorded."""
+    with embedding_duration.time(source=source):
+        vectors = embeddings.embed_documents(texts)
+    embedding_texts.inc(len(texts), source=source)
+    return vectors
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request.
+
+    Requests are labelled with the matched route template (``/api/v1/...``),
+    not the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                method=scope.get("method", ""),
+                route=getattr(route, "path", "unmatched"),
+                status=str(status["code"]),
+            )
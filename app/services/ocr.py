@@ -0,0 +1,72 @@
+"""
+OCR for PDF pages without a text layer (scanned resumes).
+
+Pages are rasterized with pdf2image (poppler's pdftoppm) and read with
+pytesseract (the tesseract binary). Like app.services.extractors, this
+module imports nothing from the app so extraction pool workers can run it.
+"""
+import io
+import os
+import shutil
+from typing import List, Optional, Sequence
+
+import xxhash
+
+from app.services.extractors import Readable
+
+
+def ocr_available() -> bool:
+    """Both external binaries are on PATH."""
+    return shutil.which("pdftoppm") is not None and shutil.which("tesseract") is not None
+
+
+def _pdf_bytes(source: Readable) -> bytes:
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    return source.read()
+
+
+def _page_hash(page) -> Optional[str]:
+    digest = xxhash.xxh3_128()
+    contents = page.get_contents()
+    if contents is not None:
+        digest.update(contents.get_data())
+    resources = page.get("/Resources")
+    xobjects = resources.get_object().get("/XObject") if resources else None
+    if xobjects:
+        xobjects = xobjects.get_object()
+        for name in sorted(xobjects):
+            digest.update(name.encode())
+            try:
+                digest.update(xobjects[name].get_object().get_data())
+            except NotImplementedError:
+                # A filter PyPDF2 can't decode (JBIG2, ...). Scanned pages
+                # share their content stream, so without the image data the
+                # page can't be told apart from others.
+                return None
+    return digest.hexdigest()
+
+
+def page_hashes(source: Readable, indices: Sequence[int]) -> List[Optional[str]]:
+    """
+    Content hash of each page: its content stream plus the data of the
+    images it draws. The same scanned page hashes the same in any document,
+    so OCR output can be cached per page. None for a page whose images
+    can't be read.
+    """
+    import PyPDF2
+
+    pages = PyPDF2.PdfReader(io.BytesIO(_pdf_bytes(source))).pages
+    return [_page_hash(pages[index]) for index in indices]
+
+
+def ocr_page(source: Readable, index: int, dpi: int = 200, language: str = "eng") -> str:
+    """Rasterize page ``index`` (0-based) and OCR it."""
+    import pytesseract
+    from pdf2image import convert_from_bytes
+
+    images = convert_from_bytes(_pdf_bytes(source), dpi=dpi, first_page=index + 1, last_page=index + 1)
+    return "\n".join(pytesseract.image_to_string(image, lang=language).strip() for image in images)
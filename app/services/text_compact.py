@@ -0,0 +1,125 @@
+import logging
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import List, NamedTuple
+
+from app.services.extractors import PAGE_BREAK
+from app.services.metrics import count_tokens, resume_text_tokens, resume_tokens_saved, token_encoding
+
+logger = logging.getLogger(__name__)
+
+# Control characters other than newline and the page break.
+_CONTROL = re.compile(r"[\x00-\x09\x0b\x0d-\x1f\x7f]")
+_SPACES = re.compile(r"[ \t\u00a0\u200b]+")
+_BLANK_RUNS = re.compile(r"\n{3,}")
+# "3", "- 3 -", "Page 3", "Page 3 of 4", "3/4"
+_PAGE_NUMBER = re.compile(r"^(?:page\s*)?[-–]?\s*\d{1,3}\s*(?:(?:of|/)\s*\d{1,3})?\s*[-–]?$", re.IGNORECASE)
+_DIGITS = re.compile(r"\d+")
+
+# How many lines at the top and bottom of a page count as header/footer.
+EDGE_LINES = 3
+
+
+class CompactedText(NamedTuple):
+    text: str
+    raw_tokens: int
+    tokens: int
+    truncated: bool
+
+
+def _edge(lines: List[str]) -> List[int]:
+    """Indexes of the non-empty lines at the top and bottom of a page."""
+    filled = [i for i, line in enumerate(lines) if line]
+    return sorted(set(filled[:EDGE_LINES] + filled[-EDGE_LINES:]))
+
+
+def _signature(line: str) -> str:
+    # Page numbers and dates differ page to page; the rest of a header doesn't.
+    return _DIGITS.sub("#", line.lower())
+
+
+def strip_page_boilerplate(pages: List[List[str]]) -> List[List[str]]:
+    """
+    Drop page numbers, and header/footer lines repeated at the edge of at
+    least half the pages. The first copy of a repeated line is kept, since
+    resume headers usually carry the candidate's name and contact details.
+    """
+    counts: Counter = Counter()
+    for lines in pages:
+        counts.update({_signature(lines[i]) for i in _edge(lines)})
+    repeated = {sig for sig, n in counts.items() if n >= max(2, math.ceil(len(pages) / 2))}
+
+    seen = set()
+    result = []
+    for lines in pages:
+        drop = set()
+        for i in _edge(lines):
+            sig = _signature(lines[i])
+            if _PAGE_NUMBER.match(lines[i]):
+                drop.add(i)
+            elif sig in repeated:
+                if sig in seen:
+                    drop.add(i)
+                seen.add(sig)
+        result.append([line for i, line in enumerate(lines) if i not in drop])
+    return result
+
+
+def normalize_text(text: str) -> str:
+    """
+    NFKC-normalize (ligatures, non-breaking spaces), drop control
+    characters, collapse runs of spaces, strip every line, remove repeated
+    page boilerplate and squeeze blank lines. Page breaks are removed.
+    """
+    text = _CONTROL.sub("", unicodedata.normalize("NFKC", text))
+    pages = [
+        [_SPACES.sub(" ", line).strip() for line in page.split("\n")]
+        for page in text.split(PAGE_BREAK)
+    ]
+    if len(pages) > 1:
+        pages = strip_page_boilerplate(pages)
+    text = "\n".join("\n".join(lines) for lines in pages)
+    return _BLANK_RUNS.sub("\n\n", text).strip() + "\n"
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Cut ``text`` to at most ``budget`` tokens, ending on a whole line."""
+    encoding = token_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= budget:
+            return text
+        cut = encoding.decode(tokens[:budget])
+    else:
+        if len(text) // 4 <= budget:
+            return text
+        cut = text[:budget * 4]
+    newline = cut.rfind("\n")
+    if newline > len(cut) // 2:
+        cut = cut[:newline]
+    return cut.rstrip() + "\n"
+
+
+def compact_resume_text(text: str, token_budget: int) -> CompactedText:
+    """
+    Normalize extracted resume text and trim it to ``token_budget`` tokens
+    (0 = no limit) before it goes into the extraction prompt. Tokens before
+    and after are recorded per document.
+    """
+    raw_tokens = count_tokens(text)
+    compacted = normalize_text(text)
+    truncated = False
+    if token_budget > 0:
+        trimmed = truncate_to_tokens(compacted, token_budget)
+        truncated = trimmed is not compacted
+        compacted = trimmed
+    tokens = count_tokens(compacted)
+
+    resume_text_tokens.inc(raw_tokens, stage="raw")
+    resume_text_tokens.inc(tokens, stage="compacted")
+    resume_tokens_saved.observe(raw_tokens - tokens)
+    logger.info(f"Resume text compacted from {raw_tokens} to {tokens} tokens"
+                f"{' (truncated to budget)' if truncated else ''}")
+    return CompactedText(compacted, raw_tokens, tokens, truncated)
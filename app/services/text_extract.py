@@ -1,25 +1,162 @@
-import PyPDF2
-from docx import Document
+import asyncio
+import io
+import logging
 import os
+import tempfile
+from typing import BinaryIO, List, Optional, Union
 
-def pdf_to_text(file_path):
-    text = ""
-    ext = os.path.splitext(file_path)[1].lower()
-    
+from app.services.cache import TieredCache
+from app.services.extraction_pool import ExtractionPool
+from app.services.extractors import DOCX, PDF, get_extractor, join_pages
+from app.services.metrics import ocr_pages, text_extraction_duration
+from app.services.ocr import ocr_available, ocr_page, page_hashes
+from config.Settings import settings
+
+logger = logging.getLogger(__name__)
+
+# A path, raw bytes (bytes/bytearray/memoryview) or an open binary stream.
+Source = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+extraction_pool = ExtractionPool(
+    workers=settings.extract_workers,
+    max_tasks_per_child=settings.extract_max_tasks_per_child,
+    timeout=settings.extract_timeout,
+    pages_per_task=settings.extract_pages_per_task,
+)
+
+# OCR text per page content hash, alongside the LLM cache in LLM_CACHE_PATH.
+ocr_cache = TieredCache("ocr_pages", settings.llm_cache_path, max_entries=settings.ocr_cache_max_entries)
+
+
+def as_stream(data: Union[bytes, bytearray, memoryview], spool_threshold: Optional[int] = None) -> BinaryIO:
+    """
+    A readable stream over ``data``. Small uploads stay in memory; anything
+    above ``spool_threshold`` bytes (EXTRACT_SPOOL_THRESHOLD) is spooled to
+    an anonymous temp file in the save directory, which the OS removes even
+    if the process dies.
+    """
+    threshold = settings.extract_spool_threshold if spool_threshold is None else spool_threshold
+    if len(data) <= threshold:
+        return io.BytesIO(data)
+    settings.save_directory.mkdir(exist_ok=True)
+    spooled = tempfile.TemporaryFile(dir=settings.save_directory)
+    spooled.write(data)
+    spooled.seek(0)
+    return spooled
+
+
+def _file_ext(source: Source, file_type: Optional[str]) -> str:
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.splitext(source)[1].lower()
+    if file_type:
+        return "." + file_type.lower().lstrip(".")
+    raise ValueError("file_type is required when extracting from bytes or a stream")
+
+
+def pdf_to_text(source: Source, file_type: Optional[str] = None):
+    """
+    Extract the text of a PDF or DOCX in the calling thread. ``source`` is a
+    path or the document itself; in-memory sources need ``file_type``
+    (".pdf", "docx", ...) since there is no file name to take it from. No
+    OCR fallback here; see apdf_to_text.
+    """
+    ext = _file_ext(source, file_type)
+    with text_extraction_duration.time(file_type=ext.lstrip(".") or "unknown"):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            with as_stream(source) as stream:
+                return _extract_text(stream, ext)
+        return _extract_text(source, ext)
+
+
+async def _offload(fn, *args):
+    """Run a CPU-bound job in the extraction pool, or in a thread when the pool is off."""
+    if settings.extract_workers <= 0:
+        return await asyncio.to_thread(fn, *args)
+    return await extraction_pool.arun(fn, *args)
+
+
+def _local_pdf_pages(source: Union[str, bytes]) -> List[str]:
+    if isinstance(source, bytes):
+        with as_stream(source) as stream:
+            return get_extractor(PDF, settings.pdf_extractor)(stream)[0]
+    return get_extractor(PDF, settings.pdf_extractor)(source)[0]
+
+
+async def ocr_missing_pages(source: Union[str, bytes], pages: List[str]) -> List[str]:
+    """
+    Replace pages with (almost) no text layer by their OCR text. Results are
+    cached per page content hash (pages that can't be hashed aren't cached);
+    the remaining pages are OCRed in parallel.
+    A page whose OCR fails keeps its (empty) text layer.
+    """
+    low = [i for i, text in enumerate(pages) if len(text.strip()) < settings.ocr_min_chars_per_page]
+    if not low or not settings.ocr_enabled:
+        return pages
+    if not ocr_available():
+        logger.warning(f"{len(low)} page(s) have no text layer but OCR is unavailable "
+                       f"(needs the pdftoppm and tesseract binaries)")
+        return pages
+
+    hashes = await _offload(page_hashes, source, low)
+    keys = {i: f"{h}:{settings.ocr_dpi}:{settings.ocr_language}" for i, h in zip(low, hashes) if h}
+    pages = list(pages)
+    misses = []
+    for i in low:
+        cached = ocr_cache.get(keys[i]) if i in keys else None
+        if cached is None:
+            misses.append(i)
+        else:
+            pages[i] = cached
+            ocr_pages.inc(outcome="cached")
+
+    results = await asyncio.gather(
+        *(_offload(ocr_page, source, i, settings.ocr_dpi, settings.ocr_language) for i in misses),
+        return_exceptions=True,
+    )
+    for i, result in zip(misses, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"OCR failed for page {i + 1}: {result}")
+            ocr_pages.inc(outcome="failed")
+            continue
+        if i in keys:
+            ocr_cache.set(keys[i], result, ttl=settings.ocr_cache_ttl)
+        pages[i] = result
+        ocr_pages.inc(outcome="ocr")
+    return pages
+
+
+async def apdf_to_text(source: Source, file_type: Optional[str] = None):
+    """
+    pdf_to_text in the extraction process pool, so parsing never holds the
+    API process's GIL. Large PDFs are split into page ranges across workers
+    and every job has a hard timeout; pages without a text layer go through
+    OCR. EXTRACT_WORKERS=0 runs all of it in threads instead.
+    """
+    ext = _file_ext(source, file_type)
+    if isinstance(source, os.PathLike):
+        source = os.fspath(source)
+    elif isinstance(source, (bytearray, memoryview)):
+        source = bytes(source)
+    elif not isinstance(source, (str, bytes)):
+        source = await asyncio.to_thread(source.read)
+
+    with text_extraction_duration.time(file_type=ext.lstrip(".") or "unknown"):
+        if ext == ".pdf":
+            if settings.extract_workers <= 0:
+                pages = await asyncio.to_thread(_local_pdf_pages, source)
+            else:
+                pages = await extraction_pool.pdf_pages(source, settings.pdf_extractor)
+            return join_pages(await ocr_missing_pages(source, pages))
+        if ext in [".docx", ".doc"]:
+            if settings.extract_workers <= 0:
+                return await asyncio.to_thread(_extract_text, source, ext)
+            return await extraction_pool.docx_text(source, settings.docx_extractor)
+        raise ValueError(f"Unsupported file type: {ext}")
+
+def _extract_text(source, ext):
     if ext == ".pdf":
-        with open(file_path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-                    
+        return join_pages(get_extractor(PDF, settings.pdf_extractor)(source)[0])
     elif ext in [".docx", ".doc"]:
-        doc = Document(file_path)
-        for para in doc.paragraphs:
-            text += para.text + "\n"
-            
+        return get_extractor(DOCX, settings.docx_extractor)(source)
     else:
         raise ValueError(f"Unsupported file type: {ext}")
-    
-    return text
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Micro-benchmark: per-request chain setup cost, before and after the registry.
+
+"Before" rebuilds the LLM, prompt, parser and chain on every call, the way
+the agents used to, with the app's DispatchingLLM over the shared backend,
+which is what the registry builds on a miss. "After" looks the prebuilt chain
+up in the registry. No LLM call is made in either case, so this measures
+setup overhead only.
+
+Usage:
+    python -m benchmarks.bench_agent_setup [iterations]
+"""
+import os
+import sys
+import timeit
+
+os.environ.setdefault("API_KEY_1", "benchmark-dummy-key")
+os.environ.setdefault("VALIDATE_API_KEYS", "false")
+
+from langchain.chains import LLMChain
+from langchain.output_parsers import PydanticOutputParser
+from langchain.prompts import PromptTemplate
+
+from agents import ai_question_generate, jd_genrator, job_taging, jd_title_suggestion, resume_analyze
+from agents.backends import get_backend
+from agents.dispatcher import DispatchingLLM
+from agents.llm_cache import chain_ttl
+from agents.registry import registry
+from agents.types import JobDescriptionOutline, JobDescriptionTitleAISuggest, JobTagsOutput
+from config.Settings import settings
+
+
+def _llm():
+    return DispatchingLLM(
+        dispatcher=get_backend(),
+        model=settings.model,
+        temperature=settings.temperature,
+        max_output_tokens=settings.max_output_tokens,
+        cache_ttl=chain_ttl(None, None),
+    )
+
+
+def _templated(module_template, variables, pydantic_object):
+    def build():
+        prompt = PromptTemplate(input_variables=variables, template=module_template)
+        parser = PydanticOutputParser(pydantic_object=pydantic_object)
+        return LLMChain(llm=_llm(), prompt=prompt, verbose=True, output_parser=parser)
+    return build
+
+
+BEFORE = {
+    "jd_generator": _templated(
+        jd_genrator.template, jd_genrator.prompt.input_variables, JobDescriptionOutline
+    ),
+    "job_tagging": _templated(
+        job_taging.template, job_taging.prompt.input_variables, JobTagsOutput
+    ),
+    "jd_title_suggestion": _templated(
+        jd_title_suggestion.job_title_prompt.template,
+        jd_title_suggestion.job_title_prompt.input_variables,
+        JobDescriptionTitleAISuggest,
+    ),
+    "resume_analyze": lambda: LLMChain(
+        llm=_llm(), prompt=PromptTemplate.from_template(resume_analyze.raw_prompt)
+    ),
+    "ai_question_generate": lambda: LLMChain(
+        llm=_llm(),
+        prompt=PromptTemplate.from_template(
+            ai_question_generate.escape_prompt(ai_question_generate.original_prompt)
+        ),
+    ),
+}
+
+
+def main(iterations: int = 200) -> None:
+    registry.warmup()
+    print(f"{'chain':<24}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for name, build in BEFORE.items():
+        before = timeit.timeit(build, number=iterations) / iterations * 1e6
+        after = timeit.timeit(lambda: registry.chain(name), number=iterations) / iterations * 1e6
+        print(f"{name:<24}{before:>14.1f}{after:>14.2f}{before / after:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
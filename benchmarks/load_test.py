@@ -0,0 +1,199 @@
+"""
+End-to-end load test: drive every endpoint at a fixed concurrency and report
+p50/p95/p99 latency and throughput.
+
+By default the app runs in-process on the offline fake LLM backend, so the
+numbers measure this service's own overhead (routing, parsing, validation,
+text extraction, dispatch) plus the simulated LLM latency. The response cache
+is off unless --cache is given, and every request carries a distinct payload
+so single-flight doesn't merge them. Pass --url to load a running server
+instead; it then uses whatever backend that server is configured with.
+
+Usage:
+    python -m benchmarks.load_test [--concurrency 32] [--requests 600]
+        [--endpoints generate-job-tags,parse-cv] [--latency 0.5]
+        [--error-rate 0.0] [--cache] [--url http://localhost:8000]
+"""
+import argparse
+import asyncio
+import base64
+import os
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+from benchmarks.samples import make_pdf, resume_lines
+
+API = "/api/v1"
+
+
+def _job_description(i: int) -> Dict[str, Any]:
+    return {"title": f"Software Engineer {i}", "experienceRange": "3-5 years",
+            "department": "Engineering", "subDepartment": "Backend"}
+
+
+def _title_suggestion(i: int) -> Dict[str, Any]:
+    return {**_job_description(i), "keyResponsibilities": ["Build APIs", "Own CI/CD"],
+            "softSkills": ["Communication"], "technicalSkills": ["Python", "AWS"],
+            "education": ["B.E. Computer Science"], "certifications": [], "niceToHave": []}
+
+
+def _job_tags(i: int) -> Dict[str, Any]:
+    return {"title": f"Data Engineer {i}", "experienceRange": "2-4 years",
+            "job_description": "Build and operate batch and streaming pipelines.",
+            "key_responsibility": ["Design pipelines"], "technical_skill": ["Spark", "SQL"],
+            "soft_skill": ["Ownership"], "education": ["B.Tech"], "nice_to_have": ["Airflow"]}
+
+
+def _refine(i: int) -> Dict[str, Any]:
+    return {**_job_description(i), "keyResponsibilities": f"Develop backend services, review code ({i})"}
+
+
+_PDF_CACHE: Dict[int, str] = {}
+
+
+def _parse_cv(i: int) -> Dict[str, Any]:
+    # A handful of distinct PDFs; the index in the file name keeps requests distinct.
+    key = i % 8
+    if key not in _PDF_CACHE:
+        _PDF_CACHE[key] = base64.b64encode(make_pdf(resume_lines(key))).decode()
+    return {"files": [{"file_name": f"resume_{i}.pdf", "file_data": _PDF_CACHE[key]}]}
+
+
+def _batch_analyze(i: int) -> Dict[str, Any]:
+    job = {"job_id": f"job-{i}", "title": "Backend Engineer", "description": "APIs in Python",
+           "experience_level": "Mid", "technical_skills": ["Python", "FastAPI"],
+           "responsibilities": ["Build APIs"], "softSkills": ["Teamwork"],
+           "qualification": ["B.E."], "job_tag": ["python", "fastapi", "backend"]}
+    candidate = {"candidateId": f"cand-{i}", "currentTitle": "Engineer", "name": "Jane Doe",
+                 "phone": "555-0100", "email": "jane.doe@example.com", "location": "Pune",
+                 "experience_level": "Mid", "experience_year": 4, "technical_skills": ["Python"],
+                 "softSkills": ["Teamwork"], "qualification": ["B.E."],
+                 "candidate_tag": ["python", "django", "backend"]}
+    return {"jobs": [job], "candidates": [candidate], "threshold": 50}
+
+
+def _ai_question(i: int) -> Dict[str, Any]:
+    return {"jobs": {"job_id": f"job-{i}", "title": "Backend Engineer", "technical_skills": ["Python"]},
+            "candidates": {"candidateId": f"cand-{i}", "technical_skills": ["Python", "Go"]}}
+
+
+ENDPOINTS: Dict[str, Tuple[str, Callable[[int], Dict[str, Any]]]] = {
+    "generate-job-description": (f"{API}/generate-job-description", _job_description),
+    "generate-AI-titleSuggestion": (f"{API}/generate-AI-titleSuggestion", _title_suggestion),
+    "generate-job-tags": (f"{API}/generate-job-tags", _job_tags),
+    "regenerate-job-field": (f"{API}/regenerate-job-field", _refine),
+    "enhance-job-field": (f"{API}/enhance-job-field", _refine),
+    "parse-cv": (f"{API}/parse-cv", _parse_cv),
+    "batch-analyze-resumes": (f"{API}/ai/batch-analyze-resumes", _batch_analyze),
+    "generate-ai-question": (f"{API}/generate-ai-question", _ai_question),
+    "generate-prompt-questions": (f"{API}/generate-prompt-questions",
+                                  lambda i: {"prompt": f"Senior Python developer, round {i}"}),
+    "evaluate-feedback": (f"{API}/evaluate-feedback",
+                          lambda i: {"text": f"good at sql ({i})", "context": "technicalSkills"}),
+    "evaluate-interview": (f"{API}/evaluate-interview",
+                           lambda i: {"technicalSkills": f"Strong Python ({i})",
+                                      "communicationCollaboration": "Clear"}),
+    "chat": (f"{API}/chat", lambda i: {"question": f"Summarise the candidate ({i})"}),
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run(client: httpx.AsyncClient, endpoints: List[str], total: int, concurrency: int):
+    queue: "asyncio.Queue[Tuple[str, int]]" = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait((endpoints[i % len(endpoints)], i))
+    results: Dict[str, List[Tuple[float, int]]] = defaultdict(list)
+
+    async def worker():
+        while True:
+            try:
+                name, i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            path, payload = ENDPOINTS[name]
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json=payload(i))
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            results[name].append((time.perf_counter() - start, status))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results, time.perf_counter() - start
+
+
+def report(results: Dict[str, List[Tuple[float, int]]], elapsed: float) -> None:
+    header = f"{'endpoint':<30}{'n':>6}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rps':>9}"
+    print(header)
+    print("-" * len(header))
+    everything = []
+    for name, samples in sorted(results.items()):
+        latencies = sorted(s[0] for s in samples)
+        errors = sum(1 for s in samples if not 200 <= s[1] < 300)
+        everything.extend(samples)
+        print(f"{name:<30}{len(samples):>6}{errors:>6}"
+              f"{percentile(latencies, 50) * 1e3:>10.1f}{percentile(latencies, 95) * 1e3:>10.1f}"
+              f"{percentile(latencies, 99) * 1e3:>10.1f}{len(samples) / elapsed:>9.1f}")
+    latencies = sorted(s[0] for s in everything)
+    errors = sum(1 for s in everything if not 200 <= s[1] < 300)
+    print("-" * len(header))
+    print(f"{'total':<30}{len(everything):>6}{errors:>6}"
+          f"{percentile(latencies, 50) * 1e3:>10.1f}{percentile(latencies, 95) * 1e3:>10.1f}"
+          f"{percentile(latencies, 99) * 1e3:>10.1f}{len(everything) / elapsed:>9.1f}")
+    print(f"\n{len(everything)} requests in {elapsed:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS),
+                        help="comma-separated subset of: " + ", ".join(ENDPOINTS))
+    parser.add_argument("--url", help="target a running server instead of the in-process app")
+    parser.add_argument("--latency", type=float, default=0.5, help="fake LLM latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fake LLM error rate, 0-1")
+    parser.add_argument("--cache", action="store_true", help="keep the LLM response cache on")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    unknown = [e for e in endpoints if e not in ENDPOINTS]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)}")
+
+    if args.url:
+        transport, base_url = None, args.url
+    else:
+        # Must be set before the app (and Settings) is imported.
+        os.environ["LLM_BACKEND"] = "fake"
+        os.environ["FAKE_LLM_LATENCY"] = str(args.latency)
+        os.environ["FAKE_LLM_ERROR_RATE"] = str(args.error_rate)
+        os.environ.setdefault("VALIDATE_API_KEYS", "false")
+        if not args.cache:
+            os.environ["LLM_CACHE_ENABLED"] = "false"
+        from app.main import app
+        transport, base_url = httpx.ASGITransport(app=app), "http://loadtest"
+
+    async def go():
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(transport=transport, base_url=base_url,
+                                     timeout=args.timeout, limits=limits) as client:
+            return await run(client, endpoints, args.requests, args.concurrency)
+
+    results, elapsed = asyncio.run(go())
+    report(results, elapsed)
+
+
+if __name__ == "__main__":
+    main()
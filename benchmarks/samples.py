@@ -0,0 +1,99 @@
+"""
+Synthetic resumes for benchmarks: deterministic text rendered to PDF or DOCX
+bytes, so no real candidate data is needed to exercise the upload path.
+"""
+import io
+from typing import List, Optional, Sequence
+
+from docx import Document
+
+_SKILLS = ["Python", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "AWS", "React", "Terraform"]
+_COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries"]
+
+
+def resume_lines(index: int = 0, jobs: int = 3) -> List[str]:
+    """Plain-text lines of a fake resume; ``jobs`` controls the length."""
+    lines = [
+        f"Candidate {index}",
+        f"candidate{index}@example.com | +1 555 010 {index % 10000:04d} | Pune, India",
+        "",
+        "SUMMARY",
+        "Backend engineer building APIs and data pipelines for HR products.",
+        "",
+        "EXPERIENCE",
+    ]
+    for j in range(jobs):
+        start = 2015 + j * 2
+        company = _COMPANIES[(index + j) % len(_COMPANIES)]
+        lines += [
+            f"Software Engineer, {company}    Jan {start} - Dec {start + 1}",
+            f"- Built services in {_SKILLS[j % len(_SKILLS)]} and {_SKILLS[(j + 3) % len(_SKILLS)]}.",
+            "- Reduced p95 latency by 40% through caching and query tuning.",
+            "- Mentored two junior engineers and ran code reviews.",
+        ]
+    lines += [
+        "",
+        "EDUCATION",
+        "B.E. Computer Engineering, University of Pune    2011 - 2015",
+        "",
+        "SKILLS",
+        ", ".join(_SKILLS),
+    ]
+    return lines
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(lines: List[str], lines_per_page: int = 48) -> bytes:
+    """A minimal text PDF (Helvetica, one Tj per line) readable by PyPDF2."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    font_id = 3 + 2 * len(pages)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            b" ".join(b"%d 0 R" % (3 + 2 * i) for i in range(len(pages))), len(pages)
+        ),
+    ]
+    for i, page in enumerate(pages):
+        ops = ["BT /F1 11 Tf 14 TL 72 750 Td"]
+        ops += [f"({_pdf_escape(line)}) Tj T*" for line in page]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (font_id, 4 + 2 * i)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def make_docx(lines: List[str], header: Optional[str] = None, table: Sequence[Sequence[str]] = ()) -> bytes:
+    """Paragraphs for ``lines``, then ``table`` (rows of cells), with an optional page header."""
+    document = Document()
+    if header is not None:
+        document.sections[0].header.paragraphs[0].text = header
+    for line in lines:
+        document.add_paragraph(line)
+    if table:
+        grid = document.add_table(rows=len(table), cols=max(len(row) for row in table))
+        for r, row in enumerate(table):
+            for c, cell in enumerate(row):
+                grid.cell(r, c).text = cell
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
@@ -3,15 +3,16 @@ from pydantic_settings import BaseSettings
 from pydantic import Field
 from dotenv import load_dotenv
 from pathlib import Path
+from typing import Optional
 import os
-import google.generativeai as genai
+from config.key_manager import ApiKeyManager
 
 load_dotenv()
 
 
 class Settings(BaseSettings):
     # API keys for fallback rotation
-    api_keys: list[str] = Field(
+    api_keys: list[Optional[str]] = Field(
         default_factory=lambda: [
             os.getenv("API_KEY_1"),
             os.getenv("API_KEY_2"),
@@ -24,12 +25,104 @@ class Settings(BaseSettings):
     max_output_tokens: int = Field(default=10000, env="MAX_OUTPUT_TOKENS")
     temperature: float = Field(default=0.2, env="TEMPERATURE")
 
+    # API key validation (runs in the background, never at import)
+    validate_api_keys: bool = Field(default=True, env="VALIDATE_API_KEYS")
+    key_validation_timeout: float = Field(default=5.0, env="KEY_VALIDATION_TIMEOUT")
+
+    # Multi-key dispatch: per-key limits and circuit breaker
+    llm_rpm_per_key: int = Field(default=1000, env="LLM_RPM_PER_KEY")
+    llm_tpm_per_key: int = Field(default=1_000_000, env="LLM_TPM_PER_KEY")
+    llm_breaker_failure_threshold: int = Field(default=3, env="LLM_BREAKER_FAILURE_THRESHOLD")
+    llm_breaker_cooldown: float = Field(default=30.0, env="LLM_BREAKER_COOLDOWN")
+    llm_dispatch_wait_timeout: float = Field(default=30.0, env="LLM_DISPATCH_WAIT_TIMEOUT")
+
+    # LLM response cache (in-memory LRU in front of SQLite)
+    llm_cache_enabled: bool = Field(default=True, env="LLM_CACHE_ENABLED")
+    llm_cache_path: str = Field(default="cache/llm_cache.db", env="LLM_CACHE_PATH")
+    llm_cache_ttl: float = Field(default=24 * 3600, env="LLM_CACHE_TTL")
+    llm_cache_ttls: dict[str, float] = Field(default_factory=dict, env="LLM_CACHE_TTLS")
+    llm_cache_max_entries: int = Field(default=2048, env="LLM_CACHE_MAX_ENTRIES")
+    llm_cache_max_disk_entries: int = Field(default=100_000, env="LLM_CACHE_MAX_DISK_ENTRIES")
+
+    # Resume extraction results keyed by (file content hash, prompt version, model);
+    # stored alongside the LLM cache in LLM_CACHE_PATH
+    extraction_cache_enabled: bool = Field(default=True, env="EXTRACTION_CACHE_ENABLED")
+    extraction_cache_ttl: float = Field(default=30 * 24 * 3600, env="EXTRACTION_CACHE_TTL")
+    extraction_cache_max_entries: int = Field(default=512, env="EXTRACTION_CACHE_MAX_ENTRIES")
+
+    # Pass each chain's pydantic schema to Gemini as a response_schema
+    llm_structured_output: bool = Field(default=False, env="LLM_STRUCTURED_OUTPUT")
+
+    # LLM backend: "gemini", or "fake" for offline tests and load testing
+    llm_backend: str = Field(default="gemini", env="LLM_BACKEND")
+    fake_llm_latency: float = Field(default=0.5, env="FAKE_LLM_LATENCY")
+    fake_llm_latency_jitter: float = Field(default=0.2, env="FAKE_LLM_LATENCY_JITTER")
+    fake_llm_error_rate: float = Field(default=0.0, env="FAKE_LLM_ERROR_RATE")
+    fake_llm_seed: int = Field(default=42, env="FAKE_LLM_SEED")
+
     # File handling
     save_dir: str = Field(default="downloaded_files", env="SAVE_DIR")
     max_file_size: int = Field(default=10 * 1024 * 1024, env="MAX_FILE_SIZE")
     max_files_per_request: int = Field(default=10, env="MAX_FILES_PER_REQUEST")
+    parse_cv_concurrency: int = Field(default=4, env="PARSE_CV_CONCURRENCY")
+    # Job/candidate pairs analyzed at once per /ai/batch-analyze-resumes request
+    batch_analyze_concurrency: int = Field(default=8, env="BATCH_ANALYZE_CONCURRENCY")
+    # Uploads larger than this are spooled to disk for text extraction
+    extract_spool_threshold: int = Field(default=2 * 1024 * 1024, env="EXTRACT_SPOOL_THRESHOLD")
+
+    # Text extraction backends (see app/services/extractors.py)
+    pdf_extractor: str = Field(default="pypdf2", env="PDF_EXTRACTOR")
+    docx_extractor: str = Field(default="lxml", env="DOCX_EXTRACTOR")
+
+    # Resume text is normalized and trimmed to this many tokens before the
+    # extraction prompt (0 = normalize only)
+    resume_token_budget: int = Field(default=6000, env="RESUME_TOKEN_BUDGET")
+
+    # Resumes extracted concurrently are packed up to this many per prompt
+    # (1 = one call per resume); a batch is sent when full or this many
+    # seconds after its first resume arrived. Batches only fill if
+    # PARSE_CV_CONCURRENCY is at least this high
+    resume_batch_size: int = Field(default=1, env="RESUME_BATCH_SIZE")
+    resume_batch_wait: float = Field(default=0.05, env="RESUME_BATCH_WAIT")
+
+    # Regex pre-extraction of email, phone and dates: "shadow" only measures
+    # agreement with the LLM, "fill" takes email/phone from it and tells the
+    # LLM to skip them, "off" disables it
+    local_field_mode: str = Field(default="shadow", env="LOCAL_FIELD_MODE")
+
+    # OCR fallback for PDF pages with less text than this (needs pdftoppm + tesseract)
+    ocr_enabled: bool = Field(default=True, env="OCR_ENABLED")
+    ocr_min_chars_per_page: int = Field(default=20, env="OCR_MIN_CHARS_PER_PAGE")
+    ocr_dpi: int = Field(default=200, env="OCR_DPI")
+    ocr_language: str = Field(default="eng", env="OCR_LANGUAGE")
+    ocr_cache_ttl: float = Field(default=30 * 24 * 3600, env="OCR_CACHE_TTL")
+    ocr_cache_max_entries: int = Field(default=1024, env="OCR_CACHE_MAX_ENTRIES")
+
+    # Text extraction process pool (0 workers = extract in a thread instead)
+    extract_workers: int = Field(default_factory=lambda: min(4, os.cpu_count() or 1), env="EXTRACT_WORKERS")
+    extract_timeout: float = Field(default=30.0, env="EXTRACT_TIMEOUT")
+    extract_max_tasks_per_child: int = Field(default=50, env="EXTRACT_MAX_TASKS_PER_CHILD")
+    extract_pages_per_task: int = Field(default=10, env="EXTRACT_PAGES_PER_TASK")
     minimum_eligible_score: int = Field(default=60, env="MINIMUM_ELIGIBLE_SCORE")
 
+    # FastEmbed model shared by every request, loaded and warmed up at
+    # startup (EMBEDDING_PRELOAD). EMBEDDING_CACHE_DIR holds the model files
+    # ("" = FastEmbed's default); the Docker image bakes them in
+    embedding_model: str = Field(default="BAAI/bge-small-en-v1.5", env="EMBEDDING_MODEL")
+    embedding_cache_dir: str = Field(default="", env="EMBEDDING_CACHE_DIR")
+    embedding_threads: int = Field(default=0, env="EMBEDDING_THREADS")
+    embedding_preload: bool = Field(default=True, env="EMBEDDING_PRELOAD")
+    # Tag vectors cached by normalized text (memory LRU over LLM_CACHE_PATH)
+    embedding_cache_enabled: bool = Field(default=True, env="EMBEDDING_CACHE_ENABLED")
+    embedding_cache_max_entries: int = Field(default=8192, env="EMBEDDING_CACHE_MAX_ENTRIES")
+
+    # Bulk ingestion jobs (/parse-cv/jobs): the SQLite job table ("" = in
+    # memory, lost on restart) and the in-process workers extracting them
+    ingest_db_path: str = Field(default="data/ingest_jobs.db", env="INGEST_DB_PATH")
+    ingest_workers: int = Field(default=2, env="INGEST_WORKERS")
+    ingest_max_files_per_job: int = Field(default=1000, env="INGEST_MAX_FILES_PER_JOB")
+    ingest_poll_interval: float = Field(default=2.0, env="INGEST_POLL_INTERVAL")
+
     allowed_file_types: str = Field(
         default=(
             "application/pdf,"
@@ -65,22 +158,9 @@ class Settings(BaseSettings):
 settings = Settings()
 
 
-def get_working_api_key():
-    """Try each Gemini API key until one works."""
-    for key in settings.api_keys:
-        if not key:
-            continue
-        try:
-            genai.configure(api_key=key)
-            model = genai.GenerativeModel(settings.model)
-            response = model.generate_content("ping")
-            if response and hasattr(response, "text"):
-                print(f"✅ Using API key: {key[:6]}***")
-                return key
-        except Exception as e:
-            print(f"❌ API key {key[:6]}*** failed: {e}")
-    raise RuntimeError("All API keys failed or hit limits!")
-
-
-# ✅ Export a working API key
-api_key = get_working_api_key()
+key_manager = ApiKeyManager(
+    settings.api_keys,
+    settings.model,
+    timeout=settings.key_validation_timeout,
+    validate=settings.validate_api_keys,
+)
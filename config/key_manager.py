@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+from enum import Enum
+from typing import Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Model metadata lookup: authenticates the key without spending any tokens.
+VALIDATION_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}"
+
+
+class KeyStatus(str, Enum):
+    UNKNOWN = "unknown"
+    HEALTHY = "healthy"
+    FAILED = "failed"
+
+
+def mask_key(key: str) -> str:
+    return f"{key[:6]}***"
+
+
+class ApiKeyManager:
+    """
+    Lazy, cached Gemini API key selection.
+
+    Keys are validated once, in a background thread started at application
+    startup (or on first use), instead of at import time. Callers that need a
+    key wait for validation with a bounded timeout; everything else, such as
+    the health check, reads the cached status without blocking.
+    """
+
+    def __init__(
+        self,
+        keys: List[Optional[str]],
+        model: str,
+        timeout: float = 5.0,
+        validate: bool = True,
+    ):
+        self.keys = [k for k in keys if k]
+        self.model = model
+        self.timeout = timeout
+        self.validate = validate
+        self._status: Dict[str, KeyStatus] = {k: KeyStatus.UNKNOWN for k in self.keys}
+        self._errors: Dict[str, str] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = False
+
+    def validate_key(self, key: str) -> bool:
+        """Check a single key against the model metadata endpoint."""
+        try:
+            response = httpx.get(
+                VALIDATION_URL.format(model=self.model),
+                params={"key": key},
+                timeout=self.timeout,
+            )
+            ok = response.status_code == 200
+            error = None if ok else f"HTTP {response.status_code}: {response.text[:200]}"
+        except Exception as e:
+            ok, error = False, str(e)
+
+        with self._lock:
+            self._status[key] = KeyStatus.HEALTHY if ok else KeyStatus.FAILED
+            self._checked_at[key] = time.time()
+            if error:
+                self._errors[key] = error
+            else:
+                self._errors.pop(key, None)
+
+        if ok:
+            logger.info(f"✅ API key {mask_key(key)} is healthy")
+        else:
+            logger.warning(f"❌ API key {mask_key(key)} failed: {error}")
+        return ok
+
+    def validate_all(self) -> None:
+        try:
+            for key in self.keys:
+                self.validate_key(key)
+        finally:
+            self._ready.set()
+
+    def start_background_validation(self) -> None:
+        """Start validation once; later calls are no-ops."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            if not self.keys:
+                logger.warning("No Gemini API keys configured")
+                self._ready.set()
+                return
+            if not self.validate:
+                # Offline/dev mode: trust the configured keys as-is.
+                self._ready.set()
+                return
+            self._thread = threading.Thread(
+                target=self.validate_all, name="api-key-validation", daemon=True
+            )
+            self._thread.start()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def is_usable(self, key: str) -> bool:
+        """False only for keys that failed validation."""
+        with self._lock:
+            return self._status.get(key) != KeyStatus.FAILED
+
+    def status(self) -> Dict[str, object]:
+        """Snapshot of key health for probes; never blocks on the network."""
+        with self._lock:
+            keys = [
+                {
+                    "key": mask_key(key),
+                    "status": self._status[key].value,
+                    "checked_at": self._checked_at.get(key),
+                    "error": self._errors.get(key),
+                }
+                for key in self.keys
+            ]
+        healthy = sum(1 for k in keys if k["status"] == KeyStatus.HEALTHY.value)
+        return {"ready": self.ready, "healthy": healthy, "total": len(keys), "keys": keys}
@@ -0,0 +1,11 @@
+import os
+
+# Run the suite offline: canned LLM answers, no key validation, no disk cache
+# or job table, no embedding model download at startup.
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0")
+os.environ.setdefault("FAKE_LLM_LATENCY_JITTER", "0")
+os.environ.setdefault("VALIDATE_API_KEYS", "false")
+os.environ.setdefault("LLM_CACHE_PATH", "")
+os.environ.setdefault("INGEST_DB_PATH", "")
+os.environ.setdefault("EMBEDDING_PRELOAD", "false")
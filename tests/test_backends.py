@@ -0,0 +1,32 @@
+import asyncio
+import json
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from agents.backends import CHAIN_SCHEMAS, FakeBackend, fake_response
+
+
+@pytest.mark.parametrize("chain", sorted(CHAIN_SCHEMAS))
+def test_fake_responses_match_chain_schema(chain):
+    CHAIN_SCHEMAS[chain].model_validate(json.loads(fake_response(chain)))
+
+
+def test_field_chains_answer_with_their_field():
+    assert list(json.loads(fake_response("jd_enhance.softSkills"))) == ["softSkills"]
+
+
+def test_error_rate_is_seeded():
+    def failures(seed):
+        backend = FakeBackend(error_rate=0.5, seed=seed)
+        outcomes = []
+        for _ in range(20):
+            try:
+                asyncio.run(backend.agenerate("prompt", {}, chain="job_tagging"))
+                outcomes.append(True)
+            except google_exceptions.ServiceUnavailable:
+                outcomes.append(False)
+        return outcomes
+
+    assert failures(7) == failures(7)
+    assert 0 < failures(7).count(False) < 20
@@ -0,0 +1,60 @@
+import time
+
+from app.services.cache import TieredCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = TieredCache("lru", None, max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_entries_expire_after_ttl():
+    cache = TieredCache("ttl", None)
+    cache.set("a", "1", ttl=0.05)
+    assert cache.get("a") == "1"
+    time.sleep(0.06)
+    assert cache.get("a") is None
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    TieredCache("responses", db_path).set("prompt-hash", "answer", ttl=60)
+
+    reopened = TieredCache("responses", db_path)
+    assert reopened.get("prompt-hash") == "answer"
+    assert reopened.stats()["disk_hits"] == 1
+    assert reopened.get("prompt-hash") == "answer"
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_async_api_reads_disk_in_a_thread_and_memory_inline(tmp_path, monkeypatch):
+    import asyncio
+    import threading
+
+    db_path = str(tmp_path / "cache.db")
+    TieredCache("responses", db_path).set("on-disk", "answer", ttl=60)
+    cache = TieredCache("responses", db_path)
+    disk_threads = []
+    table_get = cache._table.get
+
+    def recording_get(key):
+        disk_threads.append(threading.current_thread())
+        return table_get(key)
+
+    monkeypatch.setattr(cache._table, "get", recording_get)
+
+    async def lookups():
+        await cache.aset("new", "value", ttl=60)
+        return await cache.aget("on-disk"), await cache.aget("on-disk"), await cache.aget("new")
+
+    assert asyncio.run(lookups()) == ("answer", "answer", "value")
+    # Only the first lookup went to SQLite, off the event loop's thread.
+    assert len(disk_threads) == 1 and disk_threads[0] is not threading.main_thread()
+    assert TieredCache("responses", db_path).get("new") == "value"
@@ -11,7 +11,7 @@ def test_generate_job_description():
         "subDepartment": "Backend"
     }
 
-    response = client.post("/generate-job-description", json=payload)
+    response = client.post("/api/v1/generate-job-description", json=payload)
     
     assert response.status_code == 200
     
@@ -70,7 +70,7 @@ def test_AI_titleSuggestion():
         ]
         }
 
-    response = client.post("/generate-AI-titleSuggestion", json=payload)
+    response = client.post("/api/v1/generate-AI-titleSuggestion", json=payload)
     
     assert response.status_code == 200
     
@@ -80,14 +80,12 @@ def test_refine_job_field_regenerate():
         "experienceRange": "3-5 years",
         "department": "Engineering",
         "subDepartment": "Backend",
-        "keyResponsibilities": [
-            "Develop and maintain backend services",
-            "Collaborate with frontend developers",
-            "Write clean, scalable code"
-        ]
+        "keyResponsibilities": "Develop and maintain backend services, "
+                               "collaborate with frontend developers, "
+                               "write clean, scalable code"
     }
 
-    response = client.post("/regenerate-job-field", json=payload)
+    response = client.post("/api/v1/regenerate-job-field", json=payload)
     
     assert response.status_code == 200
     
@@ -102,17 +100,74 @@ def test_refine_job_field_enhance():
         "experienceRange": "2-4 years",
         "department": "Engineering",
         "subDepartment": "AI/ML",
-        "technicalSkills": [
-            "Python", 
-            "Machine Learning", 
-            "Data Analysis"
-        ]
+        "technicalSkills": "Python, Machine Learning, Data Analysis"
     }
 
-    response = client.post("/enhance-job-field", json=payload)
+    response = client.post("/api/v1/enhance-job-field", json=payload)
     
     assert response.status_code == 200
     
     data = response.json()
     assert "technicalSkills" in data
     assert isinstance(data["technicalSkills"], list)
+
+def test_parse_cv_keeps_order_and_isolates_errors():
+    import base64
+    from benchmarks.samples import make_pdf, resume_lines
+
+    pdf = base64.b64encode(make_pdf(resume_lines(1))).decode()
+    payload = {"files": [
+        {"file_name": "first.pdf", "file_data": pdf},
+        {"file_name": "notes.txt", "file_data": base64.b64encode(b"plain text notes").decode()},
+        {"file_name": "third.pdf", "file_data": pdf},
+        {"file_name": "broken.pdf", "file_data": "not*base64!"},
+    ]}
+
+    response = client.post("/api/v1/parse-cv", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["file_name"] for r in data["extracted_data"]] == ["first.pdf", "notes.txt", "third.pdf", "broken.pdf"]
+    assert [r["status"] for r in data["extracted_data"]] == ["success", "error", "success", "error"]
+    assert data["extracted_data"][3]["error"].startswith("Invalid base64 encoding for file broken.pdf")
+    assert data["successful_extractions"] == 2
+    assert data["failed_extractions"] == 2
+
+def test_parse_cv_streams_ndjson_lines_then_summary():
+    import base64
+    import json
+    from benchmarks.samples import make_pdf, resume_lines
+
+    pdf = base64.b64encode(make_pdf(resume_lines(2))).decode()
+    payload = {"files": [
+        {"file_name": "a.pdf", "file_data": pdf},
+        {"file_name": "b.txt", "file_data": base64.b64encode(b"plain text notes").decode()},
+    ]}
+
+    response = client.post("/api/v1/parse-cv?stream=ndjson", json=payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    files = sorted(lines[:-1], key=lambda line: line["index"])
+    assert [(f["event"], f["file_name"], f["status"]) for f in files] == [
+        ("file", "a.pdf", "success"), ("file", "b.txt", "error")]
+    assert lines[-1] == {"event": "summary", "status": "completed", "processed_files": 2,
+                         "successful_extractions": 1, "failed_extractions": 1}
+
+def test_parse_cv_upload_accepts_multipart_files():
+    from benchmarks.samples import make_docx, make_pdf, resume_lines
+
+    files = [
+        ("files", ("one.pdf", make_pdf(resume_lines(4)), "application/pdf")),
+        ("files", ("two.docx", make_docx(resume_lines(5)), "application/octet-stream")),
+        ("files", ("three.pdf", b"definitely not a pdf", "application/pdf")),
+    ]
+
+    response = client.post("/api/v1/parse-cv/upload", files=files)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [(r["file_name"], r["status"]) for r in data["extracted_data"]] == [
+        ("one.pdf", "success"), ("two.docx", "success"), ("three.pdf", "error")]
+    assert data["successful_extractions"] == 2
@@ -0,0 +1,249 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+from langchain.chains import LLMChain
+from langchain_core.exceptions import OutputParserException
+from langchain_core.prompts import PromptTemplate
+from pydantic import BaseModel
+
+from agents.dispatcher import BreakerState, DispatchingLLM, KeyDispatcher, NoKeyAvailableError
+from agents.llm_cache import cache_key
+from agents.registry import LLMRegistry
+from agents.structured_output import RepairingOutputParser
+
+
+def make_dispatcher(**overrides):
+    params = dict(
+        keys=["key-one-123", "key-two-456"],
+        model="gemini-2.0-flash",
+        rpm=100,
+        tpm=1_000_000,
+        failure_threshold=2,
+        cooldown=30.0,
+        wait_timeout=0.1,
+    )
+    params.update(overrides)
+    return KeyDispatcher(**params)
+
+
+def reply(text="ok"):
+    def generate_content(prompt, generation_config=None):
+        part = SimpleNamespace(text=text)
+        return SimpleNamespace(
+            candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))],
+            usage_metadata=SimpleNamespace(total_token_count=10),
+        )
+    return generate_content
+
+
+def raise_error(error):
+    def generate_content(prompt, generation_config=None):
+        raise error
+    return generate_content
+
+
+def test_quota_error_opens_breaker_and_fails_over():
+    dispatcher = make_dispatcher()
+    first, second = dispatcher.slots
+    first.model.generate_content = raise_error(google_exceptions.ResourceExhausted("quota"))
+    second.model.generate_content = reply("from second key")
+
+    assert dispatcher.generate("prompt", {"max_output_tokens": 100}) == "from second key"
+    assert first.state == BreakerState.OPEN
+    assert second.state == BreakerState.CLOSED
+
+
+def async_model(generate_content):
+    async def generate_content_async(prompt, generation_config=None):
+        return generate_content(prompt, generation_config)
+    return lambda: SimpleNamespace(generate_content_async=generate_content_async)
+
+
+def test_async_generate_fails_over_without_blocking():
+    dispatcher = make_dispatcher()
+    first, second = dispatcher.slots
+    first.async_model = async_model(raise_error(google_exceptions.ServiceUnavailable("down")))
+    second.async_model = async_model(reply("async reply"))
+
+    assert asyncio.run(dispatcher.agenerate("prompt", {"max_output_tokens": 100})) == "async reply"
+    assert first.failures == 1
+    assert first.in_flight == second.in_flight == 0
+
+
+def test_calls_are_spread_across_keys():
+    dispatcher = make_dispatcher()
+    for slot in dispatcher.slots:
+        slot.model.generate_content = reply()
+
+    for _ in range(4):
+        dispatcher.generate("prompt", {"max_output_tokens": 100})
+
+    assert [len(slot.requests) for slot in dispatcher.slots] == [2, 2]
+
+
+def test_rpm_limit_rejects_when_every_key_is_full():
+    dispatcher = make_dispatcher(keys=["only-key-789"], rpm=1)
+    dispatcher.slots[0].model.generate_content = reply()
+
+    dispatcher.generate("prompt", {"max_output_tokens": 100})
+    with pytest.raises(NoKeyAvailableError):
+        dispatcher.generate("prompt", {"max_output_tokens": 100})
+
+
+def test_non_capacity_errors_do_not_fail_over():
+    dispatcher = make_dispatcher()
+    for slot in dispatcher.slots:
+        slot.model.generate_content = raise_error(google_exceptions.InvalidArgument("bad prompt"))
+
+    with pytest.raises(google_exceptions.InvalidArgument):
+        dispatcher.generate("prompt", {"max_output_tokens": 100})
+    assert all(slot.state == BreakerState.CLOSED for slot in dispatcher.slots)
+
+
+class Title(BaseModel):
+    title: str
+
+
+class ScriptedBackend:
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.configs = []
+
+    def generate(self, prompt, generation_config, chain=None):
+        self.configs.append(generation_config)
+        return self.answers.pop(0)
+
+    async def agenerate(self, prompt, generation_config, chain=None):
+        return self.generate(prompt, generation_config, chain)
+
+
+def test_unparseable_answer_is_not_served_from_cache_on_retry(monkeypatch):
+    backend = ScriptedBackend("Sorry, I can't help with that.", '{"title": "Engineer"}')
+    monkeypatch.setattr("agents.registry.get_backend", lambda: backend)
+    registry = LLMRegistry()
+    parser = RepairingOutputParser(pydantic_object=Title)
+    prompt = PromptTemplate.from_template("Title for {role} (retry test)")
+    registry.register("retry_test", lambda llm: LLMChain(llm=llm, prompt=prompt, output_parser=parser))
+    chain = registry.chain("retry_test")
+
+    with pytest.raises(OutputParserException):
+        asyncio.run(chain.ainvoke({"role": "dev"}))
+    assert asyncio.run(chain.ainvoke({"role": "dev"}))["text"] == Title(title="Engineer")
+    # The good answer is cached.
+    assert asyncio.run(chain.ainvoke({"role": "dev"}))["text"] == Title(title="Engineer")
+    assert len(backend.configs) == 2
+
+
+def test_cache_key_covers_the_whole_generation_config():
+    prompt = "same prompt"
+    base = {"temperature": 0.2, "max_output_tokens": 100, "stop_sequences": None}
+    keys = {
+        cache_key("gemini-2.0-flash", base, prompt),
+        cache_key("gemini-2.0-flash", {**base, "max_output_tokens": 200}, prompt),
+        cache_key("gemini-2.0-flash", {**base, "response_schema": {"type": "OBJECT"}}, prompt),
+        cache_key("gemini-2.0-flash", {**base, "temperature": 0.3}, prompt),
+    }
+    assert len(keys) == 4
+
+
+def test_in_flight_calls_with_different_configs_are_not_merged():
+    class SlowBackend:
+        async def agenerate(self, prompt, generation_config, chain=None):
+            await asyncio.sleep(0.05)
+            return f"{generation_config['max_output_tokens']} tokens"
+
+    def llm(max_output_tokens):
+        return DispatchingLLM(
+            dispatcher=SlowBackend(), model="gemini-2.0-flash", temperature=0.2,
+            max_output_tokens=max_output_tokens, chain="single_flight_test", cache_ttl=60,
+        )
+
+    async def both():
+        return await asyncio.gather(
+            llm(100).ainvoke("single-flight config test"), llm(200).ainvoke("single-flight config test")
+        )
+
+    assert asyncio.run(both()) == ["100 tokens", "200 tokens"]
+
+
+def test_uncached_chains_never_share_a_generation():
+    class CountingBackend:
+        calls = 0
+
+        async def agenerate(self, prompt, generation_config, chain=None):
+            CountingBackend.calls += 1
+            calls = CountingBackend.calls
+            await asyncio.sleep(0.05)
+            return f"regenerated {calls}"
+
+    llm = DispatchingLLM(
+        dispatcher=CountingBackend(), model="gemini-2.0-flash", temperature=0.2,
+        max_output_tokens=100, chain="regenerate_test", cache_ttl=0,
+    )
+
+    async def both():
+        return await asyncio.gather(llm.ainvoke("regenerate this"), llm.ainvoke("regenerate this"))
+
+    assert sorted(asyncio.run(both())) == ["regenerated 1", "regenerated 2"]
+
+
+def test_cancelled_half_open_trial_leaves_breaker_half_open():
+    dispatcher = make_dispatcher(keys=["only-key-789"])
+    slot = dispatcher.slots[0]
+    slot.state = BreakerState.OPEN
+    slot.opened_at, slot.cooldown = 0.0, 0.0
+    started = asyncio.Event()
+
+    async def hang(prompt, generation_config=None):
+        started.set()
+        await asyncio.sleep(10)
+
+    slot.async_model = lambda: SimpleNamespace(generate_content_async=hang)
+
+    async def cancel_trial():
+        task = asyncio.create_task(dispatcher.agenerate("prompt", {"max_output_tokens": 100}))
+        await started.wait()
+        assert slot.state == BreakerState.HALF_OPEN
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_trial())
+    assert slot.state == BreakerState.HALF_OPEN
+    assert slot.in_flight == 0
+
+
+def test_each_key_slot_has_its_own_clients_bound_to_its_key():
+    # KeySlot relies on google-generativeai internals (_ClientManager,
+    # GenerativeModel._client/_async_client); this fails if an upgrade moves them.
+    import google.generativeai as genai
+
+    slots = make_dispatcher().slots
+
+    def answer(text):
+        return genai.protos.GenerateContentResponse(candidates=[{"content": {"parts": [{"text": text}]}}])
+
+    for slot in slots:
+        client = slot.model._client
+        assert client._transport._credentials.token == slot.key
+        client.generate_content = lambda request, key=slot.key, **kwargs: answer(key)
+        assert slot.model.generate_content("prompt").text == slot.key
+
+    async def async_answers():
+        texts = []
+        for slot in slots:
+            model = slot.async_model()
+            client = model._async_client
+            assert client._client._transport._credentials.token == slot.key
+
+            async def generate_content(request, key=slot.key, **kwargs):
+                return answer(f"async {key}")
+
+            client.generate_content = generate_content
+            texts.append((await model.generate_content_async("prompt")).text)
+        return texts
+
+    assert asyncio.run(async_answers()) == [f"async {slot.key}" for slot in slots]
+    assert slots[0].model._client is not slots[1].model._client
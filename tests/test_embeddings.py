@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import embeddings as embeddings_module
+from app.services.embeddings import EmbeddingEngine, EmbeddingsUnavailable
+
+
+class CountingModel:
+    def __init__(self):
+        self.batches = []
+
+    def embed_documents(self, texts):
+        self.batches.append(list(texts))
+        return [[1.0, 0.0] for _ in texts]
+
+
+def test_model_is_loaded_and_warmed_up_once_for_all_callers():
+    loads = []
+
+    def factory(model_name, cache_dir, threads):
+        loads.append(model_name)
+        return CountingModel()
+
+    engine = EmbeddingEngine("test-model", factory=factory)
+    with ThreadPoolExecutor(8) as pool:
+        models = list(pool.map(lambda _: engine.get(), range(16)))
+
+    assert loads == ["test-model"]
+    assert all(model is models[0] for model in models)
+    assert models[0].batches == [embeddings_module.WARMUP_TEXTS]
+    assert engine.status()["state"] == "ready" and engine.ready
+
+
+def test_failed_load_is_reported_and_retried():
+    attempts = []
+
+    def factory(model_name, cache_dir, threads):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("model files not found")
+        return CountingModel()
+
+    engine = EmbeddingEngine("test-model", factory=factory)
+    with pytest.raises(EmbeddingsUnavailable):
+        engine.get()
+    assert engine.status()["state"] == "failed" and not engine.ready
+
+    engine.get()
+    assert engine.ready and len(attempts) == 2
+
+
+def test_readiness_probe_waits_for_the_embedding_model(monkeypatch):
+    with TestClient(app) as client:
+        assert client.get("/ready").status_code == 200
+
+        monkeypatch.setattr(embeddings_module.settings, "embedding_preload", True)
+        monkeypatch.setattr(embeddings_module.embedding_engine, "_embeddings", None)
+        response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["checks"]["embeddings"] is False
+
+
+class HashingModel(CountingModel):
+    def embed_documents(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(text)), float(sum(map(ord, text)) % 97), 0.5] for text in texts]
+
+
+def test_tag_cache_embeds_only_unseen_normalized_tags(tmp_path):
+    from app.services.cache import TieredCache
+    from app.services.embeddings import CachedEmbeddings
+
+    db_path = str(tmp_path / "cache.db")
+    model = HashingModel()
+    cached = CachedEmbeddings(model, TieredCache("tag_embeddings", db_path), "test-model")
+
+    first = cached.embed_documents(["Python Developer", "AWS", "  python   developer"])
+    second = cached.embed_documents(["aws", "QA Engineer"])
+
+    assert model.batches == [["python developer", "aws"], ["qa engineer"]]
+    assert first[0] == first[2] == model.embed_documents(["python developer"])[0]
+    assert second[0] == first[1]
+
+    # A new process reads the vectors back from disk.
+    restarted = HashingModel()
+    reloaded = CachedEmbeddings(restarted, TieredCache("tag_embeddings", db_path), "test-model")
+    assert reloaded.embed_documents(["AWS", "QA engineer"]) == [first[1], second[1]]
+    assert restarted.batches == []
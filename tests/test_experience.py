@@ -0,0 +1,57 @@
+from datetime import date
+
+from app.services.experience import apply_experience, experience_level, experience_months
+
+TODAY = date(2024, 6, 15)
+
+
+def test_months_merge_overlaps_and_handle_present_and_year_only_dates():
+    jobs = [
+        {"start_date": "2022-01", "end_date": "Present", "is_current": None},
+        {"start_date": "2021-06", "end_date": "2022-03"},  # overlaps the job above
+        {"start_date": "2018", "end_date": "2019"},  # Jan 2018 to Dec 2019
+    ]
+
+    assert experience_months(jobs, TODAY) == 37 + 24  # Jun 2021 to Jun 2024, plus 2018-2019
+
+
+def test_missing_end_date_runs_until_the_next_job():
+    jobs = [
+        {"start_date": "2020-01", "end_date": None},
+        {"start_date": "2020-07", "end_date": "2020-12"},
+        {"start_date": None, "end_date": "2019-01"},
+    ]
+
+    assert experience_months(jobs, TODAY) == 12
+    assert experience_months(None, TODAY) == 0
+
+
+def test_level_thresholds():
+    assert [experience_level(y) for y in (0, 0.9, 1, 4.9, 5, 11.9, 12, 15, 30)] == [
+        "Entry_Level", "Entry_Level", "Junior_Level", "Mid_Level", "Mid_Senior_Level",
+        "Senior", "Lead", "Principal/Director", "Principal/Director",
+    ]
+
+
+def test_apply_experience_sets_analysis_fields():
+    result = {
+        "work_experience": [{"start_date": "Mar 2019", "end_date": "Till date", "is_current": False}],
+        "ai_analysis": {"experience_year": 99.0, "experience_level": "Lead"},
+    }
+
+    apply_experience(result, TODAY)
+
+    assert result["ai_analysis"] == {"experience_year": 5.3, "experience_level": "Mid_Senior_Level"}
+    assert apply_experience({"ai_analysis": None}, TODAY) == {"ai_analysis": None}
+
+
+def test_experience_is_attached_when_the_llm_analysis_is_missing():
+    result = {
+        "personal_info": {"full_name": "Candidate"},
+        "work_experience": [{"start_date": "2018-09", "end_date": "2020-08", "is_current": False}],
+        "ai_analysis": None,
+    }
+
+    apply_experience(result, TODAY)
+
+    assert result["ai_analysis"] == {"experience_year": 2.0, "experience_level": "Junior_Level"}
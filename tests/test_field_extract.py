@@ -0,0 +1,58 @@
+from app.services.field_extract import (
+    apply_local_fields, extract_local_fields, normalize_date, normalize_phone, record_agreement,
+)
+from app.services.metrics import local_field_agreement
+from benchmarks.samples import resume_lines
+
+TEXT = "\n".join(resume_lines(3))
+
+
+def test_local_pass_finds_contact_fields_and_dates():
+    local = extract_local_fields(TEXT)
+
+    assert local.email == "candidate3@example.com"
+    assert local.phone == "5550100003"
+    assert {"2015-01", "2016-12", "2011", "2015"} <= set(local.dates)
+
+
+def test_normalizers():
+    assert normalize_phone("+91 98765-43210") == "9876543210"
+    assert normalize_phone("(020) 2345 6789") == "2023456789"
+    assert normalize_phone("2015 - 2017") is None
+    assert normalize_date("Sept. 2019") == "2019-09"
+    assert normalize_date("03/2021") == "2021-03"
+    assert normalize_date("2020") == "2020"
+    assert normalize_date("Till Date") is None
+
+
+def test_fill_mode_overrides_contacts_and_normalizes_dates():
+    result = {
+        "personal_info": {"full_name": "Candidate 3", "email": None, "phone": None},
+        "work_experience": [{"start_date": "Jan 2015", "end_date": "Present", "is_current": None}],
+    }
+
+    apply_local_fields(result, extract_local_fields(TEXT))
+
+    assert result["personal_info"]["email"] == "candidate3@example.com"
+    assert result["personal_info"]["phone"] == "5550100003"
+    assert result["work_experience"][0] == {"start_date": "2015-01", "end_date": None, "is_current": True}
+
+
+def test_shadow_mode_counts_agreement_per_field():
+    def count(field, outcome):
+        return local_field_agreement.value(field=field, outcome=outcome)
+
+    before = count("email", "agree"), count("phone", "disagree")
+    result = {"personal_info": {"email": "Candidate3@example.com", "phone": "5550100099"}}
+
+    record_agreement(result, extract_local_fields(TEXT))
+
+    assert (count("email", "agree"), count("phone", "disagree")) == (before[0] + 1, before[1] + 1)
+
+
+def test_date_ranges_are_not_taken_for_phones():
+    assert extract_local_fields("Acme 05.2019 - 03.2021\nContact: +91 98765 43210").phone == "9876543210"
+    assert extract_local_fields("2019-05 - 2021-03").phone is None
+    assert extract_local_fields("Jan 2019 - Mar 2021 | 2019 - 2021\n(020) 2345 6789").phone == "2023456789"
+    # A phone on the line after a year is not glued onto it.
+    assert extract_local_fields("Since 2021\n98765 43210").phone == "9876543210"
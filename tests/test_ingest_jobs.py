@@ -0,0 +1,110 @@
+import asyncio
+import sqlite3
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.ingest_jobs import IngestWorkers, JobFile, JobStore
+from benchmarks.samples import make_pdf, resume_lines
+
+
+def test_interrupted_job_resumes_without_redoing_finished_files(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    store = JobStore(db_path, tmp_path / "files")
+    for idx in range(3):
+        store.save_file("job1", idx, f"resume {idx}".encode())
+    store.create_job("job1", [
+        JobFile("a.pdf", ".pdf"), JobFile("b.pdf", ".pdf"), JobFile("c.pdf", ".pdf"),
+        JobFile("d.txt", result={"file_name": "d.txt", "status": "error", "error": "Invalid file type."}),
+    ])
+    first = store.claim()
+    store.finish(first.job_id, first.idx, {"file_name": first.file_name, "status": "success"})
+    store.claim()  # the process dies while extracting b.pdf
+
+    restarted = JobStore(db_path, tmp_path / "files")
+    assert restarted.requeue_interrupted() == 1
+    processed = []
+
+    async def process(data, file_name, file_type):
+        processed.append(data)
+        return {"file_name": file_name, "status": "success", "extracted_info": {}}
+
+    async def run_workers():
+        workers = IngestWorkers(restarted, process, workers=2, poll_interval=0.01)
+        workers.start()
+        while restarted.job("job1")["status"] != "completed":
+            await asyncio.sleep(0.01)
+        await workers.stop()
+
+    asyncio.run(run_workers())
+
+    assert sorted(processed) == [b"resume 1", b"resume 2"]
+    job = restarted.job("job1")
+    assert (job["succeeded"], job["failed"], job["pending"]) == (3, 1, 0)
+    # In finishing order: the file rejected at submission, a.pdf, then the resumed two.
+    order = [r["index"] for r in restarted.results("job1")]
+    assert order[:2] == [3, 0] and sorted(order[2:]) == [1, 2]
+    assert [r["index"] for r in restarted.results("job1", offset=2, limit=1)] == order[2:3]
+    assert not (tmp_path / "files" / "job1").exists()
+
+
+def test_workers_keep_running_when_the_store_is_locked(tmp_path):
+    store = JobStore("", tmp_path / "files")
+    store.save_file("job1", 0, b"resume")
+    store.create_job("job1", [JobFile("a.pdf", ".pdf")])
+    claim, failures = store.claim, [sqlite3.OperationalError("database is locked")] * 2
+
+    def flaky_claim():
+        if failures:
+            raise failures.pop()
+        return claim()
+
+    store.claim = flaky_claim
+
+    async def process(data, file_name, file_type):
+        return {"file_name": file_name, "status": "success", "extracted_info": {}}
+
+    async def run_workers():
+        workers = IngestWorkers(store, process, workers=1, poll_interval=0.01)
+        workers.start()
+        deadline = time.time() + 5
+        while store.job("job1")["status"] != "completed" and time.time() < deadline:
+            await asyncio.sleep(0.01)
+        await workers.stop()
+
+    asyncio.run(run_workers())
+
+    assert not failures
+    assert store.job("job1")["succeeded"] == 1
+
+
+def test_ingest_job_api_submit_poll_and_page_results():
+    files = [
+        ("files", ("one.pdf", make_pdf(resume_lines(21)), "application/pdf")),
+        ("files", ("notes.txt", b"not a resume at all", "text/plain")),
+        ("files", ("two.pdf", make_pdf(resume_lines(22)), "application/pdf")),
+    ]
+    with TestClient(app) as client:
+        response = client.post("/api/v1/parse-cv/jobs", files=files)
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        deadline = time.time() + 30
+        while True:
+            job = client.get(f"/api/v1/parse-cv/jobs/{job_id}").json()
+            if job["status"] == "completed" or time.time() > deadline:
+                break
+            time.sleep(0.05)
+
+        first = client.get(f"/api/v1/parse-cv/jobs/{job_id}/results", params={"limit": 2}).json()
+        rest = client.get(
+            f"/api/v1/parse-cv/jobs/{job_id}/results", params={"offset": first["next_offset"]}
+        ).json()
+
+    assert (job["status"], job["total"], job["succeeded"], job["failed"]) == ("completed", 3, 2, 1)
+    results = first["results"] + rest["results"]
+    assert sorted(r["index"] for r in results) == [0, 1, 2]
+    assert {r["index"]: r["status"] for r in results} == {0: "success", 1: "error", 2: "success"}
+    assert rest["next_offset"] == 3
+    assert client.get("/api/v1/parse-cv/jobs/missing").status_code == 404
@@ -0,0 +1,37 @@
+import pytest
+from google.generativeai import protos
+from langchain_core.outputs import Generation
+
+from agents.json_repair import JsonRepairError, repair_json
+from agents.structured_output import RepairingOutputParser, gemini_schema
+from agents.types import CandidateAllInOne, JobTagsOutput
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('```json\n{"a": 1}\n```', {"a": 1}),
+    ('Here you go: {"a": [1, 2,],}', {"a": [1, 2]}),
+    ("{'a': 'it\\'s', 'b': True, 'c': None}", {"a": "it's", "b": True, "c": None}),
+    ('{"a": "line one\nline two"} trailing prose', {"a": "line one\nline two"}),
+    ('{"a": {"b": ["x", "y', {"a": {"b": ["x", "y"]}}),
+    ('{"a": 1, "b":', {"a": 1, "b": None}),
+])
+def test_repair_json(text, expected):
+    assert repair_json(text) == expected
+
+
+def test_repair_json_gives_up_without_json():
+    with pytest.raises(JsonRepairError):
+        repair_json("Sorry, I can't help with that.")
+
+
+def test_parser_repairs_truncated_output():
+    parser = RepairingOutputParser(pydantic_object=JobTagsOutput)
+    parsed = parser.parse_result([Generation(text='```json\n{"tags": ["python", "fastapi",')])
+    assert parsed.tags == ["python", "fastapi"]
+
+
+def test_gemini_schema_is_accepted_by_sdk():
+    schema = gemini_schema(CandidateAllInOne)
+    protos.Schema(schema)
+    assert schema["type"] == "OBJECT"
+    assert "$ref" not in str(schema)
@@ -0,0 +1,31 @@
+from app.services.metrics import MetricsRegistry, stats_collector
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ["route"], buckets=(0.1, 1.0))
+    latency.observe(0.05, route="/a")
+    latency.observe(0.5, route="/a")
+    latency.observe(5.0, route="/a")
+
+    text = registry.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+
+
+def test_counters_and_collectors():
+    registry = MetricsRegistry()
+    tokens = registry.counter("tokens_total", "Tokens.", ["chain"])
+    tokens.inc(10, chain="jd")
+    tokens.inc(5, chain="jd")
+    registry.register_collector(stats_collector(
+        "cache", lambda: [{"name": "llm", "hits": 3, "hit_rate": 0.75}],
+        counters=("hits",), gauges=("hit_rate",),
+    ))
+
+    text = registry.render()
+    assert 'tokens_total{chain="jd"} 15' in text
+    assert "# TYPE cache_hits_total counter" in text
+    assert 'cache_hit_rate{name="llm"} 0.75' in text
@@ -0,0 +1,56 @@
+import asyncio
+
+from agents import resume_extractor
+from benchmarks.samples import make_pdf, resume_lines
+
+
+def test_reuploaded_resume_is_served_from_extraction_cache(monkeypatch):
+    pdf = make_pdf(resume_lines(7))
+    extracted = []
+    real_apdf_to_text = resume_extractor.apdf_to_text
+
+    async def counting_apdf_to_text(source, file_type=None):
+        extracted.append(file_type)
+        return await real_apdf_to_text(source, file_type)
+
+    monkeypatch.setattr(resume_extractor, "apdf_to_text", counting_apdf_to_text)
+
+    first = asyncio.run(resume_extractor.resume_extract_info(pdf, ".pdf"))
+    second = asyncio.run(resume_extractor.resume_extract_info(memoryview(pdf), ".pdf"))
+
+    assert first == second
+    assert extracted == [".pdf"]
+    assert resume_extractor.extraction_cache_key(pdf) != resume_extractor.extraction_cache_key(pdf + b" ")
+
+
+def test_concurrent_resumes_share_one_batched_prompt(monkeypatch):
+    from agents.backends import get_fake_backend
+    from app.services.metrics import resume_batch_documents
+
+    monkeypatch.setattr(resume_extractor.settings, "resume_batch_size", 3)
+    monkeypatch.setattr(resume_extractor.settings, "extraction_cache_enabled", False)
+    monkeypatch.setattr(resume_extractor.resume_batcher, "max_size", 3)
+    real_repair_json = resume_extractor.repair_json
+
+    def one_invalid_entry(text):
+        entries = real_repair_json(text)
+        entries[1] = {"tags": "not a list"}
+        return entries
+
+    monkeypatch.setattr(resume_extractor, "repair_json", one_invalid_entry)
+    pdfs = [make_pdf(resume_lines(i)) for i in (11, 12, 13)]
+    backend = get_fake_backend()
+    calls = backend.calls
+    batched = resume_batch_documents.value(outcome="batched")
+    fallback = resume_batch_documents.value(outcome="fallback")
+
+    async def extract_all():
+        return await asyncio.gather(*(resume_extractor.resume_extract_info(pdf, ".pdf") for pdf in pdfs))
+
+    results = asyncio.run(extract_all())
+
+    assert all(result["personal_info"] for result in results)
+    # One batched call, then the invalid entry's resume on its own.
+    assert backend.calls - calls == 2
+    assert resume_batch_documents.value(outcome="batched") - batched == 2
+    assert resume_batch_documents.value(outcome="fallback") - fallback == 1
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agents.single_flight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_result():
+    flight = SingleFlight("test")
+    upstream = []
+
+    def slow_call():
+        upstream.append(1)
+        time.sleep(0.1)
+        return "answer"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("same", slow_call)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["answer"] * 5
+    assert len(upstream) == 1
+    assert flight.stats()["merged"] == 4
+
+
+def test_async_calls_share_result_and_error():
+    flight = SingleFlight("test")
+    upstream = []
+
+    async def failing_call():
+        upstream.append(1)
+        await asyncio.sleep(0.05)
+        raise ValueError("upstream down")
+
+    async def run():
+        return await asyncio.gather(
+            *(flight.ado("same", failing_call) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert len(upstream) == 1
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_finished_calls_are_not_reused():
+    flight = SingleFlight("test")
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    with pytest.raises(KeyError):
+        flight.do("key", lambda: {}["missing"])
+    assert flight.stats()["merged"] == 0
@@ -0,0 +1,23 @@
+from app.services.text_compact import compact_resume_text, normalize_text
+
+
+def test_normalize_drops_page_boilerplate_but_keeps_first_header():
+    pages = [
+        "Jane Doe | jane@example.com\nPage 1 of 2\nEXPERIENCE\n\n\n\nAcme   Corp\nConfidential 2024\n",
+        "Jane Doe | jane@example.com\nPage 2 of 2\nEDUCATION\nB.E.\nConfidential 2024\n",
+    ]
+
+    text = normalize_text("\f".join(pages))
+
+    assert text == ("Jane Doe | jane@example.com\nEXPERIENCE\n\nAcme Corp\n"
+                    "Confidential 2024\n\nEDUCATION\nB.E.\n")
+
+
+def test_compaction_trims_to_token_budget_on_a_line_boundary():
+    text = "".join(f"Line {i} of a very long resume body\n" for i in range(2000))
+
+    result = compact_resume_text(text, token_budget=200)
+
+    assert result.truncated
+    assert result.tokens <= 200 < result.raw_tokens
+    assert result.text.endswith("resume body\n")
@@ -0,0 +1,169 @@
+import io
+
+import pytest
+
+from app.services.extractors import join_pages
+from app.services.text_extract import as_stream, pdf_to_text
+from benchmarks.samples import make_docx, make_pdf, resume_lines
+
+
+def test_extracts_from_bytes_and_streams_without_a_path():
+    lines = resume_lines(3)
+    pdf, docx = make_pdf(lines), make_docx(lines)
+
+    assert "Candidate 3" in pdf_to_text(pdf, "pdf")
+    assert "Candidate 3" in pdf_to_text(memoryview(pdf), ".pdf")
+    assert "Candidate 3" in pdf_to_text(io.BytesIO(docx), ".docx")
+    with pytest.raises(ValueError):
+        pdf_to_text(pdf)
+
+
+def test_large_uploads_are_spooled_to_disk():
+    assert isinstance(as_stream(b"x" * 10, spool_threshold=100), io.BytesIO)
+    with as_stream(b"x" * 200, spool_threshold=100) as spooled:
+        assert not isinstance(spooled, io.BytesIO)
+        assert spooled.read() == b"x" * 200
+
+
+def test_pool_splits_large_pdfs_into_page_ranges():
+    import asyncio
+    from app.services.extraction_pool import ExtractionPool
+
+    lines = [f"line {i}" for i in range(60)]
+    pdf = make_pdf(lines, lines_per_page=5)  # 12 pages
+    pool = ExtractionPool(workers=2, pages_per_task=5, timeout=60)
+    try:
+        text = join_pages(asyncio.run(pool.pdf_pages(pdf)))
+    finally:
+        pool.shutdown()
+
+    assert text == pdf_to_text(pdf, "pdf")
+    assert pool.jobs == 3
+
+
+def test_pool_kills_jobs_that_overrun_the_timeout():
+    import asyncio
+    import time
+    from app.services.extraction_pool import ExtractionPool
+
+    pool = ExtractionPool(workers=1, timeout=0.5)
+    try:
+        with pytest.raises(TimeoutError):
+            asyncio.run(pool.arun(time.sleep, 30))
+        assert pool.restarts == 1
+        assert "Candidate 1" in join_pages(asyncio.run(pool.pdf_pages(make_pdf(resume_lines(1)))))
+    finally:
+        pool.shutdown()
+
+
+def test_extractor_registry_selects_backends_by_name():
+    from app.services.extractors import DOCX, PDF, available_extractors, get_extractor, registered_extractors
+
+    assert "pypdf2" in available_extractors(PDF)
+    assert set(available_extractors(PDF)) <= set(registered_extractors(PDF))
+    pages, count = get_extractor(PDF, "pypdf2")(make_pdf(resume_lines(2)))
+    assert "Candidate 2" in pages[0] and count == 1
+    assert "Candidate 2" in get_extractor(DOCX, "python-docx")(make_docx(resume_lines(2)))
+    with pytest.raises(ValueError):
+        get_extractor(PDF, "no-such-backend")
+
+
+def test_streaming_docx_keeps_headers_tables_and_text_boxes_in_order():
+    import zipfile
+
+    from app.services.extractors import DOCX, get_extractor
+
+    lxml_docx = get_extractor(DOCX, "lxml")
+    docx = make_docx(["SUMMARY", "Backend engineer"], header="Jane Doe | jane@example.com",
+                     table=[["Languages", "Python, Go"], ["Cloud", "AWS"]])
+    assert lxml_docx(docx) == (
+        "Jane Doe | jane@example.com\nSUMMARY\nBackend engineer\nLanguages\tPython, Go\nCloud\tAWS\n"
+    )
+
+    # A text box is stored twice, as DrawingML and as a VML fallback; it is read once.
+    text_box = "<w:txbxContent><w:p><w:r><w:t>Skills: Kubernetes</w:t></w:r></w:p></w:txbxContent>"
+    body = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+        'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"><w:body>'
+        "<w:p><w:r><w:t>Anchor</w:t></w:r><w:r><mc:AlternateContent>"
+        f"<mc:Choice>{text_box}</mc:Choice><mc:Fallback>{text_box}</mc:Fallback>"
+        "</mc:AlternateContent></w:r><w:r><w:tab/><w:t>end</w:t></w:r></w:p>"
+        "</w:body></w:document>"
+    )
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("word/document.xml", body)
+    assert lxml_docx(archive.getvalue()) == "Anchor\tend\nSkills: Kubernetes\n"
+
+
+def test_page_hash_identifies_the_same_page_across_documents():
+    from app.services.ocr import page_hashes
+
+    first = ["Jane Doe", "Python developer"]
+    second = ["John Roe", "Go developer"]
+    doc_a = make_pdf(first + second, lines_per_page=2)
+    doc_b = make_pdf(second + first + second, lines_per_page=2)
+
+    a = page_hashes(doc_a, [0, 1])
+    b = page_hashes(doc_b, [0, 1, 2])
+    assert a[0] == b[1] and a[1] == b[0] == b[2]
+    assert a[0] != a[1]
+
+
+def test_pages_with_text_skip_ocr():
+    import asyncio
+    from app.services.text_extract import ocr_missing_pages
+
+    pdf = make_pdf(resume_lines(1))
+    pages = ["Candidate 1 with a full text layer on this page"]
+    assert asyncio.run(ocr_missing_pages(pdf, pages)) == pages
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    """OCR in threads (EXTRACT_WORKERS=0) with ocr_page replaced by a recorder."""
+    import threading
+    from app.services import text_extract
+
+    monkeypatch.setattr(text_extract.settings, "extract_workers", 0)
+    monkeypatch.setattr(text_extract, "ocr_available", lambda: True)
+    calls = []
+    # Two OCR jobs must be in flight at once to get past the barrier.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def ocr_page(source, index, dpi, language):
+        calls.append(index)
+        barrier.wait()
+        return f"OCR text of page {index + 1}"
+
+    monkeypatch.setattr(text_extract, "ocr_page", ocr_page)
+    return calls
+
+
+def test_ocr_runs_concurrently_on_pages_without_text_and_caches_each_page(fake_ocr):
+    import asyncio
+    from app.services.metrics import ocr_pages
+    from app.services.text_extract import ocr_missing_pages
+
+    pdf = make_pdf(["Page one has a text layer", "scan two", "scan three"], lines_per_page=1)
+    pages = ["Page one has a text layer long enough", "", " "]
+
+    first = asyncio.run(ocr_missing_pages(pdf, pages))
+    assert first == [pages[0], "OCR text of page 2", "OCR text of page 3"]
+    assert sorted(fake_ocr) == [1, 2]
+
+    cached = ocr_pages.value(outcome="cached")
+    assert asyncio.run(ocr_missing_pages(pdf, pages)) == first
+    assert sorted(fake_ocr) == [1, 2]
+    assert ocr_pages.value(outcome="cached") == cached + 2
+
+
+def test_pages_are_left_alone_when_ocr_is_unavailable(fake_ocr, monkeypatch):
+    import asyncio
+    from app.services import text_extract
+
+    monkeypatch.setattr(text_extract, "ocr_available", lambda: False)
+    pdf = make_pdf(["scanned page"])
+
+    assert asyncio.run(text_extract.ocr_missing_pages(pdf, [""])) == [""]
+    assert fake_ocr == []